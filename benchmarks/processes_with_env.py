@@ -0,0 +1,56 @@
+"""Benchmark of the backends used to find processes by their environment.
+
+Usage:
+
+    python benchmarks/processes_with_env.py [NUMBER_OF_PROCESSES] [REPEAT]
+
+It starts given number of processes (100 by default) through the executors,
+so there is something to find, and then times every available backend.
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.append(os.getcwd())
+
+from mirakuru import SimpleExecutor  # noqa: E402
+from mirakuru.base import ENV_UUID  # noqa: E402
+from mirakuru.base_env import (  # noqa: E402
+    processes_with_env_proc,
+    processes_with_env_ps,
+    processes_with_env_psutil,
+)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+if __name__ == "__main__":
+    PROCESSES, REPEAT = 100, 20
+    if len(sys.argv) >= 2:
+        PROCESSES = int(sys.argv[1])
+    if len(sys.argv) >= 3:
+        REPEAT = int(sys.argv[2])
+
+    BACKENDS = {"ps": processes_with_env_ps}
+    if psutil:
+        BACKENDS["psutil"] = processes_with_env_psutil
+    if os.path.isdir("/proc/self"):
+        BACKENDS["proc"] = processes_with_env_proc
+
+    executors = [SimpleExecutor("sleep 300").start() for _ in range(PROCESSES)]
+    try:
+        if psutil:
+            print(f"Processes in the system: {len(psutil.pids())}")
+        for name, backend in BACKENDS.items():
+            found = backend(ENV_UUID, str(os.getpid()))
+            assert len(found) == PROCESSES, f"{name} found {len(found)} processes"
+            best = min(
+                timeit.repeat(lambda: backend(ENV_UUID, str(os.getpid())), number=1, repeat=REPEAT)
+            )
+            print(f"{name:>8}: {best * 1000:8.2f} ms")
+    finally:
+        for executor in executors:
+            executor.kill()
@@ -0,0 +1,59 @@
+"""Benchmark of process spawn latency depending on the parent's memory size.
+
+Usage:
+
+    python benchmarks/spawn.py [MEGABYTES,...] [REPEAT]
+
+For every given size (0, 512 and 2048 MB by default), the parent allocates
+and touches that much memory, and then times starting a process the way
+executors do (``start_new_session``), compared to the old way
+(``preexec_fn=os.setsid``), which forces CPython to fork instead of vfork.
+"""
+
+import os
+import subprocess
+import sys
+import timeit
+
+sys.path.append(os.getcwd())
+
+from mirakuru import SimpleExecutor  # noqa: E402
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+def spawn_preexec() -> None:
+    """Start and reap process with new session started by ``preexec_fn``."""
+    subprocess.Popen(["true"], preexec_fn=os.setsid).wait()  # pylint:disable=consider-using-with
+
+
+def spawn_executor() -> None:
+    """Start and reap process through the executor."""
+    executor = SimpleExecutor(["true"], stdin=None, stdout=None)
+    executor.start()
+    assert executor.process is not None
+    executor.process.wait()
+    executor.stop()
+
+
+if __name__ == "__main__":
+    SIZES, REPEAT = [0, 512, 2048], 50
+    if len(sys.argv) >= 2:
+        SIZES = [int(size) for size in sys.argv[1].split(",")]
+    if len(sys.argv) >= 3:
+        REPEAT = int(sys.argv[2])
+
+    print(f"{'RSS (MB)':>10} {'preexec_fn':>12} {'executor':>12}")
+    for size in SIZES:
+        # touch every page, so it really is resident
+        ballast = bytearray(b"x" * (size * 1024 * 1024))
+        rss = psutil.Process().memory_info().rss // 2**20 if psutil else size
+        results = [
+            min(timeit.repeat(spawn, number=1, repeat=REPEAT))
+            for spawn in (spawn_preexec, spawn_executor)
+        ]
+        print(f"{rss:>10} " + " ".join(f"{result * 1000:9.2f} ms" for result in results))
+        del ballast
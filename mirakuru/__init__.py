@@ -21,15 +21,21 @@
 import logging
 
 from mirakuru.base import Executor, SimpleExecutor
+from mirakuru.checks import CheckExecutor
 from mirakuru.exceptions import (
     AlreadyRunning,
     ExecutorError,
+    ExecutorGroupError,
     ProcessExitedWithError,
+    ProcessFailedToStart,
     TimeoutExpired,
 )
+from mirakuru.group import ExecutorGroup
 from mirakuru.http import HTTPExecutor
 from mirakuru.output import OutputExecutor
 from mirakuru.pid import PidExecutor
+from mirakuru.pool import ExecutorPool
+from mirakuru.shared import SharedExecutor
 from mirakuru.tcp import TCPExecutor
 
 __version__ = "2.6.0"
@@ -41,10 +47,16 @@ __all__ = (
     "TCPExecutor",
     "HTTPExecutor",
     "PidExecutor",
+    "CheckExecutor",
+    "ExecutorGroup",
+    "ExecutorPool",
+    "SharedExecutor",
     "ExecutorError",
+    "ExecutorGroupError",
     "TimeoutExpired",
     "AlreadyRunning",
     "ProcessExitedWithError",
+    "ProcessFailedToStart",
 )
 
 
@@ -0,0 +1,640 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Executors built on asyncio subprocesses.
+
+They mirror the regular executors, but never block the event loop: process
+exit is awaited, readiness is checked with non-blocking sockets and output
+is read with stream readers.
+"""
+
+import asyncio
+import logging
+import os
+import platform
+import re
+import signal
+import subprocess
+from contextlib import asynccontextmanager
+from types import TracebackType
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+)
+from urllib.parse import urlparse
+
+from mirakuru.base import ENV_UUID, IGNORED_ERROR_CODES, ExecutorMixin
+from mirakuru.base_env import processes_with_env
+from mirakuru.compat import SIGKILL
+from mirakuru.exceptions import (
+    AlreadyRunning,
+    ProcessExitedWithError,
+    ProcessFinishedWithError,
+    TimeoutExpired,
+)
+from mirakuru.http import build_request
+from mirakuru.tcp import CONNECT_ATTEMPT_DELAY
+from mirakuru.wait import WaitStrategy
+
+LOG = logging.getLogger(__name__)
+
+AsyncSimpleExecutorType = TypeVar("AsyncSimpleExecutorType", bound="AsyncSimpleExecutor")
+AsyncExecutorType = TypeVar("AsyncExecutorType", bound="AsyncExecutor")
+AsyncOutputExecutorType = TypeVar("AsyncOutputExecutorType", bound="AsyncOutputExecutor")
+
+
+class AsyncSimpleExecutor(ExecutorMixin):  # pylint:disable=too-many-instance-attributes
+    """Simple asyncio subprocess executor with start/stop/kill functionality."""
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        command: Union[str, List[str], Tuple[str, ...]],
+        cwd: Optional[str] = None,
+        shell: bool = False,
+        timeout: Union[int, float] = 3600,
+        sleep: float = 0.1,
+        stop_signal: int = signal.SIGTERM,
+        kill_signal: int = SIGKILL,
+        expected_returncode: Optional[int] = None,
+        envvars: Optional[Dict[str, str]] = None,
+        stdin: Union[None, int] = subprocess.PIPE,
+        stdout: Union[None, int] = subprocess.PIPE,
+        stderr: Union[None, int] = None,
+        wait_strategy: Optional[WaitStrategy] = None,
+    ) -> None:
+        """Initialize executor.
+
+        Takes the same arguments as :class:`mirakuru.base.SimpleExecutor`.
+        Only intervals of the ``wait_strategy`` are used, as the event loop
+        itself takes care of waiting on file descriptors.
+        """
+        super().__init__(
+            command,
+            cwd=cwd,
+            shell=shell,
+            timeout=timeout,
+            sleep=sleep,
+            stop_signal=stop_signal,
+            kill_signal=kill_signal,
+            expected_returncode=expected_returncode,
+            envvars=envvars,
+            wait_strategy=wait_strategy,
+        )
+        self._stdin = stdin
+        self._stdout = stdout
+        self._stderr = stderr
+
+        self.process: Optional[asyncio.subprocess.Process] = None
+        """An :class:`asyncio.subprocess.Process` instance once process is started."""
+
+    async def __aenter__(self: AsyncSimpleExecutorType) -> AsyncSimpleExecutorType:
+        """Enter context manager starting the subprocess.
+
+        :returns: itself
+        :rtype: AsyncSimpleExecutor
+        """
+        return await self.start()
+
+    async def __aexit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager stopping the subprocess."""
+        await self.stop()
+
+    def running(self) -> bool:
+        """Check if executor is running.
+
+        :returns: True if process is running, False otherwise
+        :rtype: bool
+        """
+        if self.process is None:
+            LOG.debug("There is no process running!")
+            return False
+        return self.process.returncode is None
+
+    @property
+    def _popen_kwargs(self) -> Dict[str, Any]:
+        """Get kwargs for the process instance."""
+        kwargs: Dict[str, Any] = {}
+
+        if self._stdin:
+            kwargs["stdin"] = self._stdin
+        if self._stdout:
+            kwargs["stdout"] = self._stdout
+        if self._stderr:
+            kwargs["stderr"] = self._stderr
+
+        kwargs["env"] = self.envvars
+        kwargs["cwd"] = self._cwd
+        if platform.system() != "Windows":
+            kwargs["start_new_session"] = True
+
+        return kwargs
+
+    async def start(self: AsyncSimpleExecutorType) -> AsyncSimpleExecutorType:
+        """Start defined process.
+
+        After process gets started, timeout countdown begins as well.
+
+        :returns: itself
+        :rtype: AsyncSimpleExecutor
+        """
+        if self.process is None:
+            LOG.debug("Starting process: %s", self.command)
+            if self._shell:
+                self.process = await asyncio.create_subprocess_shell(
+                    self.command, **self._popen_kwargs
+                )
+            else:
+                self.process = await asyncio.create_subprocess_exec(
+                    *self.command_parts, **self._popen_kwargs
+                )
+
+        self._set_timeout()
+        return self
+
+    def _remaining(self) -> float:
+        """Return number of seconds left until the timeout."""
+        remaining = self._remaining_time()
+        return self._timeout if remaining is None else remaining
+
+    def _clear_process(self) -> None:
+        """Forget the process, closing its pipes."""
+        if self.process:
+            # pylint:disable=protected-access
+            transport = getattr(self.process, "_transport", None)
+            if transport is not None:
+                transport.close()
+            self.process = None
+
+        self._endtime = None
+
+    def _kill_all_kids(self, sig: int) -> Set[int]:
+        """Kill all subprocesses (and its subprocesses) that executor started.
+
+        See :meth:`mirakuru.base.SimpleExecutor._kill_all_kids`.
+
+        :param int sig: signal used to stop process run by executor.
+        :return: process ids (pids) of killed processes
+        :rtype: set
+        """
+        pids = processes_with_env(ENV_UUID, self._uuid)
+        for pid in pids:
+            LOG.debug("Killing process %d ...", pid)
+            try:
+                os.kill(pid, sig)
+            except OSError as err:
+                if err.errno not in IGNORED_ERROR_CODES:
+                    raise
+            LOG.debug("Killed process %d.", pid)
+        return pids
+
+    async def _kill_all_kids_async(self, sig: int) -> Set[int]:
+        """Kill all subprocesses without blocking the event loop on the scan."""
+        return await asyncio.to_thread(self._kill_all_kids, sig)
+
+    def _signal_process_group(self, sig: int) -> None:
+        """Send signal to the process group of the process."""
+        if self.process is None:
+            return
+        try:
+            os.killpg(self.process.pid, sig)
+        except OSError as err:
+            if err.errno not in IGNORED_ERROR_CODES:
+                raise
+
+    async def stop(
+        self: AsyncSimpleExecutorType,
+        stop_signal: Optional[int] = None,
+        expected_returncode: Optional[int] = None,
+    ) -> AsyncSimpleExecutorType:
+        """Stop process running.
+
+        Wait for the process to end for the timeout, then just kill it.
+
+        :param int stop_signal: signal used to stop process run by executor.
+            None for default.
+        :param int expected_returncode: expected exit code.
+            None for default - POSIX compatible behaviour.
+        :returns: self
+        :rtype: AsyncSimpleExecutor
+        """
+        if self.process is None:
+            return self
+
+        if stop_signal is None:
+            stop_signal = self._stop_signal
+
+        self._signal_process_group(stop_signal)
+        self._set_timeout()
+        try:
+            await asyncio.wait_for(self.process.wait(), self._remaining())
+        except asyncio.TimeoutError:
+            # same as the regular executor: the process gets killed
+            await self.kill()
+            return self
+
+        await self._kill_all_kids_async(stop_signal)
+        exit_code = self.process.returncode
+        self._clear_process()
+
+        if expected_returncode is None:
+            expected_returncode = self._expected_returncode
+        if expected_returncode is None:
+            expected_returncode = -stop_signal
+
+        if exit_code and exit_code != expected_returncode:
+            raise ProcessFinishedWithError(self, exit_code)
+
+        return self
+
+    @asynccontextmanager
+    async def stopped(self: AsyncSimpleExecutorType) -> AsyncIterator[AsyncSimpleExecutorType]:
+        """Stop process for given context and starts it afterwards.
+
+        :yields: itself
+        :rtype: AsyncSimpleExecutor
+        """
+        if self.running():
+            await self.stop()
+            yield self
+            await self.start()
+
+    async def kill(
+        self: AsyncSimpleExecutorType, wait: bool = True, sig: Optional[int] = None
+    ) -> AsyncSimpleExecutorType:
+        """Kill the process if running.
+
+        :param bool wait: set to `True` to wait for the process to end,
+            or False, to simply proceed after sending signal.
+        :param int sig: signal used to kill process run by the executor.
+            None by default.
+        :returns: itself
+        :rtype: AsyncSimpleExecutor
+        """
+        if sig is None:
+            sig = self._kill_signal
+        if self.process and self.running():
+            self._signal_process_group(sig)
+            if wait:
+                await self.process.wait()
+
+        await self._kill_all_kids_async(sig)
+        self._clear_process()
+        return self
+
+    def output(self) -> Optional[asyncio.StreamReader]:
+        """Return subprocess output."""
+        if self.process is not None:
+            return self.process.stdout
+        return None  # pragma: no cover
+
+    def err_output(self) -> Optional[asyncio.StreamReader]:
+        """Return subprocess stderr."""
+        if self.process is not None:
+            return self.process.stderr
+        return None  # pragma: no cover
+
+    async def wait_for(
+        self: AsyncSimpleExecutorType, wait_for: Callable[[], Awaitable[bool]]
+    ) -> AsyncSimpleExecutorType:
+        """Wait for callback to return True.
+
+        Simply returns if wait_for condition has been met,
+        raises TimeoutExpired otherwise and kills the process.
+        Waiting between checks ends early if the process exits.
+
+        :param callback wait_for: coroutine function to call
+        :raises: mirakuru.exceptions.TimeoutExpired
+        :returns: itself
+        :rtype: AsyncSimpleExecutor
+        """
+        intervals = self._wait_strategy.intervals()
+        rechecked = False
+        while self.check_timeout():
+            if await wait_for():
+                return self
+            interval = min(next(intervals), self._remaining())
+            if self.process is not None and self.process.returncode is None:
+                try:
+                    await asyncio.wait_for(self.process.wait(), interval)
+                except asyncio.TimeoutError:
+                    pass
+            elif self.process is not None and not rechecked:
+                # process exited during the check, check it again right away
+                rechecked = True
+            else:
+                await asyncio.sleep(interval)
+
+        await self.kill()
+        raise TimeoutExpired(self, timeout=self._timeout)
+
+    def __del__(self) -> None:
+        """Kill subprocesses created during Executor lifetime.
+
+        It can't wait for the process to end, so prefer using the executor
+        as an asynchronous context manager.
+        """
+        if self.process is not None and self.process.returncode is None:
+            self._signal_process_group(self._kill_signal)
+            self._kill_all_kids(self._kill_signal)
+
+
+class AsyncExecutor(AsyncSimpleExecutor):
+    """Base class for asyncio executors with a pre- and after-start checks."""
+
+    async def pre_start_check(self) -> bool:
+        """Check process before the start of executor.
+
+        Should be overridden in order to return True when some other
+        executor (or process) has already started with the same configuration.
+        :rtype: bool
+        """
+        raise NotImplementedError
+
+    async def start(self: AsyncExecutorType) -> AsyncExecutorType:
+        """Start executor with additional checks.
+
+        Checks if previous executor isn't running then start process
+        (executor) and wait until it's started.
+        :returns: itself
+        :rtype: AsyncExecutor
+        """
+        if await self.pre_start_check():
+            # Some other executor (or process) is running with same config:
+            raise AlreadyRunning(self)
+
+        await super().start()
+
+        await self.wait_for(self.check_subprocess)
+        return self
+
+    async def check_subprocess(self) -> bool:
+        """Make sure the process didn't exit with an error and run the checks.
+
+        :rtype: bool
+        :return: the actual check status or False before starting the process
+        :raise ProcessExitedWithError: when the main process exits with
+            an error
+        """
+        if self.process is None:  # pragma: no cover
+            return False
+        exit_code = self.process.returncode
+        if exit_code is not None and exit_code != 0:
+            await self._kill_all_kids_async(self._kill_signal)
+            self._clear_process()
+            raise ProcessExitedWithError(self, exit_code)
+
+        return await self.after_start_check()
+
+    async def after_start_check(self) -> bool:
+        """Check process after the start of executor.
+
+        Should be overridden in order to return boolean value if executor
+        can be treated as started.
+        :rtype: bool
+        """
+        raise NotImplementedError
+
+
+class AsyncTCPExecutor(AsyncExecutor):
+    """TCP-listening process asyncio executor."""
+
+    def __init__(
+        self,
+        command: Union[str, List[str], Tuple[str, ...]],
+        host: str,
+        port: int,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize AsyncTCPExecutor executor.
+
+        :param (str, list) command: command to be run by the subprocess
+        :param str host: host under which process is accessible
+        :param int port: port under which process is accessible
+        """
+        super().__init__(command, **kwargs)
+        self.host = host
+        """Host name, process is listening on."""
+        self.port = port
+        """Port number, process is listening on."""
+
+    async def pre_start_check(self) -> bool:
+        """Check if process accepts connections.
+
+        Connecting never takes longer than the time left until the timeout.
+        """
+        try:
+            _, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    self.host, self.port, happy_eyeballs_delay=CONNECT_ATTEMPT_DELAY
+                ),
+                self._remaining(),
+            )
+        except (OSError, asyncio.TimeoutError):
+            return False
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+        return True
+
+    async def after_start_check(self) -> bool:
+        """Check if process accepts connections."""
+        return await self.pre_start_check()
+
+
+class AsyncHTTPExecutor(AsyncTCPExecutor):
+    """Http enabled process asyncio executor."""
+
+    DEFAULT_PORT = 80
+    """Default TCP port for the HTTP protocol."""
+
+    def __init__(
+        self,
+        command: Union[str, List[str], Tuple[str, ...]],
+        url: str,
+        status: Union[str, int] = r"^2\d\d$",
+        method: str = "HEAD",
+        payload: Optional[Dict[str, str]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize AsyncHTTPExecutor executor.
+
+        Takes the same arguments as :class:`mirakuru.http.HTTPExecutor`.
+        """
+        self.url = urlparse(url)
+        """An :func:`urlparse.urlparse` representation of an url."""
+
+        if not self.url.hostname:
+            raise ValueError("Url provided does not contain hostname")
+
+        port = self.url.port
+        if port is None:
+            port = self.DEFAULT_PORT
+
+        self.status = str(status)
+        self.status_re = re.compile(str(status))
+        self.method = method
+        self.payload = payload
+        self.headers = headers
+
+        super().__init__(command, host=self.url.hostname, port=port, **kwargs)
+
+        # every check opens a new connection
+        self._request = build_request(
+            self.method,
+            self.url,
+            self.port,
+            self.payload,
+            self.headers,
+            close=True,
+            default_port=self.DEFAULT_PORT,
+        )
+
+    async def after_start_check(self) -> bool:
+        """Check if defined URL returns expected status to a check request."""
+        try:
+            reader, writer = await asyncio.wait_for(
+                asyncio.open_connection(
+                    self.host, self.port, happy_eyeballs_delay=CONNECT_ATTEMPT_DELAY
+                ),
+                self._remaining(),
+            )
+        except (OSError, asyncio.TimeoutError) as ex:
+            LOG.debug("Encounter %s while trying to check if service has started.", ex)
+            return False
+        try:
+            writer.write(self._request)
+            status_line = await asyncio.wait_for(reader.readline(), self._remaining())
+        except (OSError, asyncio.TimeoutError) as ex:
+            LOG.debug("Encounter %s while trying to check if service has started.", ex)
+            return False
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+        parts = status_line.split(maxsplit=2)
+        if len(parts) < 2:
+            return False
+        status = parts[1].decode("latin-1")
+        return status == self.status or bool(self.status_re.match(status))
+
+
+class AsyncOutputExecutor(AsyncSimpleExecutor):
+    """Asyncio executor that awaits for string output being present in output."""
+
+    def __init__(
+        self,
+        command: Union[str, List[str], Tuple[str, ...]],
+        banner: str,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize AsyncOutputExecutor executor.
+
+        :param (str, list) command: command to be run by the subprocess
+        :param str banner: string that has to appear in process output -
+            should compile to regular expression.
+        """
+        super().__init__(command, **kwargs)
+        self._banner = re.compile(banner)
+        if not any((self._stdout, self._stderr)):
+            raise TypeError("At least one of stdout or stderr has to be initialized")
+
+    async def start(self: AsyncOutputExecutorType) -> AsyncOutputExecutorType:
+        """Start process.
+
+        Process will be considered started, when defined banner will appear
+        in process output. Outputs are read as soon as there's something to
+        read, no polling is involved.
+
+        :raises: mirakuru.exceptions.TimeoutExpired when the banner doesn't
+            appear before the timeout, or the outputs got closed without it
+        :returns: itself
+        :rtype: AsyncOutputExecutor
+        """
+        await super().start()
+        assert self.process is not None
+        streams = [
+            stream
+            for handle, stream in (
+                (self._stdout, self.process.stdout),
+                (self._stderr, self.process.stderr),
+            )
+            if handle is not None and stream is not None
+        ]
+        found = False
+        try:
+            found = await asyncio.wait_for(self._wait_for_banner(streams), self._remaining())
+        except asyncio.TimeoutError:
+            pass
+        if not found:
+            await self.kill()
+            raise TimeoutExpired(self, timeout=self._timeout)
+        return self
+
+    async def _wait_for_banner(self, streams: List[asyncio.StreamReader]) -> bool:
+        """Read all the outputs concurrently until banner appears in any."""
+        readers = [asyncio.ensure_future(self._read_until_banner(stream)) for stream in streams]
+        try:
+            for reader in asyncio.as_completed(readers):
+                if await reader:
+                    return True
+            return False
+        finally:
+            for reader in readers:
+                reader.cancel()
+
+    @staticmethod
+    async def _read_line(stream: asyncio.StreamReader) -> bytes:
+        """Read line of output, also one longer than the stream's buffer limit."""
+        line = b""
+        while True:
+            try:
+                return line + await stream.readuntil(b"\n")
+            except asyncio.IncompleteReadError as err:
+                # output closed before the line ended
+                return line + err.partial
+            except asyncio.LimitOverrunError as err:
+                line += await stream.readexactly(err.consumed)
+
+    async def _read_until_banner(self, stream: asyncio.StreamReader) -> bool:
+        """Read output line by line until it matches banner or gets closed."""
+        while True:
+            line = await self._read_line(stream)
+            if not line:
+                return False
+            if self._banner.match(line.decode(errors="replace")):
+                return True
@@ -0,0 +1,121 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Handle of a running process, which is not a child of the current process."""
+
+import os
+import signal
+import subprocess
+import time
+from types import TracebackType
+from typing import Any, Optional, Type
+
+from mirakuru.compat import SIGKILL
+
+
+def pid_running(pid: int) -> bool:
+    """Check if the process is running.
+
+    Zombie processes (exited, but not reaped by their parent yet) are not
+    considered running.
+
+    :param int pid: process identifier
+    :rtype: bool
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # running as other user
+        pass
+    try:
+        with open(f"/proc/{pid}/stat", encoding="utf-8") as stat:
+            # pid (comm) state ...
+            return stat.read().rsplit(")", 1)[1].split()[0] not in ("Z", "X")
+    except (OSError, IndexError):
+        return True
+
+
+class AttachedProcess:
+    """Process started by somebody else, handled like `subprocess.Popen`.
+
+    Exit code of a process that's not a child is not known, so it's reported
+    as 0. It has no standard streams.
+    """
+
+    stdin = None
+    stdout = None
+    stderr = None
+
+    def __init__(self, pid: int, args: Any = None) -> None:
+        """Initialize AttachedProcess.
+
+        :param int pid: process identifier
+        :param args: command the process runs, if known
+        """
+        self.pid = pid
+        self.args = args
+        self.returncode: Optional[int] = None
+
+    def __enter__(self) -> "AttachedProcess":
+        """Enter context manager."""
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager, the process is not waited for."""
+
+    def poll(self) -> Optional[int]:
+        """Check if the process has exited.
+
+        :return: 0 once the process has exited, None otherwise
+        """
+        if self.returncode is None and not pid_running(self.pid):
+            self.returncode = 0
+        return self.returncode
+
+    def wait(self, timeout: Optional[float] = None) -> int:
+        """Wait for the process to exit.
+
+        :param float timeout: maximum number of seconds to wait
+        :raises: subprocess.TimeoutExpired when the process is still running
+        :return: 0
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self.poll() is None:
+            if deadline is not None and time.monotonic() >= deadline:
+                raise subprocess.TimeoutExpired(self.args, timeout or 0)
+            time.sleep(0.01)
+        return 0
+
+    def send_signal(self, sig: int) -> None:
+        """Send the signal to the process."""
+        if self.poll() is None:
+            os.kill(self.pid, sig)
+
+    def terminate(self) -> None:
+        """Terminate the process."""
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self) -> None:
+        """Kill the process."""
+        self.send_signal(SIGKILL)
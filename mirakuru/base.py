@@ -25,18 +25,23 @@ import platform
 import shlex
 import signal
 import subprocess
+import threading
 import time
 import uuid
+import weakref
 from contextlib import contextmanager
 from types import TracebackType
 from typing import (
     IO,
+    TYPE_CHECKING,
     Any,
     Callable,
     Dict,
+    Iterable,
     Iterator,
     List,
     Optional,
+    Sequence,
     Set,
     Tuple,
     Type,
@@ -44,14 +49,26 @@ from typing import (
     Union,
 )
 
-from mirakuru.base_env import processes_with_env
-from mirakuru.compat import SIGKILL
+from mirakuru.attached import AttachedProcess
+from mirakuru.base_env import (
+    process_command,
+    process_descendants,
+    processes_env_values,
+    processes_with_env,
+)
+from mirakuru.cgroup import CGroup
+from mirakuru.compat import SIGKILL, pidfd_open
 from mirakuru.exceptions import (
     AlreadyRunning,
     ProcessExitedWithError,
+    ProcessFailedToStart,
     ProcessFinishedWithError,
     TimeoutExpired,
 )
+from mirakuru.wait import EventWait, FixedWait, WaitStrategy
+
+if TYPE_CHECKING:
+    from mirakuru.forkserver import ForkServer
 
 LOG = logging.getLogger(__name__)
 
@@ -60,6 +77,11 @@ ENV_UUID = "mirakuru_uuid"
 Name of the environment variable used by mirakuru to mark its subprocesses.
 """
 
+EXIT_WAIT = EventWait(FixedWait(1.0))
+"""
+Strategy used to wait for the process exit when it has a process file descriptor.
+"""
+
 IGNORED_ERROR_CODES = [errno.ESRCH]
 if platform.system() == "Darwin":
     IGNORED_ERROR_CODES = [errno.ESRCH, errno.EPERM]
@@ -69,28 +91,199 @@ if platform.system() == "Darwin":
 SimpleExecutorType = TypeVar("SimpleExecutorType", bound="SimpleExecutor")
 ExecutorType = TypeVar("ExecutorType", bound="Executor")
 
+FailureCheck = Callable[["SimpleExecutor"], Optional[str]]
+"""Callable telling why the process won't start, or returning None."""
+
+LIVE_EXECUTORS: "weakref.WeakSet[SimpleExecutor]" = weakref.WeakSet()
+"""Executors started by the current process, which still have a process."""
+
+DETACHED_UUIDS: Set[str] = set()
+"""Markers of processes detached in the current process, which are left running on exit."""
+
+if hasattr(os, "register_at_fork"):
+    # Forked children must not clean up processes of their parent's executors.
+    os.register_at_fork(after_in_child=LIVE_EXECUTORS.clear)
+
+
+def _process_group(pid: int) -> Optional[int]:
+    """Return process group of the process, None if it's gone."""
+    try:
+        return os.getpgid(pid)
+    except OSError:
+        return None
+
 
 @atexit.register
 def cleanup_subprocesses() -> None:
     """On python exit: find possibly running subprocesses and kill them."""
     # atexit functions tends to loose global imports sometimes so reimport
     # everything what is needed again here:
-    import errno
-    import os
-
-    from mirakuru.base_env import processes_with_env
+    from mirakuru.base import kill_executors
     from mirakuru.compat import SIGKILL
 
-    pids = processes_with_env(ENV_UUID, str(os.getpid()))
-    for pid in pids:
-        try:
-            os.kill(pid, SIGKILL)
-        except OSError as err:
-            if err.errno != errno.ESRCH:
-                print("Can not kill the", pid, "leaked process", err)
+    kill_executors(sig=SIGKILL, leaked=True)
+
+
+def kill_executors(
+    executors: Optional[Iterable["SimpleExecutor"]] = None,
+    sig: int = SIGKILL,
+    leaked: bool = False,
+) -> Set[int]:
+    """Kill processes of many executors at once.
+
+    Instead of every executor scanning all processes for its leftovers,
+    processes are scanned once, grouped by their mirakuru_uuid marker
+    and signalled all at once.
+
+    :param iterable executors: executors to kill, all live executors
+        by default
+    :param int sig: signal used to kill the processes
+    :param bool leaked: also kill processes left by executors created in the
+        current process, which are gone already, except the detached ones
+    :return: process ids (pids) of killed processes
+    :rtype: set
+    """
+    if executors is None:
+        executors = LIVE_EXECUTORS
+    executors = list(executors)
+
+    for executor in executors:
+        if executor.process and executor.running():
+            try:
+                executor._signal_process(sig)
+            except OSError as err:
+                if err.errno not in IGNORED_ERROR_CODES:
+                    LOG.warning("Can not kill %s: %s", executor, err)
+
+    pids: Set[int] = set()
+    uuids = set()
+    for executor in executors:
+        if executor._cgroup is not None:
+            pids.update(executor._cgroup.kill(sig))
+        else:
+            uuids.add(executor._uuid)
+    if uuids or leaked:
+        prefix = f"{os.getpid()}:"
+        for pid, value in processes_env_values(ENV_UUID).items():
+            if value in uuids or (
+                leaked and value.startswith(prefix) and value not in DETACHED_UUIDS
+            ):
+                pids.add(pid)
+                try:
+                    os.kill(pid, sig)
+                except OSError as err:
+                    if err.errno not in IGNORED_ERROR_CODES:
+                        LOG.warning("Can not kill the %d leaked process: %s", pid, err)
+
+    for executor in executors:
+        if executor.process:
+            executor.process.wait()
+        executor._clear_process()
+    return pids
+
+
+class ExecutorMixin:
+    """Command, environment and timeout handling shared by all executors."""
+
+    def __init__(  # pylint:disable=too-many-arguments
+        self,
+        command: Union[str, List[str], Tuple[str, ...]],
+        cwd: Optional[str] = None,
+        shell: bool = False,
+        timeout: Union[int, float] = 3600,
+        sleep: float = 0.1,
+        stop_signal: int = signal.SIGTERM,
+        kill_signal: int = SIGKILL,
+        expected_returncode: Optional[int] = None,
+        envvars: Optional[Dict[str, str]] = None,
+        wait_strategy: Optional[WaitStrategy] = None,
+    ) -> None:
+        """Initialize executor configuration.
+
+        See :class:`SimpleExecutor` for the parameters.
+        """
+        if isinstance(command, (list, tuple)):
+            self.command = " ".join((shlex.quote(c) for c in command))
+            """Command that the executor runs."""
+            self.command_parts = command
+        else:
+            self.command = command
+            self.command_parts = shlex.split(command)
+
+        self._cwd = cwd
+        self._shell = True
+        if platform.system() != "Windows":
+            self._shell = shell
+
+        self._timeout = timeout
+        self._sleep = sleep
+        self._wait_strategy = wait_strategy or FixedWait(sleep)
+        self._stop_signal = stop_signal
+        self._kill_signal = kill_signal
+        self._expected_returncode = expected_returncode
+        self._envvars = envvars or {}
+
+        self._endtime: Optional[float] = None
+        self._uuid = f"{os.getpid()}:{uuid.uuid4()}"
+
+    @property
+    def envvars(self) -> Dict[str, str]:
+        """Combines required environment variables with os.environ and mirakuru_uuid."""
+        envs = os.environ.copy()
+        envs.update(self._envvars)
+        # Trick with marking subprocesses with an environment variable.
+        #
+        # There is no easy way to recognize all subprocesses that were
+        # spawned during lifetime of a certain subprocess so mirakuru does
+        # this hack in order to mark who was the original parent. Even if
+        # some subprocess got daemonized or changed original process group
+        # mirakuru will be able to find it by this environment variable.
+        #
+        # There may be a situation when some subprocess will abandon
+        # original envs from parents and then it won't be later found.
+        envs[ENV_UUID] = self._uuid
+        return envs
+
+    def _set_timeout(self) -> None:
+        """Set timeout for possible wait."""
+        self._endtime = time.time() + self._timeout
+
+    def _remaining_time(self) -> Optional[float]:
+        """Return number of seconds left until the timeout, None without timeout."""
+        if self._endtime is None:
+            return None
+        return max(self._endtime - time.time(), 0)
+
+    def check_timeout(self) -> bool:
+        """Check if timeout has expired.
+
+        Returns True if there is no timeout set or the timeout has not expired.
+        Kills the process and raises TimeoutExpired exception otherwise.
+
+        This method should be used in while loops waiting for some data.
+
+        :return: True if timeout expired, False if not
+        :rtype: bool
+        """
+        return self._endtime is None or time.time() <= self._endtime
+
+    def __repr__(self) -> str:
+        """Return unambiguous executor representation."""
+        command = self.command
+        if len(command) > 10:
+            command = command[:10] + "..."
+        module = self.__class__.__module__
+        executor = self.__class__.__name__
+        return f'<{module}.{executor}: "{command}" {hex(id(self))}>'
+
+    def __str__(self) -> str:
+        """Return readable executor representation."""
+        module = self.__class__.__module__
+        executor = self.__class__.__name__
+        return f'<{module}.{executor}: "{self.command}" {hex(id(self))}>'
 
 
-class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
+class SimpleExecutor(ExecutorMixin):  # pylint:disable=too-many-instance-attributes
     """Simple subprocess executor with start/stop/kill functionality."""
 
     def __init__(  # pylint:disable=too-many-arguments
@@ -107,6 +300,11 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
         stdin: Union[None, int, IO[Any]] = subprocess.PIPE,
         stdout: Union[None, int, IO[Any]] = subprocess.PIPE,
         stderr: Union[None, int, IO[Any]] = None,
+        wait_strategy: Optional[WaitStrategy] = None,
+        discovery: str = "env",
+        cgroup: Optional[str] = None,
+        failure_checks: Iterable[FailureCheck] = (),
+        fork_server: Optional["ForkServer"] = None,
     ) -> None:
         """Initialize executor.
 
@@ -128,6 +326,25 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
         :param int stdin: file descriptor for stdin
         :param int stdout: file descriptor for stdout
         :param int stderr: file descriptor for stderr
+        :param WaitStrategy wait_strategy: how to wait between start/stop
+            condition checks. Defaults to :class:`mirakuru.wait.FixedWait`
+            with the ``sleep`` interval.
+        :param str discovery: how to find subprocesses left to clean up.
+            ``env`` (default) scans all processes for the mirakuru_uuid
+            environment marker. ``tree`` walks the process tree of the running
+            process instead and falls back to the scan only if the process
+            has already exited (e.g. it daemonized).
+        :param str cgroup: path of a cgroup v2 directory delegated to the
+            current user. If given, the process is started in its own group
+            created there, and all its subprocesses are found and killed
+            through the group instead. Linux only.
+        :param list failure_checks: callables evaluated while waiting for the
+            process to start (see :mod:`mirakuru.failures`). As soon as any
+            of them returns a reason, the process is killed and
+            :class:`mirakuru.exceptions.ProcessFailedToStart` is raised.
+        :param ForkServer fork_server: fork server to start the process with,
+            instead of starting a new interpreter (see
+            :mod:`mirakuru.forkserver`). Command has to run Python.
 
         .. note::
 
@@ -141,35 +358,41 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
             is a good practice to set this.
 
         """
-        if isinstance(command, (list, tuple)):
-            self.command = " ".join((shlex.quote(c) for c in command))
-            """Command that the executor runs."""
-            self.command_parts = command
-        else:
-            self.command = command
-            self.command_parts = shlex.split(command)
-
-        self._cwd = cwd
-        self._shell = True
-        if platform.system() != "Windows":
-            self._shell = shell
-
-        self._timeout = timeout
-        self._sleep = sleep
-        self._stop_signal = stop_signal
-        self._kill_signal = kill_signal
-        self._expected_returncode = expected_returncode
-        self._envvars = envvars or {}
+        super().__init__(
+            command,
+            cwd=cwd,
+            shell=shell,
+            timeout=timeout,
+            sleep=sleep,
+            stop_signal=stop_signal,
+            kill_signal=kill_signal,
+            expected_returncode=expected_returncode,
+            envvars=envvars,
+            wait_strategy=wait_strategy,
+        )
+        self._discovery = discovery
+        self._spawn_kwargs: Optional[Dict[str, Any]] = None
 
         self._stdin = stdin
         self._stdout = stdout
         self._stderr = stderr
 
-        self._endtime: Optional[float] = None
         self.process: Optional[subprocess.Popen] = None
         """A :class:`subprocess.Popen` instance once process is started."""
+        self._pidfd: Optional[int] = None
 
-        self._uuid = f"{os.getpid()}:{uuid.uuid4()}"
+        self._own_uuid = self._uuid
+        self._cgroup: Optional[CGroup] = None
+        if cgroup is not None:
+            self._cgroup = CGroup(cgroup, f"mirakuru-{self._uuid.replace(':', '-')}")
+
+        self._failure_checks = list(failure_checks)
+        self._fork_server = fork_server
+
+        if discovery not in ("env", "tree"):
+            raise ValueError(f"Unknown discovery mode: {discovery}")
+        if fork_server is not None and (self._shell or cgroup is not None):
+            raise ValueError("Fork server can't start processes in a shell or a cgroup")
 
     def __enter__(self: SimpleExecutorType) -> SimpleExecutorType:
         """Enter context manager starting the subprocess.
@@ -199,24 +422,6 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
             return False
         return self.process.poll() is None
 
-    @property
-    def envvars(self) -> Dict[str, str]:
-        """Combines required environment variables with os.environ and mirakuru_uuid."""
-        envs = os.environ.copy()
-        envs.update(self._envvars)
-        # Trick with marking subprocesses with an environment variable.
-        #
-        # There is no easy way to recognize all subprocesses that were
-        # spawned during lifetime of a certain subprocess so mirakuru does
-        # this hack in order to mark who was the original parent. Even if
-        # some subprocess got daemonized or changed original process group
-        # mirakuru will be able to find it by this environment variable.
-        #
-        # There may be a situation when some subprocess will abandon
-        # original envs from parents and then it won't be later found.
-        envs[ENV_UUID] = self._uuid
-        return envs
-
     @property
     def _popen_kwargs(self) -> Dict[str, Any]:
         """Get kwargs for the process instance.
@@ -226,8 +431,22 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
             streams in universal newlines mode, so we have to set
             ``universal_newlines`` to ``True``.
 
+        .. note::
+            They're computed once, on first start, so the environment
+            doesn't get rebuilt on every restart. Changes of ``os.environ``
+            made afterwards are not passed to the process.
+
+        .. note::
+            New session is started with ``start_new_session``, not with
+            ``preexec_fn``, so CPython can spawn the process with ``vfork``,
+            which doesn't copy parent's memory mappings. ``preexec_fn`` is
+            used only to join the cgroup.
+
         :return:
         """
+        if self._spawn_kwargs is not None:
+            return self._spawn_kwargs
+
         kwargs: Dict[str, Any] = {}
 
         if self._stdin:
@@ -242,10 +461,20 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
         kwargs["env"] = self.envvars
         kwargs["cwd"] = self._cwd
         if platform.system() != "Windows":
-            kwargs["preexec_fn"] = os.setsid
+            kwargs["start_new_session"] = True
+        if self._cgroup is not None:
+            kwargs["start_new_session"] = False
+            kwargs["preexec_fn"] = self._preexec_cgroup
 
+        self._spawn_kwargs = kwargs
         return kwargs
 
+    def _preexec_cgroup(self) -> None:
+        """Start a new session and join executor's cgroup in the child process."""
+        os.setsid()
+        if self._cgroup is not None:
+            self._cgroup.join()
+
     def start(self: SimpleExecutorType) -> SimpleExecutorType:
         """Start defined process.
 
@@ -259,15 +488,21 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
             if not self._shell:
                 command = self.command_parts
             LOG.debug("Starting process: %s", command)
-            self.process = subprocess.Popen(command, **self._popen_kwargs)
+            if self._cgroup is not None:
+                self._cgroup.create()
+            popen = subprocess.Popen if self._fork_server is None else self._fork_server.popen
+            try:
+                self.process = popen(command, **self._popen_kwargs)
+            except Exception:
+                if self._cgroup is not None:
+                    self._cgroup.remove()
+                raise
+            LIVE_EXECUTORS.add(self)
+            self._pidfd = pidfd_open(self.process.pid)
 
         self._set_timeout()
         return self
 
-    def _set_timeout(self) -> None:
-        """Set timeout for possible wait."""
-        self._endtime = time.time() + self._timeout
-
     def _clear_process(self) -> None:
         """Close stdin/stdout of subprocess.
 
@@ -276,10 +511,117 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
         if self.process:
             self.process.__exit__(None, None, None)
             self.process = None
+        if self._pidfd is not None:
+            os.close(self._pidfd)
+            self._pidfd = None
+        if self._cgroup is not None:
+            self._cgroup.remove()
+        LIVE_EXECUTORS.discard(self)
 
         self._endtime = None
+        self._uuid = self._own_uuid
+
+    def _attach(self, pid: int, marker: str, endpoint: Dict[str, Any]) -> None:
+        """Take over running process, started by some other executor.
+
+        Process gets stopped and its subprocesses found the same way as if
+        it was started by this executor.
+
+        :param int pid: PID of the process
+        :param str marker: mirakuru_uuid value the process was started with
+        :param dict endpoint: where the process is available, as returned by
+            :meth:`_endpoint` of the executor that started it
+        """
+        self.process = AttachedProcess(pid, self.command_parts)  # type: ignore[assignment]
+        self._uuid = marker
+        self._use_endpoint(endpoint)
+        LIVE_EXECUTORS.add(self)
+        self._pidfd = pidfd_open(pid)
+
+    def detach(self: SimpleExecutorType) -> SimpleExecutorType:
+        """Forget the process, leaving it running.
+
+        The process is not killed on exit anymore, so it can be adopted
+        later (see ``adopt`` argument of :class:`Executor`).
+
+        :returns: itself
+        :rtype: SimpleExecutor
+        """
+        if self.process is not None:
+            DETACHED_UUIDS.add(self._uuid)
+            if self._uuid == self._own_uuid:
+                # processes started later on can't share the marker
+                self._own_uuid = f"{os.getpid()}:{uuid.uuid4()}"
+                # environment with the old marker is cached along with the rest
+                self._spawn_kwargs = None
+            for stream in (self.process.stdin, self.process.stdout, self.process.stderr):
+                if stream is not None:
+                    stream.close()
+            if isinstance(self.process, subprocess.Popen):
+                # reap it once it exits, without waiting for it here
+                threading.Thread(target=self.process.wait, daemon=True).start()
+            self.process = None
+        self._clear_process()
+        return self
+
+    def _signal_process(self, sig: int) -> None:
+        """Send the signal to the process group.
+
+        Adopted process, which doesn't lead its own process group, gets the
+        signal alone.
+        """
+        assert self.process is not None
+        pid = self.process.pid
+        if os.getpgid(pid) != pid:
+            os.kill(pid, sig)
+        else:
+            os.killpg(pid, sig)
+
+    def _endpoint(self) -> Dict[str, Any]:
+        """Return where the running process is available, for other executors.
+
+        :rtype: dict
+        """
+        return {}
+
+    def _use_endpoint(self, endpoint: Dict[str, Any]) -> None:
+        """Use the process available where the other executor says.
+
+        :param dict endpoint: as returned by :meth:`_endpoint`
+        """
+
+    def _process_fds(self) -> List[int]:
+        """Return process file descriptor while the process is running.
+
+        It becomes readable as soon as the process exits.
+        """
+        if self._pidfd is not None and self.process and self.process.returncode is None:
+            return [self._pidfd]
+        return []
+
+    def _find_kids(self) -> Optional[Set[int]]:
+        """Find subprocesses of the running process by walking the process tree.
 
-    def _kill_all_kids(self, sig: int) -> Set[int]:
+        Has to be called before the process gets stopped, as its descendants
+        are orphaned once it exits.
+
+        :return: process ids (pids) of the process and its descendants,
+            or None if the whole system has to be scanned for them instead:
+            with ``env`` discovery, when the process has already exited (its
+            descendants are orphans now) or the process tree can't be listed.
+        :rtype: set
+        """
+        if self._discovery != "tree" or self._cgroup is not None:
+            return None
+        if self.process is None or not self.running():
+            return None
+        pids = process_descendants(self.process.pid)
+        if pids is None:
+            return None
+        pids.add(self.process.pid)
+        return pids
+
+    def _kill_all_kids(self, sig: int, pids: Optional[Set[int]] = None) -> Set[int]:
         """Kill all subprocesses (and its subprocesses) that executor started.
 
         This function tries to kill all leftovers in process tree that current
@@ -288,10 +630,16 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
         some daemons fired by subprocess may still be running.
 
         :param int sig: signal used to stop process run by executor.
+        :param set pids: candidate process ids found by :meth:`_find_kids`.
+            Only those are checked for the environment variable, instead of
+            all processes in the system.
         :return: process ids (pids) of killed processes
         :rtype: set
         """
-        pids = processes_with_env(ENV_UUID, self._uuid)
+        if self._cgroup is not None:
+            # All subprocesses are in the executor's cgroup.
+            return self._cgroup.kill(sig)
+        pids = processes_with_env(ENV_UUID, self._uuid, pids)
         for pid in pids:
             LOG.debug("Killing process %d ...", pid)
             try:
@@ -332,8 +680,9 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
         if stop_signal is None:
             stop_signal = self._stop_signal
 
+        kids = self._find_kids()
         try:
-            os.killpg(self.process.pid, stop_signal)
+            self._signal_process(stop_signal)
         except OSError as err:
             if err.errno in IGNORED_ERROR_CODES:
                 pass
@@ -344,9 +693,12 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
             """Return True only only when self.process is not running."""
             return self.running() is False
 
+        # Block on the process file descriptor if possible, so stopping takes
+        # exactly as long as the process needs to shut down.
+        strategy = EXIT_WAIT if self._pidfd is not None else self._wait_strategy
         self._set_timeout()
         try:
-            self.wait_for(process_stopped)
+            self._wait_for(process_stopped, self._process_fds, strategy)
         except TimeoutExpired:
             # at this moment, process got killed,
             pass
@@ -355,7 +707,7 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
             # the process has already been force killed and cleaned up by the
             # `wait_for` above.
             return self  # type: ignore[unreachable]
-        self._kill_all_kids(stop_signal)
+        self._kill_all_kids(stop_signal, kids)
         exit_code = self.process.wait()
         self._clear_process()
 
@@ -400,15 +752,28 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
         """
         if sig is None:
             sig = self._kill_signal
+        kids = self._find_kids()
         if self.process and self.running():
-            os.killpg(self.process.pid, sig)
+            self._signal_process(sig)
             if wait:
                 self.process.wait()
 
-        self._kill_all_kids(sig)
+        self._kill_all_kids(sig, kids)
         self._clear_process()
         return self
 
+    def resource_usage(self) -> Dict[str, int]:
+        """Return resource usage of all the processes started by the executor.
+
+        Available only for executors running in a cgroup, see
+        :meth:`mirakuru.cgroup.CGroup.stats` for details.
+
+        :rtype: dict
+        """
+        if self._cgroup is None:
+            return {}
+        return self._cgroup.stats()
+
     def output(self) -> Optional[IO[Any]]:
         """Return subprocess output."""
         if self.process is not None:
@@ -421,37 +786,58 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
             return self.process.stderr
         return None  # pragma: no cover
 
-    def wait_for(self: SimpleExecutorType, wait_for: Callable[[], bool]) -> SimpleExecutorType:
+    def wait_for(
+        self: SimpleExecutorType,
+        wait_for: Callable[[], bool],
+        fds: Optional[Callable[[], Sequence[int]]] = None,
+    ) -> SimpleExecutorType:
         """Wait for callback to return True.
 
         Simply returns if wait_for condition has been met,
         raises TimeoutExpired otherwise and kills the process.
 
         :param callback wait_for: callback to call
+        :param callback fds: callback returning file descriptors which become
+            readable whenever the condition might have changed. Used by
+            event-driven wait strategies.
         :raises: mirakuru.exceptions.TimeoutExpired
         :returns: itself
         :rtype: SimpleExecutor
         """
+        return self._wait_for(wait_for, fds, self._wait_strategy)
+
+    def _wait_for(
+        self: SimpleExecutorType,
+        wait_for: Callable[[], bool],
+        fds: Optional[Callable[[], Sequence[int]]],
+        strategy: WaitStrategy,
+    ) -> SimpleExecutorType:
+        """Wait for callback to return True using given wait strategy."""
+        intervals = strategy.intervals()
         while self.check_timeout():
             if wait_for():
                 return self
-            time.sleep(self._sleep)
+            interval = next(intervals)
+            remaining = self._remaining_time()
+            if remaining is not None:
+                # do not oversleep the timeout
+                interval = min(interval, remaining)
+            strategy.wait(interval, fds() if fds else ())
 
         self.kill()
         raise TimeoutExpired(self, timeout=self._timeout)
 
-    def check_timeout(self) -> bool:
-        """Check if timeout has expired.
+    def _check_failures(self) -> None:
+        """Run failure checks.
 
-        Returns True if there is no timeout set or the timeout has not expired.
-        Kills the process and raises TimeoutExpired exception otherwise.
-
-        This method should be used in while loops waiting for some data.
-
-        :return: True if timeout expired, False if not
-        :rtype: bool
+        :raises: mirakuru.exceptions.ProcessFailedToStart when any of the
+            checks fails, after killing the process
         """
-        return self._endtime is None or time.time() <= self._endtime
+        for check in self._failure_checks:
+            reason = check(self)
+            if reason:
+                self.kill()
+                raise ProcessFailedToStart(self, reason)
 
     def __del__(self) -> None:
         """Cleanup subprocesses created during Executor lifetime."""
@@ -465,25 +851,32 @@ class SimpleExecutor:  # pylint:disable=too-many-instance-attributes
             print("*" * 80)
             raise
 
-    def __repr__(self) -> str:
-        """Return unambiguous executor representation."""
-        command = self.command
-        if len(command) > 10:
-            command = command[:10] + "..."
-        module = self.__class__.__module__
-        executor = self.__class__.__name__
-        return f'<{module}.{executor}: "{command}" {hex(id(self))}>'
-
-    def __str__(self) -> str:
-        """Return readable executor representation."""
-        module = self.__class__.__module__
-        executor = self.__class__.__name__
-        return f'<{module}.{executor}: "{self.command}" {hex(id(self))}>'
-
 
 class Executor(SimpleExecutor):
     """Base class for executors with a pre- and after-start checks."""
 
+    def __init__(
+        self,
+        command: Union[str, List[str], Tuple[str, ...]],
+        *args: Any,
+        adopt: bool = False,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize executor.
+
+        :param (str, list) command: command to be run by the subprocess
+        :param bool adopt: when the process seems to be already running,
+            take it over instead of raising
+            :class:`mirakuru.exceptions.AlreadyRunning`. The process gets
+            found by the command (if it was started by any executor), or as
+            the owner of the listening socket.
+        :param args: see :class:`SimpleExecutor`
+        :param kwargs: see :class:`SimpleExecutor`
+        """
+        super().__init__(command, *args, **kwargs)
+        self.adopt = adopt
+        """Whether already running process gets adopted on start."""
+
     def pre_start_check(self) -> bool:
         """Check process before the start of executor.
 
@@ -502,14 +895,72 @@ class Executor(SimpleExecutor):
         :rtype: Executor
         """
         if self.pre_start_check():
+            if self.adopt and self.process is None and self._adopt_running():
+                return self
             # Some other executor (or process) is running with same config:
             raise AlreadyRunning(self)
 
         super().start()
 
-        self.wait_for(self.check_subprocess)
+        self.wait_for(self.check_subprocess, self._wait_fds)
         return self
 
+    def _adopt_running(self) -> bool:
+        """Take over the process already running with the same configuration.
+
+        :return: whether the process has been found
+        """
+        markers = processes_env_values(ENV_UUID)
+        pid = next(
+            (
+                pid
+                for pid in sorted(markers)
+                if self._runs_command(pid) and _process_group(pid) == pid
+            ),
+            None,
+        )
+        if pid is None:
+            pid = self._listener()
+            if pid is not None and pid in markers:
+                # the main process of the executor that started the listener
+                leader = _process_group(pid)
+                if leader is not None and markers.get(leader) == markers[pid]:
+                    pid = leader
+        if pid is None:
+            LOG.debug("Can't find process of %s to adopt", self)
+            return False
+        LOG.debug("Adopting process %d for %s", pid, self)
+        self._attach(pid, markers.get(pid, self._uuid), {})
+        return True
+
+    def _runs_command(self, pid: int) -> bool:
+        """Check if the process runs the executor's command."""
+        cmdline = process_command(pid)
+        if not cmdline:
+            return False
+        if self._shell:
+            return cmdline[-1] == self.command
+        return cmdline == list(self.command_parts)
+
+    def _listener(self) -> Optional[int]:
+        """Find the process listening where the executor's process would.
+
+        Should be overridden by executors checking a listening socket.
+
+        :return: PID of the process, None if it can't be found
+        """
+        return None
+
+    def _wait_fds(self) -> List[int]:
+        """Return file descriptors signalling a possible change of the checks.
+
+        Used by event-driven wait strategies to wake up as soon as the
+        process does something ``after_start_check`` might be interested in.
+        By default it's the process file descriptor (if available), so the
+        process exiting with an error is noticed immediately.
+        """
+        return self._process_fds()
+
     def check_subprocess(self) -> bool:
         """Make sure the process didn't exit with an error and run the checks.
 
@@ -517,6 +968,7 @@ class Executor(SimpleExecutor):
         :return: the actual check status or False before starting the process
         :raise ProcessExitedWithError: when the main process exits with
             an error
+        :raise ProcessFailedToStart: when any of the failure checks fails
         """
         if self.process is None:  # pragma: no cover
             # No process was started.
@@ -529,6 +981,7 @@ class Executor(SimpleExecutor):
             self._clear_process()
             raise ProcessExitedWithError(self, exit_code)
 
+        self._check_failures()
         return self.after_start_check()
 
     def after_start_check(self) -> bool:
@@ -19,9 +19,12 @@
 
 import errno
 import logging
+import os
 import re
 import subprocess
-from typing import List, Set
+import sys
+from collections import defaultdict
+from typing import Callable, Dict, Iterable, List, Optional, Set
 
 try:
     import psutil
@@ -36,20 +39,39 @@ PS_XE_PID_MATCH = re.compile(r"^.*?(\d+).+$")
 """_sre.SRE_Pattern matching PIDs in result from `$ ps xe -o pid,cmd`."""
 
 
-def processes_with_env_psutil(env_name: str, env_value: str) -> Set[int]:
+def processes_with_env_psutil(
+    env_name: str, env_value: str, pids: Optional[Iterable[int]] = None
+) -> Set[int]:
     """Find PIDs of processes having environment variable matching given one.
 
     Internally it uses `psutil` library.
 
     :param str env_name: name of environment variable to be found
     :param str env_value: environment variable value prefix
+    :param iterable pids: only check these processes instead of all of them
     :return: process identifiers (PIDs) of processes that have certain
              environment variable equal certain value
     :rtype: set
     """
-    pids = set()
+    values = processes_env_values_psutil(env_name, pids)
+    return {pid for pid, value in values.items() if env_value in value}
 
-    for proc in psutil.process_iter():
+
+def processes_env_values_psutil(
+    env_name: str, pids: Optional[Iterable[int]] = None
+) -> Dict[int, str]:
+    """Find values of environment variable of all processes having it.
+
+    Internally it uses `psutil` library.
+
+    :param str env_name: name of environment variable to be found
+    :param iterable pids: only check these processes instead of all of them
+    :return: mapping of process identifiers (PIDs) to the variable values
+    :rtype: dict
+    """
+    values = {}
+
+    for proc in psutil.process_iter() if pids is None else _psutil_processes(pids):
         try:
             pinfo = proc.as_dict(attrs=["pid", "environ"])
         except (psutil.NoSuchProcess, IOError):
@@ -57,13 +79,91 @@ def processes_with_env_psutil(env_name: str, env_value: str) -> Set[int]:
             pass
         else:
             penv = pinfo.get("environ")
-            if penv and env_value in penv.get(env_name, ""):
-                pids.add(pinfo["pid"])
+            if penv and env_name in penv:
+                values[pinfo["pid"]] = penv[env_name]
+
+    return values
+
+
+def _psutil_processes(pids: Iterable[int]) -> List["psutil.Process"]:
+    """Return psutil processes for given PIDs, skipping the ones that are gone."""
+    processes = []
+    for pid in pids:
+        try:
+            processes.append(psutil.Process(pid))
+        except psutil.NoSuchProcess:
+            pass
+    return processes
+
+
+def _proc_pids() -> List[int]:
+    """Return PIDs of all processes listed in ``/proc``."""
+    return [int(name) for name in os.listdir("/proc") if name.isdigit()]
+
+
+def processes_with_env_proc(
+    env_name: str, env_value: str, pids: Optional[Iterable[int]] = None
+) -> Set[int]:
+    """Find PIDs of processes having environment variable matching given one.
 
-    return pids
+    It reads ``/proc/<pid>/environ`` files directly, so it works only on
+    Linux. Environments are searched as raw bytes, without decoding and
+    splitting them. Unless running as root, processes of other users are
+    skipped right away, as their environment can not be read anyway.
 
+    :param str env_name: name of environment variable to be found
+    :param str env_value: environment variable value prefix
+    :param iterable pids: only check these processes instead of all of them
+    :return: process identifiers (PIDs) of processes that have certain
+             environment variable equal certain value
+    :rtype: set
+    """
+    values = processes_env_values_proc(env_name, pids)
+    return {pid for pid, value in values.items() if env_value in value}
+
+
+def processes_env_values_proc(
+    env_name: str, pids: Optional[Iterable[int]] = None
+) -> Dict[int, str]:
+    """Find values of environment variable of all processes having it.
+
+    It reads ``/proc/<pid>/environ`` files directly, so it works only on
+    Linux. Only the found value gets decoded.
 
-def processes_with_env_ps(env_name: str, env_value: str) -> Set[int]:
+    :param str env_name: name of environment variable to be found
+    :param iterable pids: only check these processes instead of all of them
+    :return: mapping of process identifiers (PIDs) to the variable values
+    :rtype: dict
+    """
+    values: Dict[int, str] = {}
+    marker = f"{env_name}=".encode()
+    uid = os.getuid()
+
+    for pid in _proc_pids() if pids is None else pids:
+        try:
+            if uid != 0 and os.stat(f"/proc/{pid}").st_uid != uid:
+                continue
+            with open(f"/proc/{pid}/environ", "rb", buffering=0) as environ_file:
+                environ = environ_file.read()
+        except OSError:
+            # process is gone or we are not allowed to read its environment
+            continue
+        start = environ.find(marker)
+        # Make sure the marker starts an entry, not just a part of one
+        while start > 0 and environ[start - 1] != 0:
+            start = environ.find(marker, start + 1)
+        if start < 0:
+            continue
+        start += len(marker)
+        end = environ.find(b"\0", start)
+        values[pid] = environ[start : end if end >= 0 else None].decode(errors="replace")
+
+    return values
+
+
+def processes_with_env_ps(
+    env_name: str, env_value: str, pids: Optional[Iterable[int]] = None
+) -> Set[int]:
     """Find PIDs of processes having environment variable matching given one.
 
     It uses `$ ps xe -o pid,cmd` command so it works only on systems
@@ -72,14 +172,32 @@ def processes_with_env_ps(env_name: str, env_value: str) -> Set[int]:
 
     :param str env_name: name of environment variable to be found
     :param str env_value: environment variable value prefix
+    :param iterable pids: only check these processes instead of all of them
     :return: process identifiers (PIDs) of processes that have certain
              environment variable equal certain value
     :rtype: set
     """
-    pids: Set[int] = set()
+    values = processes_env_values_ps(env_name, pids)
+    return {pid for pid, value in values.items() if env_value in value}
+
+
+def processes_env_values_ps(env_name: str, pids: Optional[Iterable[int]] = None) -> Dict[int, str]:
+    """Find values of environment variable of all processes having it.
+
+    It uses `$ ps xe -o pid,cmd` command so it works only on systems
+    having such command available (Linux, MacOS). If not available function
+    will just LOG error.
+
+    :param str env_name: name of environment variable to be found
+    :param iterable pids: only check these processes instead of all of them
+    :return: mapping of process identifiers (PIDs) to the variable values
+    :rtype: dict
+    """
+    values: Dict[int, str] = {}
     ps_xe: List[bytes] = []
     try:
-        cmd = "ps", "xe", "-o", "pid,cmd"
+        # ww: don't cut lines to the terminal width (or COLUMNS), that cuts the environment off
+        cmd = "ps", "xeww", "-o", "pid,cmd"
         ps_xe = subprocess.check_output(cmd).splitlines()
     except OSError as err:
         if err.errno == errno.ENOENT:
@@ -89,26 +207,130 @@ def processes_with_env_ps(env_name: str, env_value: str) -> Set[int]:
                 "be able to list the process tree and find if there are "
                 "any leftovers of the Executor."
             )
-            return pids
+            return values
     except subprocess.CalledProcessError:
         LOG.error("`$ ps xe -o pid,cmd` command exited with non-zero code.")
 
-    env = f"{env_name}={env_value}"
+    env_match = re.compile(rf"\s{re.escape(env_name)}=(\S*)")
 
     for line in ps_xe:
-        sline = str(line)
-        if env in sline:
+        sline = line.decode(errors="replace")
+        env = env_match.search(sline)
+        if env:
             match = PS_XE_PID_MATCH.match(sline)
             # This always matches: all lines other than the header (not
             # containing our environment variable) have a PID required by the
             # reggex. Still check it for mypy.
             if match:
-                pids.add(int(match.group(1)))
-    return pids
+                values[int(match.group(1))] = env.group(1)
+    if pids is not None:
+        wanted = set(pids)
+        values = {pid: value for pid, value in values.items() if pid in wanted}
+    return values
+
+
+def process_command(pid: int) -> Optional[List[str]]:
+    """Return command line of the process.
+
+    :param int pid: process identifier
+    :return: command line arguments, None if they can't be read
+    :rtype: list
+    """
+    try:
+        with open(f"/proc/{pid}/cmdline", "rb") as cmdline:
+            return [arg.decode(errors="replace") for arg in cmdline.read().split(b"\0")[:-1]]
+    except OSError:
+        pass
+    if psutil:
+        try:
+            return list(psutil.Process(pid).cmdline())
+        except psutil.Error:
+            pass
+    return None
+
+
+def process_descendants(pid: int) -> Optional[Set[int]]:
+    """Find PIDs of all descendants of the process by walking the process tree.
+
+    Uses ``/proc/<pid>/task/<tid>/children`` files if the kernel provides
+    them, so only the process subtree is read. Otherwise the parent-child
+    index is built in a single pass over ``/proc/<pid>/stat`` files, or by
+    `psutil` on systems without ``/proc``.
+
+    .. note::
+
+        Processes that got orphaned (e.g. daemonized) are not descendants
+        of the process anymore and will not be found.
+
+    :param int pid: process identifier
+    :return: process identifiers (PIDs) of the descendants, or None if the
+             process tree can not be listed on this system
+    :rtype: set
+    """
+    if os.path.isfile(f"/proc/{pid}/task/{pid}/children"):
+        return _descendants(pid, _proc_task_children)
+    if os.path.isdir("/proc/self"):
+        return _descendants(pid, _proc_children_index().get)
+    if psutil:
+        try:
+            return {child.pid for child in psutil.Process(pid).children(recursive=True)}
+        except psutil.NoSuchProcess:
+            return set()
+    return None
+
+
+def _descendants(pid: int, children: Callable[[int], Optional[Iterable[int]]]) -> Set[int]:
+    """Walk the process tree using given function listing process children."""
+    descendants: Set[int] = set()
+    parents = [pid]
+    while parents:
+        for child in children(parents.pop()) or ():
+            if child not in descendants:
+                descendants.add(child)
+                parents.append(child)
+    return descendants
+
+
+def _proc_task_children(pid: int) -> List[int]:
+    """List children of the process using ``/proc/<pid>/task/<tid>/children``."""
+    children: List[int] = []
+    try:
+        tids = os.listdir(f"/proc/{pid}/task")
+    except OSError:
+        return children
+    for tid in tids:
+        try:
+            with open(f"/proc/{pid}/task/{tid}/children", "rb") as children_file:
+                children.extend(int(child) for child in children_file.read().split())
+        except OSError:
+            # thread or process is gone
+            pass
+    return children
+
+
+def _proc_children_index() -> Dict[int, List[int]]:
+    """Build parent to children PIDs mapping in one pass over ``/proc``."""
+    index: Dict[int, List[int]] = defaultdict(list)
+    for pid in _proc_pids():
+        try:
+            with open(f"/proc/{pid}/stat", "rb") as stat_file:
+                stat = stat_file.read()
+        except OSError:
+            continue
+        # Command name is in parentheses and can contain spaces or parentheses
+        # itself. Parent PID is the second field after it.
+        ppid = int(stat[stat.rfind(b")") + 2 :].split(maxsplit=2)[1])
+        index[ppid].append(pid)
+    return index
 
 
-if psutil:
+if sys.platform.startswith("linux") and os.path.isdir("/proc/self"):
+    processes_with_env = processes_with_env_proc
+    processes_env_values = processes_env_values_proc
+elif psutil:
     processes_with_env = processes_with_env_psutil
+    processes_env_values = processes_env_values_psutil
 else:
     # In case psutil can't be imported (on pypy3) we try to use '$ ps xe'
     processes_with_env = processes_with_env_ps
+    processes_env_values = processes_env_values_ps
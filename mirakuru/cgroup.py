@@ -0,0 +1,152 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Linux cgroup v2 based containment of executor's processes."""
+
+import errno
+import logging
+import os
+import time
+from typing import Dict, Set
+
+from mirakuru.compat import SIGKILL
+
+LOG = logging.getLogger(__name__)
+
+
+class CGroup:
+    """Control group containing all processes started by an executor.
+
+    Every process forked by a member of the group stays in the group (unless
+    it's explicitly moved elsewhere), so the whole process tree - including
+    daemonized processes - can be listed and killed without scanning all
+    processes in the system.
+    """
+
+    def __init__(self, parent: str, name: str) -> None:
+        """Initialize CGroup.
+
+        :param str parent: path of a cgroup v2 directory delegated to the
+            current user, in which the group will be created
+        :param str name: name of the group
+        :raises: ValueError if the parent is not a cgroup v2 directory
+        """
+        if not os.path.isfile(os.path.join(parent, "cgroup.procs")):
+            raise ValueError(f"{parent} is not a cgroup v2 directory")
+        self.path = os.path.join(parent, name)
+        """Path of the group directory."""
+
+    def create(self) -> None:
+        """Create the group directory."""
+        os.makedirs(self.path, exist_ok=True)
+
+    def join(self) -> None:
+        """Move the current process into the group.
+
+        Meant to be called in the forked child, before it executes the command.
+        """
+        with open(os.path.join(self.path, "cgroup.procs"), "w", encoding="ascii") as procs:
+            procs.write("0")
+
+    def exists(self) -> bool:
+        """Check if the group directory exists."""
+        return os.path.isdir(self.path)
+
+    def pids(self) -> Set[int]:
+        """Return process ids (pids) of all processes in the group."""
+        try:
+            with open(os.path.join(self.path, "cgroup.procs"), "rb") as procs:
+                return {int(pid) for pid in procs.read().split()}
+        except FileNotFoundError:
+            return set()
+
+    def populated(self) -> bool:
+        """Check if there is any process left in the group."""
+        try:
+            with open(os.path.join(self.path, "cgroup.events"), "rb") as events:
+                for line in events:
+                    key, value = line.split()
+                    if key == b"populated":
+                        return value != b"0"
+        except FileNotFoundError:
+            pass
+        return False
+
+    def kill(self, sig: int) -> Set[int]:
+        """Send signal to all processes in the group.
+
+        SIGKILL is sent with ``cgroup.kill`` (Linux 5.14+) which kills the
+        whole group at once, without racing with processes being forked.
+
+        :param int sig: signal to send
+        :return: process ids (pids) of signalled processes
+        :rtype: set
+        """
+        pids = self.pids()
+        cgroup_kill = os.path.join(self.path, "cgroup.kill")
+        if sig == SIGKILL and os.path.isfile(cgroup_kill):
+            with open(cgroup_kill, "w", encoding="ascii") as kill_file:
+                kill_file.write("1")
+            return pids
+        for pid in pids:
+            try:
+                os.kill(pid, sig)
+            except OSError as err:
+                if err.errno != errno.ESRCH:
+                    raise
+        return pids
+
+    def remove(self, timeout: float = 1.0) -> None:
+        """Kill remaining processes and remove the group.
+
+        :param float timeout: number of seconds to wait for the killed
+            processes to exit
+        """
+        if not self.exists():
+            return
+        if self.populated():
+            self.kill(SIGKILL)
+            endtime = time.monotonic() + timeout
+            while self.populated() and time.monotonic() < endtime:
+                time.sleep(0.001)
+        try:
+            os.rmdir(self.path)
+        except OSError as err:
+            LOG.warning("Could not remove cgroup %s: %s", self.path, err)
+
+    def stats(self) -> Dict[str, int]:
+        """Return resource usage of the group.
+
+        Contains all ``cpu.stat`` entries (e.g. ``usage_usec``), and
+        ``memory.current`` and ``memory.peak`` if the memory controller is
+        enabled for the group.
+        """
+        stats: Dict[str, int] = {}
+        try:
+            with open(os.path.join(self.path, "cpu.stat"), "rb") as cpu_stat:
+                for line in cpu_stat:
+                    key, value = line.split()
+                    stats[key.decode()] = int(value)
+        except FileNotFoundError:
+            pass
+        for name in ("memory.current", "memory.peak"):
+            try:
+                with open(os.path.join(self.path, name), "rb") as memory_file:
+                    stats[name.replace(".", "_")] = int(memory_file.read())
+            except FileNotFoundError:
+                pass
+        return stats
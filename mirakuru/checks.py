@@ -0,0 +1,404 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Composable checks telling if the process has started.
+
+Probes (:class:`TCPCheck`, :class:`HTTPCheck`, :class:`UnixSocketCheck`,
+:class:`PidFileCheck`, :class:`OutputCheck`) can be combined with
+:class:`AllOf`, :class:`AnyOf` and :class:`Sequence`, and used by
+:class:`CheckExecutor`. Each check gets the executor and returns whether
+its condition is met. Any callable doing so can be used as a check too.
+
+Combined checks remember which of their checks have already passed, so these
+don't run again, until :meth:`Check.reset`. Checks are stateful, so a check
+shouldn't be shared by many executors.
+"""
+
+import logging
+import os
+import re
+import socket
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from http.client import HTTPConnection, HTTPException
+from typing import IO, Any, Callable, Dict, List, Optional, Set, Tuple, Union
+from urllib.parse import urlparse
+
+from mirakuru.base import Executor, SimpleExecutor
+from mirakuru.output import OutputReader
+from mirakuru.tcp import AddressInfo, connect
+
+LOG = logging.getLogger(__name__)
+
+CheckType = Callable[[SimpleExecutor], bool]
+"""Callable telling if the executor's process has started."""
+
+
+def _time_left(executor: SimpleExecutor) -> Optional[float]:
+    """Return number of seconds a single check can take.
+
+    It's the time left until the executor's timeout, or the whole timeout
+    before the process gets started.
+    """
+    remaining = executor._remaining_time()  # pylint:disable=protected-access
+    if remaining is None:
+        return executor._timeout  # pylint:disable=protected-access
+    # zero would make sockets non-blocking
+    return max(remaining, 0.001)
+
+
+class Check:
+    """Base class for checks."""
+
+    def __call__(self, executor: SimpleExecutor) -> bool:
+        """Check if the condition is met.
+
+        Should be overridden.
+
+        :param SimpleExecutor executor: executor being started
+        :rtype: bool
+        """
+        raise NotImplementedError
+
+    def reset(self) -> None:
+        """Forget results of previous checks, before next start."""
+
+
+class TCPCheck(Check):
+    """Passes when connection to the port can be established."""
+
+    def __init__(self, host: str, port: int) -> None:
+        """Initialize TCPCheck.
+
+        :param str host: host the process listens on
+        :param int port: port the process listens on
+        """
+        self.host = host
+        self.port = port
+        self._addresses: Optional[List[AddressInfo]] = None
+
+    def __call__(self, executor: SimpleExecutor) -> bool:
+        """Check if the port accepts connections."""
+        try:
+            if self._addresses is None:
+                self._addresses = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)
+            connect(self._addresses, _time_left(executor)).close()
+        except OSError:
+            return False
+        return True
+
+    def reset(self) -> None:
+        """Forget resolved addresses."""
+        self._addresses = None
+
+
+class UnixSocketCheck(Check):
+    """Passes when connection to the Unix socket can be established."""
+
+    def __init__(self, path: str) -> None:
+        """Initialize UnixSocketCheck.
+
+        :param str path: path of the socket
+        """
+        self.path = path
+
+    def __call__(self, executor: SimpleExecutor) -> bool:
+        """Check if the socket accepts connections."""
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(_time_left(executor))
+            try:
+                sock.connect(self.path)
+            except OSError:
+                return False
+        return True
+
+
+class HTTPCheck(Check):
+    """Passes when the URL responds with expected status."""
+
+    def __init__(
+        self,
+        url: str,
+        status: Union[str, int] = r"^2\d\d$",
+        method: str = "HEAD",
+        headers: Optional[Dict[str, str]] = None,
+    ) -> None:
+        """Initialize HTTPCheck.
+
+        :param str url: URL to request
+        :param str|int status: expected status code, or regular expression
+            matching it. Default: any 2XX HTTP status code.
+        :param str method: request method
+        :param dict headers: request headers
+        """
+        self.url = urlparse(url)
+        if not self.url.hostname:
+            raise ValueError("Url provided does not contain hostname")
+        self.status = str(status)
+        self.status_re = re.compile(self.status)
+        self.method = method
+        self.headers = headers or {}
+
+    def __call__(self, executor: SimpleExecutor) -> bool:
+        """Check if the URL responds with expected status."""
+        connection = HTTPConnection(
+            self.url.hostname or "", self.url.port, timeout=_time_left(executor)
+        )
+        try:
+            path = self.url.path or "/"
+            if self.url.query:
+                path = f"{path}?{self.url.query}"
+            connection.request(self.method, path, headers=self.headers)
+            status = str(connection.getresponse().status)
+        except (HTTPException, OSError) as ex:
+            LOG.debug("Encounter %s while requesting %s", ex, self.url.geturl())
+            return False
+        finally:
+            connection.close()
+        return status == self.status or bool(self.status_re.match(status))
+
+
+class PidFileCheck(Check):
+    """Passes when the file exists."""
+
+    def __init__(self, filename: str) -> None:
+        """Initialize PidFileCheck.
+
+        :param str filename: file the process creates
+        """
+        self.filename = filename
+
+    def __call__(self, executor: SimpleExecutor) -> bool:
+        """Check if the file exists."""
+        return os.path.isfile(self.filename)
+
+
+class OutputCheck(Check):
+    """Passes when the process prints a line starting with the banner.
+
+    Output is read without waiting, only what's already there gets checked.
+    The output has to be piped and shouldn't be read by anything else.
+    """
+
+    def __init__(self, banner: str, stream: str = "stdout") -> None:
+        """Initialize OutputCheck.
+
+        :param str banner: regular expression matching the line
+        :param str stream: output to read, ``stdout`` or ``stderr``
+        """
+        self.banner = re.compile(banner)
+        self.stream = stream
+        self._reader: Optional[Tuple[IO[Any], OutputReader]] = None
+        self._matched = False
+
+    def __call__(self, executor: SimpleExecutor) -> bool:
+        """Check if the banner has shown up in the output."""
+        if self._matched:
+            return True
+        output = getattr(executor.process, self.stream, None)
+        if output is None:
+            return False
+        if self._reader is None or self._reader[0] is not output:
+            self.reset()
+            self._reader = (output, OutputReader([output]))
+        reader = self._reader[1]
+        for fd, chunk in reader.read_chunks(0):
+            for line in reader.split_lines(fd, chunk):
+                if self.banner.match(reader.decode(fd, line)):
+                    self._matched = True
+        return self._matched
+
+    def reset(self) -> None:
+        """Stop reading the output and forget the match."""
+        if self._reader is not None:
+            self._reader[1].close()
+            self._reader = None
+        self._matched = False
+
+
+class _CombinedCheck(Check):
+    """Check combining other checks and remembering which of them passed."""
+
+    def __init__(self, *checks: CheckType) -> None:
+        """Initialize combined check.
+
+        :param callable checks: checks to combine
+        """
+        if not checks:
+            raise ValueError("at least one check is required")
+        self.checks = list(checks)
+        self._passed: Set[int] = set()
+        self._running: Dict[int, "Future[bool]"] = {}
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def __call__(self, executor: SimpleExecutor) -> bool:
+        """Check if the combined condition is met, remembering once it is."""
+        if len(self._passed) < len(self.checks) and self._check(executor):
+            self._passed = set(range(len(self.checks)))
+        return len(self._passed) == len(self.checks)
+
+    def _check(self, executor: SimpleExecutor) -> bool:
+        """Check if the combined condition is met.
+
+        Should be overridden.
+        """
+        raise NotImplementedError
+
+    def _pending(self) -> List[int]:
+        """Return indexes of checks that haven't passed yet."""
+        return [index for index in range(len(self.checks)) if index not in self._passed]
+
+    def _record(self, index: int, passed: bool) -> bool:
+        """Remember the check has passed."""
+        if passed:
+            self._passed.add(index)
+        return passed
+
+    def _run_until(self, executor: SimpleExecutor, indexes: List[int], result: bool) -> bool:
+        """Run checks concurrently, until any of them gives expected result.
+
+        Checks still running once the result is known are not waited for,
+        their results get collected next time, instead of running them again.
+
+        :return: whether any of the checks gave the result
+        """
+        if len(indexes) == 1 and indexes[0] not in self._running:
+            # no need for threads
+            return self._record(indexes[0], bool(self.checks[indexes[0]](executor))) == result
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(len(self.checks), thread_name_prefix="mirakuru-check")
+        for index in indexes:
+            if index not in self._running:
+                self._running[index] = self._pool.submit(self.checks[index], executor)
+        futures = {self._running[index]: index for index in indexes}
+        while futures:
+            done, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = futures.pop(future)
+                del self._running[index]
+                if self._record(index, bool(future.result())) == result:
+                    return True
+        return False
+
+    def reset(self) -> None:
+        """Forget which checks have passed and reset all of them."""
+        self._passed.clear()
+        self._running.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+        for check in self.checks:
+            if isinstance(check, Check):
+                check.reset()
+
+
+class AllOf(_CombinedCheck):
+    """Passes when all the checks have passed.
+
+    Checks that haven't passed yet run concurrently. Failing check ends
+    the check right away, without waiting for the others.
+    """
+
+    def _check(self, executor: SimpleExecutor) -> bool:
+        """Check if all checks have passed."""
+        return not self._run_until(executor, self._pending(), False)
+
+
+class AnyOf(_CombinedCheck):
+    """Passes when any of the checks passes.
+
+    All checks run concurrently. Passing check ends the check right away,
+    without waiting for the others.
+    """
+
+    def _check(self, executor: SimpleExecutor) -> bool:
+        """Check if any of the checks passes."""
+        return self._run_until(executor, self._pending(), True)
+
+
+class Sequence(_CombinedCheck):
+    """Passes when all the checks have passed, one after another.
+
+    Check runs only once all the previous ones have passed, e.g. there's
+    no point in requesting HTTP health endpoint before the port is open.
+    """
+
+    def _check(self, executor: SimpleExecutor) -> bool:
+        """Check if all checks have passed, in order."""
+        for index in self._pending():
+            if not self._record(index, bool(self.checks[index](executor))):
+                return False
+        return True
+
+
+class CheckExecutor(Executor):
+    """Executor waiting for the process to pass given check.
+
+    Check usually combines many probes, e.g. port being open, HTTP endpoint
+    responding and pid file existing.
+    """
+
+    def __init__(
+        self,
+        command: Union[str, List[str], Tuple[str, ...]],
+        check: CheckType,
+        **kwargs: Any,
+    ) -> None:
+        """Initialize CheckExecutor executor.
+
+        :param (str, list) command: command to be run by the subprocess
+        :param callable check: check telling if the process has started,
+            e.g. :class:`AllOf` of other checks
+        :param bool shell: same as the `subprocess.Popen` shell definition
+        :param int timeout: number of seconds to wait for the process to start
+            or stop. If None or False, wait indefinitely.
+        :param float sleep: how often to check for start/stop condition
+        :param int sig_stop: signal used to stop process run by the executor.
+            default is `signal.SIGTERM`
+        :param int sig_kill: signal used to kill process run by the executor.
+            default is `signal.SIGKILL` (`signal.SIGTERM` on Windows)
+        """
+        super().__init__(command, **kwargs)
+        self.check = check
+        """Check telling if the process has started."""
+
+    def _reset_check(self) -> None:
+        """Forget results of previous checks."""
+        if isinstance(self.check, Check):
+            self.check.reset()
+
+    def pre_start_check(self) -> bool:
+        """Check if the check passes before the process gets started.
+
+        .. note::
+
+            Checks depending on the process itself (like :class:`OutputCheck`)
+            never pass before start.
+        """
+        self._reset_check()
+        try:
+            return self.check(self)
+        finally:
+            self._reset_check()
+
+    def after_start_check(self) -> bool:
+        """Check if the process passes the check."""
+        return self.check(self)
+
+    def _clear_process(self) -> None:
+        """Reset the check along with the process."""
+        self._reset_check()
+        super()._clear_process()
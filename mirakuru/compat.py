@@ -16,10 +16,30 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
 """Mirakuru compatibility module."""
+import os
 import signal
+from typing import Optional
 
 # Windows does not have SIGKILL, fall back to SIGTERM.
 SIGKILL = getattr(signal, "SIGKILL", signal.SIGTERM)
 
 
-__all__ = ("SIGKILL",)
+def pidfd_open(pid: int) -> Optional[int]:
+    """Open a file descriptor referring to the process, if supported.
+
+    The descriptor becomes readable once the process exits. Available on
+    Linux 5.3+ with Python 3.9+, returns None anywhere else.
+
+    :param int pid: process identifier
+    :return: process file descriptor or None
+    """
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        return os.pidfd_open(pid)
+    except OSError:
+        # kernel without pidfd support or process already reaped
+        return None
+
+
+__all__ = ("SIGKILL", "pidfd_open")
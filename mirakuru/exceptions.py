@@ -1,15 +1,16 @@
 """Mirakuru exceptions."""
 
-from typing import TYPE_CHECKING, Union
+from typing import TYPE_CHECKING, Dict, Optional, Union
 
 if TYPE_CHECKING:  # pragma: no cover
+    from mirakuru.aio import AsyncSimpleExecutor  # pylint:disable=cyclic-import
     from mirakuru.base import SimpleExecutor  # pylint:disable=cyclic-import
 
 
 class ExecutorError(Exception):
     """Base exception for executor failures."""
 
-    def __init__(self, executor: "SimpleExecutor") -> None:
+    def __init__(self, executor: "Union[SimpleExecutor, AsyncSimpleExecutor]") -> None:
         """Exception initialization.
 
         :param mirakuru.base.SimpleExecutor executor: for which exception
@@ -22,7 +23,9 @@ class ExecutorError(Exception):
 class TimeoutExpired(ExecutorError):
     """Is raised when the timeout expires while starting an executor."""
 
-    def __init__(self, executor: "SimpleExecutor", timeout: Union[int, float]) -> None:
+    def __init__(
+        self, executor: "Union[SimpleExecutor, AsyncSimpleExecutor]", timeout: Union[int, float]
+    ) -> None:
         """Exception initialization with an extra ``timeout`` argument.
 
         :param mirakuru.base.SimpleExecutor executor: for which exception
@@ -55,6 +58,7 @@ class AlreadyRunning(ExecutorError):
         :rtype: str
         """
         port = getattr(self.executor, "port")
+        pid = getattr(self.executor, "listening_pid", None)
         return (
             f"Executor {self.executor} seems to be already running. "
             f"It looks like the previous executor process hasn't been "
@@ -65,6 +69,7 @@ class AlreadyRunning(ExecutorError):
                 else f" Also there might be some completely "
                 f"different service listening on {port} port."
             )
+            + ("" if pid is None else f" Process {pid} is listening.")
         )
 
 
@@ -76,7 +81,9 @@ class ProcessExitedWithError(ExecutorError):
     exit with 0 in case of successful daemonization.
     """
 
-    def __init__(self, executor: "SimpleExecutor", exit_code: int) -> None:
+    def __init__(
+        self, executor: "Union[SimpleExecutor, AsyncSimpleExecutor]", exit_code: int
+    ) -> None:
         """Exception initialization with an extra ``exit_code`` argument.
 
         :param mirakuru.base.SimpleExecutor executor: for which exception
@@ -104,3 +111,65 @@ class ProcessFinishedWithError(ProcessExitedWithError):
     When a process is stopped, it should shut down cleanly and return zero as
     exit code. When is returns a non-zero exit code, this exception is raised.
     """
+
+
+class ProcessFailedToStart(ExecutorError):
+    """Raised when it's clear the process invoked by the executor won't start.
+
+    Allows failing right away, instead of waiting for the timeout.
+    """
+
+    def __init__(self, executor: "Union[SimpleExecutor, AsyncSimpleExecutor]", reason: str) -> None:
+        """Exception initialization with an extra ``reason`` argument.
+
+        :param mirakuru.base.SimpleExecutor executor: for which exception
+            occurred
+        :param str reason: why the process is considered failed
+        """
+        super().__init__(executor)
+        self.reason = reason
+
+    def __str__(self) -> str:
+        """Return Exception's string representation.
+
+        :returns: string representation
+        :rtype: str
+        """
+        return f"The process invoked by the {self.executor} executor failed to start: {self.reason}"
+
+
+class ExecutorGroupError(Exception):
+    """Raised when some executors of a group fail to start or stop.
+
+    Collects failures of all the executors, so none of them gets lost.
+    """
+
+    def __init__(
+        self,
+        errors: "Dict[SimpleExecutor, Exception]",
+        cleanup_errors: "Optional[Dict[SimpleExecutor, Exception]]" = None,
+    ) -> None:
+        """Exception initialization with an extra ``errors`` argument.
+
+        :param dict errors: mapping of failed executors to their exceptions
+        :param dict cleanup_errors: mapping of executors that failed to stop,
+            while cleaning up after the failure, to their exceptions
+        """
+        super().__init__()
+        self.errors = errors
+        self.cleanup_errors = cleanup_errors or {}
+
+    def __str__(self) -> str:
+        """Return Exception's string representation.
+
+        :returns: string representation
+        :rtype: str
+        """
+        failures = "; ".join(f"{executor}: {error}" for executor, error in self.errors.items())
+        message = f"{len(self.errors)} executor(s) failed: {failures}"
+        if self.cleanup_errors:
+            failures = "; ".join(
+                f"{executor}: {error}" for executor, error in self.cleanup_errors.items()
+            )
+            message += f" (and failed to stop: {failures})"
+        return message
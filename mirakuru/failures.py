@@ -0,0 +1,116 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Checks telling early that the process is not going to start.
+
+Pass them as ``failure_checks`` to an executor. Each check gets the executor
+and returns the reason the process won't start, or None.
+"""
+
+import logging
+from typing import Optional, Set
+
+from mirakuru.base import ENV_UUID, SimpleExecutor
+from mirakuru.base_env import processes_with_env
+from mirakuru.listening import listening_tcp_inodes, socket_owners
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+LOG = logging.getLogger(__name__)
+
+
+def _executor_pids(executor: SimpleExecutor) -> Set[int]:
+    """Return PIDs of the executor's process and all its subprocesses."""
+    pids = processes_with_env(ENV_UUID, executor._uuid)  # pylint:disable=protected-access
+    if executor.process is not None:
+        pids.add(executor.process.pid)
+    return pids
+
+
+def exited_without_subprocesses(executor: SimpleExecutor) -> Optional[str]:
+    """Fail when the process exits cleanly, leaving no subprocesses behind.
+
+    Process exiting with zero is normally treated as daemonizing, but then
+    its daemon should still be running.
+    """
+    if executor.process is None or executor.process.poll() != 0:
+        return None
+    if processes_with_env(ENV_UUID, executor._uuid):  # pylint:disable=protected-access
+        return None
+    return "the process exited with 0, without leaving any subprocesses running"
+
+
+class PortTaken:
+    """Fail when the port is listened on by a process not started by the executor.
+
+    Such process would pass the executor's checks, while the executor's own
+    process failed to bind the port (and maybe hangs). Processes that can't
+    be identified (e.g. ones that switched to other user) are not proven to
+    be foreign, so just like in :func:`mirakuru.listening.executor_listener`
+    they are assumed to be the executor's.
+
+    .. note::
+
+        Listening sockets are read from ``/proc/net`` on Linux, or listed
+        with `psutil` elsewhere, the check never fails without it.
+    """
+
+    def __init__(self, port: int) -> None:
+        """Initialize PortTaken check.
+
+        :param int port: TCP port the process is going to listen on
+        """
+        self.port = port
+
+    def owners(self) -> Optional[Set[Optional[int]]]:
+        """Return PIDs of processes listening on the port.
+
+        :return: PIDs, including None for processes that can't be
+            identified, or None if listening sockets can't be listed
+        :rtype: set
+        """
+        inodes = listening_tcp_inodes(self.port)
+        if inodes is not None:
+            owners = socket_owners(inodes)
+            # sockets of processes we can't look into have unknown owners
+            return set(owners) | ({None} if inodes and not owners else set())
+        if psutil is None:
+            return None
+        try:
+            connections = psutil.net_connections(kind="tcp")
+        except psutil.AccessDenied:
+            LOG.debug("Not allowed to list listening sockets")
+            return None
+        return {
+            connection.pid
+            for connection in connections
+            if connection.status == psutil.CONN_LISTEN and connection.laddr.port == self.port
+        }
+
+    def __call__(self, executor: SimpleExecutor) -> Optional[str]:
+        """Check if the port is held by another process."""
+        owners = self.owners()
+        if not owners:
+            return None
+        others = {pid for pid in owners - _executor_pids(executor) if pid is not None}
+        if not others:
+            return None
+        pids = ", ".join(str(pid) for pid in sorted(others))
+        return f"port {self.port} is held by another process (pid: {pids})"
@@ -0,0 +1,528 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Fork server starting Python processes without paying for their imports.
+
+Fork server (zygote) is a Python process importing given modules once, and
+then forking a child for every process to start. Child runs the command's
+module, script or code right away, as the modules are already imported.
+
+Pass :class:`ForkServer` as ``fork_server`` to any executor, which command
+runs Python (``python -m module``, ``python script.py`` or ``python -c code``).
+Linux only.
+"""
+
+import ctypes
+import importlib
+import json
+import logging
+import os
+import runpy
+import selectors
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from types import TracebackType
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from mirakuru.base import ENV_UUID
+
+LOG = logging.getLogger(__name__)
+
+MARKER_SIZE = 64
+"""Space reserved for the ``mirakuru_uuid`` value in the fork server's environment."""
+
+MESSAGE_SIZE = 1024 * 1024
+"""Maximum size of a message exchanged with the fork server."""
+
+ForkServerType = TypeVar("ForkServerType", bound="ForkServer")
+
+
+def parse_command(argv: Sequence[str]) -> Tuple[str, str, List[str]]:
+    """Tell what Python command runs.
+
+    :param list argv: command, starting with the Python interpreter
+    :raises: ValueError when the command can't be run by the fork server
+    :return: kind (``module``, ``code`` or ``script``), its target and
+        ``sys.argv`` to run it with
+    :rtype: tuple
+    """
+    args = list(argv)
+    if not args or not os.path.basename(args[0]).startswith("python"):
+        raise ValueError(f"Fork server runs only Python commands, not {argv}")
+    args = args[1:]
+    if len(args) >= 2 and args[0] == "-m":
+        return "module", args[1], [args[1], *args[2:]]
+    if len(args) >= 2 and args[0] == "-c":
+        return "code", args[1], ["-c", *args[2:]]
+    if args and not args[0].startswith("-"):
+        return "script", args[0], args
+    raise ValueError(f"Fork server can't run {argv}, options are not supported")
+
+
+def _set_marker(value: str) -> None:
+    """Write marker value into the environment the process was started with.
+
+    That's the environment visible for other processes (``/proc/<pid>/environ``),
+    so the forked child can be found by its executor's marker. Fork server's
+    marker reserves the space for it.
+    """
+    encoded = value.encode()
+    if len(encoded) >= MARKER_SIZE:
+        raise ValueError(f"Marker {value} is too long")
+    prefix = f"{ENV_UUID}=".encode()
+    environ = ctypes.POINTER(ctypes.c_char_p).in_dll(ctypes.CDLL(None), "environ")
+    addresses = ctypes.cast(environ, ctypes.POINTER(ctypes.c_void_p))
+    index = 0
+    while environ[index] is not None:
+        entry = environ[index]
+        if entry is not None and entry.startswith(prefix):
+            address = addresses[index]
+            assert address is not None
+            ctypes.memmove(address + len(prefix), encoded + b"\0", len(encoded) + 1)
+            return
+        index += 1
+    LOG.debug("No room for %s marker in the environment", ENV_UUID)
+
+
+def _run(argv: Sequence[str]) -> None:
+    """Run the Python command in the current process."""
+    kind, target, sys.argv = parse_command(argv)
+    if kind == "module":
+        sys.path[0] = os.getcwd()
+        runpy.run_module(target, run_name="__main__", alter_sys=True)
+    elif kind == "code":
+        sys.path[0] = ""
+        exec(
+            compile(target, "<string>", "exec"), {"__name__": "__main__"}
+        )  # pylint:disable=exec-used
+    else:
+        sys.path[0] = os.path.dirname(os.path.abspath(target))
+        runpy.run_path(target, run_name="__main__")
+
+
+def _exit_code(error: SystemExit) -> int:
+    """Return exit code of the process exiting with given SystemExit."""
+    if error.code is None:
+        return 0
+    if isinstance(error.code, int):
+        return error.code
+    print(error.code, file=sys.stderr)
+    return 1
+
+
+def _child(request: Dict[str, Any], fds: List[int], close: Iterable[int]) -> None:
+    """Turn forked child into the requested process, never returns."""
+    code = 1
+    try:
+        signal.set_wakeup_fd(-1)
+        signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+        os.setsid()
+        for target, fd in enumerate(fds):
+            os.dup2(fd, target)
+        for fd in [*fds, *close]:
+            if fd > 2:
+                os.close(fd)
+        env = request["env"]
+        _set_marker(env.get(ENV_UUID, ""))
+        os.environ.clear()
+        os.environ.update(env)
+        if env.get("PYTHONUNBUFFERED"):
+            sys.stdout.reconfigure(write_through=True)  # type: ignore[union-attr]
+        if request["cwd"]:
+            os.chdir(request["cwd"])
+        _run(request["argv"])
+        code = 0
+    except SystemExit as error:
+        code = _exit_code(error)
+    except BaseException:  # pylint:disable=broad-except
+        traceback.print_exc()
+    finally:
+        for stream in (sys.stdout, sys.stderr):
+            try:
+                stream.flush()
+            except Exception:  # pylint:disable=broad-except
+                pass
+        os._exit(code)  # pylint:disable=protected-access
+
+
+def _mirakuru_root(python: str, env: Dict[str, str]) -> Optional[str]:
+    """Find directory the interpreter imports mirakuru from, by default.
+
+    :param str python: Python interpreter
+    :param dict env: environment the interpreter runs with
+    :returns: directory containing the mirakuru package, None if it can't be imported
+    """
+    code = "import os, mirakuru; print(os.path.dirname(os.path.dirname(mirakuru.__file__)))"
+    try:
+        output = subprocess.run(
+            [python, "-c", code],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            env=env,
+            check=True,
+        ).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return os.path.abspath(output.decode().strip())
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    """Send message over the fork server's socket."""
+    sock.send(json.dumps(message).encode())
+
+
+def serve(sock: socket.socket, preload: Iterable[str]) -> None:
+    """Run the fork server, until the other end of the socket gets closed.
+
+    :param socket.socket sock: connection receiving commands to run
+    :param iterable preload: modules to import before forking
+    """
+    try:
+        for name in preload:
+            importlib.import_module(name)
+    except BaseException as error:  # pylint:disable=broad-except
+        _send(sock, {"error": f"Can't import: {error!r}"})
+        return
+    _send(sock, {"ready": True})
+
+    wakeup_read, wakeup_write = os.pipe()
+    os.set_blocking(wakeup_read, False)
+    os.set_blocking(wakeup_write, False)
+    signal.set_wakeup_fd(wakeup_write)
+    signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+    selector = selectors.DefaultSelector()
+    selector.register(sock, selectors.EVENT_READ)
+    selector.register(wakeup_read, selectors.EVENT_READ)
+    while True:
+        for key, _ in selector.select():
+            if key.fd == wakeup_read:
+                while True:
+                    try:
+                        if not os.read(wakeup_read, 4096):
+                            break
+                    except BlockingIOError:
+                        break
+                continue
+            data, fds, _, _ = socket.recv_fds(sock, MESSAGE_SIZE, 3)
+            if not data:
+                return
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+                pid = os.fork()
+                if pid == 0:
+                    _child(json.loads(data), fds, [sock.fileno(), wakeup_read, wakeup_write])
+            except OSError as error:
+                _send(sock, {"error": str(error)})
+            else:
+                _send(sock, {"pid": pid})
+            finally:
+                for fd in fds:
+                    os.close(fd)
+        while True:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                break
+            if not pid:
+                break
+            _send(sock, {"exited": pid, "returncode": os.waitstatus_to_exitcode(status)})
+
+
+class ForkedProcess(subprocess.Popen):
+    """Process forked by the fork server, handled like any other subprocess.
+
+    The process is not a child of the current process, so it's the fork
+    server that reports its exit code.
+    """
+
+    def __init__(self, server: "ForkServer", args: Any, **kwargs: Any) -> None:
+        """Initialize ForkedProcess.
+
+        :param ForkServer server: fork server to fork the process
+        :param list args: Python command to run
+        :param kwargs: `subprocess.Popen` arguments, only standard streams,
+            environment and working directory are used
+        """
+        self._server = server
+        super().__init__(args, **kwargs)
+
+    def _execute_child(  # pylint:disable=arguments-differ,too-many-arguments
+        self,
+        args: Any,
+        executable: Any,
+        preexec_fn: Any,
+        close_fds: Any,
+        pass_fds: Any,
+        cwd: Any,
+        env: Any,
+        startupinfo: Any,
+        creationflags: Any,
+        shell: Any,
+        p2cread: int,
+        p2cwrite: int,
+        c2pread: int,
+        c2pwrite: int,
+        errread: int,
+        errwrite: int,
+        *unused: Any,
+    ) -> None:
+        """Ask the fork server for the process, instead of starting it."""
+        fds = [fd if fd != -1 else std for std, fd in enumerate((p2cread, c2pwrite, errwrite))]
+        try:
+            self.pid = self._server.spawn(
+                args, dict(os.environ if env is None else env), cwd and os.fsdecode(cwd), fds
+            )
+        finally:
+            for fd in {p2cread, c2pwrite, errwrite} - {-1}:
+                os.close(fd)
+            self._closed_child_pipe_fds = True
+
+    def _internal_poll(self, *args: Any, **kwargs: Any) -> Optional[int]:
+        """Check if the fork server has reported the process exit."""
+        if self.returncode is None:
+            self.returncode = self._server.returncode(self.pid)
+        return self.returncode
+
+    def _wait(self, timeout: Optional[float]) -> int:
+        """Wait for the fork server to report the process exit."""
+        if self.returncode is None:
+            returncode = self._server.wait(self.pid, timeout)
+            if returncode is None:
+                raise subprocess.TimeoutExpired(self.args, timeout)  # type: ignore[arg-type]
+            self.returncode = returncode
+        return self.returncode
+
+
+class ForkServer:
+    """Fork server, starting Python processes with modules already imported.
+
+    Gets started along with the first process, and can be shared by many
+    executors. Processes started by the fork server keep running when it's
+    stopped.
+    """
+
+    def __init__(self, preload: Iterable[str] = (), python: str = sys.executable) -> None:
+        """Initialize ForkServer.
+
+        :param iterable preload: modules to import before forking
+        :param str python: Python interpreter to run the fork server with
+        """
+        self.preload = list(preload)
+        """Modules imported by the fork server before forking."""
+        self.python = python
+        self.process: Optional[subprocess.Popen] = None
+        """The fork server process, once started."""
+        self._socket: Optional[socket.socket] = None
+        self._condition = threading.Condition()
+        self._spawn_lock = threading.Lock()
+        self._responses: List[Dict[str, Any]] = []
+        self._returncodes: Dict[int, int] = {}
+        self._reader: Optional[threading.Thread] = None
+
+    def __enter__(self: ForkServerType) -> ForkServerType:
+        """Enter context manager starting the fork server.
+
+        :returns: itself
+        :rtype: ForkServer
+        """
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],  # pylint:disable=redefined-outer-name
+    ) -> None:
+        """Exit context manager stopping the fork server."""
+        self.stop()
+
+    def running(self) -> bool:
+        """Check if the fork server is running.
+
+        :rtype: bool
+        """
+        return self.process is not None and self.process.poll() is None
+
+    def start(self: ForkServerType) -> ForkServerType:
+        """Start the fork server and wait until it imports all the modules.
+
+        :raises: RuntimeError when the fork server failed to start
+        :returns: itself
+        :rtype: ForkServer
+        """
+        if self.process is not None:
+            return self
+        ours, theirs = socket.socketpair(socket.AF_UNIX, socket.SOCK_SEQPACKET)
+        env = os.environ.copy()
+        env[ENV_UUID] = "-" * (MARKER_SIZE - 1)
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        if _mirakuru_root(self.python, env) != root:
+            # make sure it's the same mirakuru running the fork server, without
+            # putting the installed one's site-packages in front of everything
+            env["PYTHONPATH"] = os.pathsep.join(filter(None, (root, env.get("PYTHONPATH"))))
+        with theirs:
+            self.process = subprocess.Popen(  # pylint:disable=consider-using-with
+                [self.python, "-m", "mirakuru.forkserver", str(theirs.fileno()), *self.preload],
+                stdin=subprocess.DEVNULL,
+                pass_fds=[theirs.fileno()],
+                env=env,
+                start_new_session=True,
+            )
+        self._socket = ours
+        self._reader = threading.Thread(
+            target=self._read_messages, name="mirakuru-forkserver", daemon=True
+        )
+        self._reader.start()
+        response = self._response(None)
+        if "ready" not in response:
+            self.stop()
+            raise RuntimeError(f"Fork server failed to start: {response.get('error')}")
+        return self
+
+    def stop(self) -> None:
+        """Stop the fork server, processes it has started keep running."""
+        if self._socket is not None:
+            self._socket.shutdown(socket.SHUT_RDWR)
+        if self._reader is not None:
+            self._reader.join()
+            self._reader = None
+        if self._socket is not None:
+            self._socket.close()
+            self._socket = None
+        if self.process is not None:
+            self.process.wait()
+            self.process = None
+        self._responses.clear()
+
+    def popen(self, args: Sequence[str], **kwargs: Any) -> ForkedProcess:
+        """Start the process, the same way `subprocess.Popen` does.
+
+        :param list args: Python command to run
+        :param kwargs: `subprocess.Popen` arguments, only standard streams,
+            environment and working directory are used
+        :raises: ValueError when the command isn't a Python command
+        :rtype: ForkedProcess
+        """
+        parse_command(args)
+        self.start()
+        return ForkedProcess(self, args, **kwargs)
+
+    def spawn(
+        self, argv: Sequence[str], env: Dict[str, str], cwd: Optional[str], fds: List[int]
+    ) -> int:
+        """Fork a process running the Python command.
+
+        :param list argv: Python command to run
+        :param dict env: environment of the process
+        :param str cwd: working directory of the process
+        :param list fds: standard input, output and error of the process
+        :raises: OSError when the process could not be forked
+        :return: PID of the process
+        :rtype: int
+        """
+        message = json.dumps({"argv": list(argv), "env": env, "cwd": cwd}).encode()
+        with self._spawn_lock:
+            if self._socket is None:
+                raise OSError("Fork server is not running")
+            socket.send_fds(self._socket, [message], fds)
+            response = self._response(None)
+        if "pid" not in response:
+            raise OSError(f"Fork server could not start {argv}: {response.get('error')}")
+        return int(response["pid"])
+
+    def returncode(self, pid: int) -> Optional[int]:
+        """Return exit code of the process, None while it's running.
+
+        :param int pid: PID of the process started by the fork server
+        :rtype: int
+        """
+        with self._condition:
+            if pid in self._returncodes:
+                return self._returncodes[pid]
+            if self._reader is not None:
+                return None
+        # nobody reports exit codes anymore, exit code is lost
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return 0
+        return None
+
+    def wait(self, pid: int, timeout: Optional[float] = None) -> Optional[int]:
+        """Wait for the process to exit.
+
+        :param int pid: PID of the process started by the fork server
+        :param float timeout: maximum number of seconds to wait
+        :return: exit code, None if the process is still running
+        :rtype: int
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            self._condition.wait_for(
+                lambda: pid in self._returncodes or self._reader is None, timeout
+            )
+        returncode = self.returncode(pid)
+        while returncode is None and (deadline is None or time.monotonic() < deadline):
+            time.sleep(0.01)
+            returncode = self.returncode(pid)
+        return returncode
+
+    def _response(self, timeout: Optional[float]) -> Dict[str, Any]:
+        """Wait for the response to the last request."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._responses or self._reader is None, timeout)
+            if not self._responses:
+                return {"error": "fork server has exited"}
+            return self._responses.pop(0)
+
+    def _read_messages(self) -> None:
+        """Read messages from the fork server, until it exits."""
+        assert self._socket is not None
+        while True:
+            try:
+                data = self._socket.recv(MESSAGE_SIZE)
+            except OSError:
+                data = b""
+            with self._condition:
+                if not data:
+                    self._reader = None
+                    self._condition.notify_all()
+                    return
+                message = json.loads(data)
+                if "exited" in message:
+                    self._returncodes[message["exited"]] = message["returncode"]
+                else:
+                    self._responses.append(message)
+                self._condition.notify_all()
+
+
+def main() -> None:
+    """Run the fork server, with socket descriptor and modules to import as arguments."""
+    fd, *preload = sys.argv[1:]
+    with socket.socket(fileno=int(fd)) as sock:
+        serve(sock, preload)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Group of executors started and stopped concurrently."""
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from types import TracebackType
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple, Type, TypeVar
+
+from mirakuru.base import SimpleExecutor, SimpleExecutorType
+from mirakuru.exceptions import ExecutorGroupError
+
+LOG = logging.getLogger(__name__)
+
+ExecutorGroupType = TypeVar("ExecutorGroupType", bound="ExecutorGroup")
+
+CANCEL_INTERVAL = 0.1
+"""How often executors still starting get cancelled after a failed start."""
+
+
+def _cancel_start(executor: SimpleExecutor) -> None:
+    """Make executor waiting for its process to start fail right away.
+
+    Its timeout gets expired, and its process killed to wake up the wait.
+    Executor's state is left for the thread starting it to clean up.
+    """
+    # pylint:disable=protected-access
+    executor._endtime = 0
+    process = executor.process
+    if process is not None and process.poll() is None:
+        try:
+            executor._signal_process(executor._kill_signal)
+        except OSError:
+            pass
+
+
+class ExecutorGroup:
+    """Starts and stops many executors concurrently.
+
+    Every executor waits for its process in its own thread, so the whole
+    group starts within the time the slowest executor needs, instead of the
+    sum of all of them. Executors can depend on other executors of the group
+    (see :meth:`add`), then they start right after their dependencies.
+    """
+
+    def __init__(self, *executors: SimpleExecutor, max_workers: Optional[int] = None) -> None:
+        """Initialize ExecutorGroup.
+
+        :param SimpleExecutor executors: executors belonging to the group
+        :param int max_workers: maximum number of executors being started
+            or stopped at the same time, all of them by default
+        """
+        self.executors: List[SimpleExecutor] = []
+        """Executors belonging to the group, in the order they were added."""
+        self._dependencies: Dict[SimpleExecutor, List[SimpleExecutor]] = {}
+        self._max_workers = max_workers
+        for executor in executors:
+            self.add(executor)
+
+    def __enter__(self: ExecutorGroupType) -> ExecutorGroupType:
+        """Enter context manager starting all executors.
+
+        :returns: itself
+        :rtype: ExecutorGroup
+        """
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager stopping all executors."""
+        self.stop()
+
+    def running(self) -> bool:
+        """Check if all executors of the group are running.
+
+        :rtype: bool
+        """
+        return all(executor.running() for executor in self.executors)
+
+    def add(
+        self, executor: SimpleExecutorType, depends_on: Iterable[SimpleExecutor] = ()
+    ) -> SimpleExecutorType:
+        """Add executor to the group.
+
+        Executor gets started as soon as all executors it depends on have
+        started (passed their after start checks), and stopped before any of
+        them. Dependencies have to be added to the group first, so there
+        can't be any dependency cycles.
+
+        :param SimpleExecutor executor: executor to add
+        :param list depends_on: executors that have to be running first
+        :raises: ValueError when the executor already belongs to the group,
+            or any dependency doesn't
+        :returns: added executor
+        :rtype: SimpleExecutor
+        """
+        if executor in self._dependencies:
+            raise ValueError(f"{executor} already belongs to the group")
+        dependencies = list(depends_on)
+        for dependency in dependencies:
+            if dependency not in self._dependencies:
+                raise ValueError(f"{dependency} has to be added to the group first")
+        self.executors.append(executor)
+        self._dependencies[executor] = dependencies
+        return executor
+
+    def _run(
+        self,
+        executors: List[SimpleExecutor],
+        action: Callable[[SimpleExecutor], object],
+        waits_for: Callable[[SimpleExecutor], Iterable[SimpleExecutor]],
+        stop_on_error: bool = False,
+    ) -> Tuple[List[SimpleExecutor], Dict[SimpleExecutor, Exception]]:
+        """Run action for each executor concurrently, respecting their order.
+
+        Action for an executor is submitted as soon as actions of all
+        executors it waits for have finished, in the order of given executors.
+
+        :param list executors: executors to run action for
+        :param callable action: action to run
+        :param callable waits_for: returns executors which action has to
+            finish first, executors outside of ``executors`` are ignored
+        :param bool stop_on_error: whether to stop submitting actions once
+            any of them fails, and cancel the ones in progress (their
+            failures are not reported), otherwise failed actions count
+            as finished
+        :return: executors which action succeeded, in order of finishing,
+            and mapping of failed executors to their exceptions
+        :rtype: tuple
+        """
+        succeeded: List[SimpleExecutor] = []
+        errors: Dict[SimpleExecutor, Exception] = {}
+        if not executors:
+            return succeeded, errors
+        finished: Set[SimpleExecutor] = set()
+        cancelled: Set[SimpleExecutor] = set()
+        waiting = {
+            executor: {other for other in waits_for(executor) if other in executors}
+            for executor in executors
+        }
+        pending = list(executors)
+        running: Dict["Future[object]", SimpleExecutor] = {}
+        with ThreadPoolExecutor(max_workers=self._max_workers or len(executors)) as pool:
+            while True:
+                if not (errors and stop_on_error):
+                    for executor in [ex for ex in pending if waiting[ex] <= finished]:
+                        pending.remove(executor)
+                        running[pool.submit(action, executor)] = executor
+                if not running:
+                    break
+                timeout = None
+                if errors and stop_on_error:
+                    # executor could have not started its process yet, so
+                    # cancelling gets repeated until the action finishes
+                    for executor in running.values():
+                        _cancel_start(executor)
+                        cancelled.add(executor)
+                    timeout = CANCEL_INTERVAL
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    executor = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        succeeded.append(executor)
+                    elif executor in cancelled:
+                        LOG.debug("Cancelled %s: %s", executor, error)
+                    elif isinstance(error, Exception):
+                        errors[executor] = error
+                    else:
+                        raise error
+                    finished.add(executor)
+        return succeeded, errors
+
+    def _dependents(self, executor: SimpleExecutor) -> List[SimpleExecutor]:
+        """Return executors depending on given one."""
+        return [other for other, deps in self._dependencies.items() if executor in deps]
+
+    def start(self: ExecutorGroupType) -> ExecutorGroupType:
+        """Start all executors concurrently.
+
+        Every executor starts as soon as all its dependencies have started.
+        If any executor fails to start, no more executors get started, the
+        ones still starting get cancelled, and all the others that have
+        started get stopped.
+
+        :raises: mirakuru.exceptions.ExecutorGroupError with failures of
+            all executors that failed to start, and of those that failed
+            to stop afterwards
+        :returns: itself
+        :rtype: ExecutorGroup
+        """
+        started, errors = self._run(
+            self.executors,
+            lambda executor: executor.start(),
+            self._dependencies.__getitem__,
+            stop_on_error=True,
+        )
+        if errors:
+            LOG.debug("Stopping %d started executors after failed start", len(started))
+            _, stop_errors = self._run(
+                started[::-1], lambda executor: executor.stop(), self._dependents
+            )
+            raise ExecutorGroupError(errors, stop_errors)
+        return self
+
+    def stop(self: ExecutorGroupType) -> ExecutorGroupType:
+        """Stop all executors concurrently, in reverse order.
+
+        Every executor gets stopped only after all executors depending on it
+        have been stopped. All executors get stopped, even if some of them fail.
+
+        :raises: mirakuru.exceptions.ExecutorGroupError with failures of
+            all executors that failed to stop
+        :returns: itself
+        :rtype: ExecutorGroup
+        """
+        _, errors = self._run(
+            self.executors[::-1], lambda executor: executor.stop(), self._dependents
+        )
+        if errors:
+            raise ExecutorGroupError(errors)
+        return self
+
+    def kill(self: ExecutorGroupType) -> ExecutorGroupType:
+        """Kill all executors concurrently, in reverse order.
+
+        Dependencies are respected the same way as by :meth:`stop`.
+
+        :returns: itself
+        :rtype: ExecutorGroup
+        """
+        _, errors = self._run(
+            self.executors[::-1], lambda executor: executor.kill(), self._dependents
+        )
+        if errors:
+            raise ExecutorGroupError(errors)
+        return self
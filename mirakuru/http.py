@@ -19,15 +19,60 @@
 
 import re
 import socket
-from http.client import HTTPConnection, HTTPException
+from http.client import HTTPException, HTTPResponse
 from logging import getLogger
 from typing import Any, Dict, List, Optional, Tuple, Union
-from urllib.parse import urlencode, urlparse
+from urllib.parse import ParseResult, urlencode, urlparse
 
 from mirakuru.tcp import TCPExecutor
 
 LOG = getLogger(__name__)
 
+DEFAULT_PORT = 80
+"""Default TCP port for the HTTP protocol."""
+
+
+def build_request(  # pylint:disable=too-many-arguments
+    method: str,
+    url: ParseResult,
+    port: int,
+    payload: Optional[Dict[str, str]] = None,
+    headers: Optional[Dict[str, str]] = None,
+    close: bool = False,
+    default_port: int = DEFAULT_PORT,
+) -> bytes:
+    """Encode the check request, the same way HTTPConnection would.
+
+    :param str method: request method
+    :param ParseResult url: requested URL
+    :param int port: port the request is sent to
+    :param dict payload: form data sent in the body
+    :param dict headers: headers overriding the default ones
+    :param bool close: ask the server to close the connection afterwards
+    :param int default_port: port which isn't written in the Host header
+    :rtype: bytes
+    """
+    body = urlencode(payload).encode("iso-8859-1") if payload else b""
+    host = url.hostname or ""
+    if ":" in host:
+        host = f"[{host}]"
+    if port != default_port:
+        host = f"{host}:{port}"
+    default = {"Host": host, "Accept-Encoding": "identity"}
+    if close:
+        default["Connection"] = "close"
+    if body:
+        default["Content-Length"] = str(len(body))
+    custom = headers or {}
+    overridden = {name.lower() for name in custom}
+    request_headers = {
+        name: value for name, value in default.items() if name.lower() not in overridden
+    }
+    request_headers.update(custom)
+    lines = [f"{method} {url.path or '/'} HTTP/1.1"]
+    lines.extend(f"{name}: {value}" for name, value in request_headers.items())
+    return ("\r\n".join(lines) + "\r\n\r\n").encode("iso-8859-1") + body
+
 
 class HTTPExecutor(TCPExecutor):
     """Http enabled process executor."""
@@ -89,29 +134,87 @@ class HTTPExecutor(TCPExecutor):
         self.payload = payload
         self.headers = headers
 
+        self._connection: Optional[socket.socket] = None
         super().__init__(command, host=self.url.hostname, port=port, **kwargs)
-
-    def after_start_check(self) -> bool:
-        """Check if defined URL returns expected status to a check request."""
-        conn = HTTPConnection(self.host, self.port)
+        self._request = self._build_request()
+
+    def _build_request(self) -> bytes:
+        """Encode the check request, the same way HTTPConnection would."""
+        return build_request(
+            self.method,
+            self.url,
+            self.port,
+            self.payload,
+            self.headers,
+            default_port=self.DEFAULT_PORT,
+        )
+
+    def _close_connection(self) -> None:
+        """Close connection used for checks."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    def _request_status(self) -> Optional[str]:
+        """Send the check request and return the response status.
+
+        Connection is kept open for the next check, unless the server
+        closes it. Nothing takes longer than the time left until the timeout.
+
+        :return: response status, None if the request failed
+        """
+        timeout = self._remaining_time()
+        if timeout is not None:
+            # zero would make the socket non-blocking
+            timeout = max(timeout, 0.001)
+        reused = self._connection is not None
         try:
-            body = urlencode(self.payload) if self.payload else None
-            headers = self.headers if self.headers else {}
-            conn.request(
-                self.method,
-                self.url.path,
-                body,
-                headers,
-            )
+            if self._connection is None:
+                self._connection = self._connect()
+            self._connection.settimeout(timeout)
+            self._connection.sendall(self._request)
+            response = HTTPResponse(self._connection, method=self.method)
             try:
-                status = str(conn.getresponse().status)
+                response.begin()
+                response.read()
             finally:
-                conn.close()
+                response.close()
+            if response.will_close:
+                self._close_connection()
+            return str(response.status)
+        except (HTTPException, OSError) as ex:
+            self._close_connection()
+            if reused:
+                # server might have closed the idle connection in the meantime
+                return self._request_status()
+            LOG.debug("Encounter %s while trying to check if service has started.", ex)
+            return None
+
+    def _set_port(self, port: int) -> None:
+        """Request the URL on given port."""
+        super()._set_port(port)
+        self._close_connection()
+        userinfo, _, _ = self.url.netloc.rpartition("@")
+        host = self.url.hostname or self.host
+        if ":" in host:
+            host = f"[{host}]"
+        netloc = f"{userinfo}@{host}:{port}" if userinfo else f"{host}:{port}"
+        self.url = self.url._replace(netloc=netloc)
+        self._request = self._build_request()
 
-            if status == self.status or self.status_re.match(status):
-                return True
+    def after_start_check(self) -> bool:
+        """Check if defined URL returns expected status to a check request."""
+        if not self._find_port():
             return False
-
-        except (HTTPException, socket.timeout, socket.error) as ex:
-            LOG.debug("Encounter %s while trying to check if service has started.", ex)
+        status = self._request_status()
+        if status is None:
             return False
+        if status == self.status or self.status_re.match(status):
+            self._close_connection()
+            return True
+        return False
+
+    def _clear_process(self) -> None:
+        """Close connection used for checks along with the process."""
+        self._close_connection()
+        super()._clear_process()
@@ -0,0 +1,110 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Minimal inotify binding, used to wait for files without polling.
+
+Linux only, calls libc through `ctypes`. Elsewhere :func:`watch_directory`
+returns None, so callers can fall back to polling.
+"""
+
+import ctypes
+import ctypes.util
+import logging
+import os
+from typing import Optional
+
+LOG = logging.getLogger(__name__)
+
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+
+FILE_CHANGES = IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE
+"""Events of files being created or written in the watched directory."""
+
+
+def _load_libc() -> Optional[ctypes.CDLL]:
+    """Load libc, if it provides inotify."""
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        libc.inotify_init1  # pylint:disable=pointless-statement
+    except (OSError, AttributeError, TypeError):
+        return None
+    return libc
+
+
+LIBC = _load_libc()
+"""libc providing inotify functions, None if not available."""
+
+
+class DirectoryWatch:
+    """Inotify instance watching a single directory.
+
+    Its file descriptor becomes readable whenever a file in the directory
+    gets created or written, until pending events are drained.
+    """
+
+    def __init__(self, fd: int) -> None:
+        """Initialize DirectoryWatch.
+
+        :param int fd: inotify file descriptor, already watching the directory
+        """
+        self.fd = fd
+
+    def fileno(self) -> int:
+        """Return inotify file descriptor."""
+        return self.fd
+
+    def drain(self) -> None:
+        """Read all pending events, so the descriptor is no longer readable."""
+        while True:
+            try:
+                if not os.read(self.fd, 65536):
+                    return
+            except BlockingIOError:
+                return
+
+    def close(self) -> None:
+        """Stop watching the directory."""
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
+
+
+def watch_directory(path: str, mask: int = FILE_CHANGES) -> Optional[DirectoryWatch]:
+    """Start watching the directory for changes.
+
+    :param str path: directory to watch
+    :param int mask: inotify events to watch for
+    :return: the watch, None if inotify is not available or the directory
+        can't be watched (e.g. it doesn't exist yet)
+    :rtype: DirectoryWatch
+    """
+    if LIBC is None:
+        return None
+    fd = LIBC.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+    if fd < 0:
+        LOG.debug("inotify_init1 failed: %s", os.strerror(ctypes.get_errno()))
+        return None
+    if LIBC.inotify_add_watch(fd, os.fsencode(path), mask) < 0:
+        LOG.debug("Can't watch %s: %s", path, os.strerror(ctypes.get_errno()))
+        os.close(fd)
+        return None
+    return DirectoryWatch(fd)
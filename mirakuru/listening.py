@@ -0,0 +1,240 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Finding listening sockets without connecting to them.
+
+Sockets are looked up in ``/proc/net``, so it works only on Linux. Functions
+return None wherever this information is not available, to let callers fall
+back to connecting.
+"""
+
+import ipaddress
+import logging
+import os
+import sys
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from mirakuru.base import ENV_UUID, SimpleExecutor
+from mirakuru.base_env import process_descendants, processes_with_env
+
+LOG = logging.getLogger(__name__)
+
+TCP_TABLES = ("/proc/net/tcp", "/proc/net/tcp6")
+"""Files listing TCP sockets of the current network namespace."""
+
+UNIX_TABLE = "/proc/net/unix"
+"""File listing Unix sockets of the current network namespace."""
+
+TCP_LISTEN = "0A"
+"""State of listening TCP socket, as written in ``/proc/net/tcp``."""
+
+SO_ACCEPTCON = 0x10000
+"""Flag of listening Unix socket, as written in ``/proc/net/unix``."""
+
+
+def _read_table(path: str) -> Optional[List[List[str]]]:
+    """Return rows of ``/proc/net`` table split into columns, without header.
+
+    :param str path: path of the table
+    :return: rows, None if the table can't be read
+    """
+    try:
+        with open(path, encoding="utf-8", errors="replace") as table:
+            lines = table.read().splitlines()[1:]
+    except OSError:
+        return None
+    return [line.split() for line in lines]
+
+
+IPAddress = Union[ipaddress.IPv4Address, ipaddress.IPv6Address]
+
+
+def _ip_address(address: Union[str, bytes]) -> IPAddress:
+    """Parse IP address, IPv4-mapped IPv6 address as IPv4 one."""
+    parsed = ipaddress.ip_address(address)
+    if isinstance(parsed, ipaddress.IPv6Address) and parsed.ipv4_mapped:
+        return parsed.ipv4_mapped
+    return parsed
+
+
+def _parse_address(address: str) -> IPAddress:
+    """Parse address written in ``/proc/net/tcp``, as 32-bit words in host byte order."""
+    words = [bytes.fromhex(address[i : i + 8]) for i in range(0, len(address), 8)]
+    if sys.byteorder == "little":
+        words = [word[::-1] for word in words]
+    return _ip_address(b"".join(words))
+
+
+def _listening_tcp_sockets() -> Optional[Dict[int, Tuple[IPAddress, int]]]:
+    """Find listening TCP sockets, on any address.
+
+    :return: addresses and ports listened on by socket inodes, None if they
+        can't be listed
+    """
+    found = False
+    sockets = {}
+    for path in TCP_TABLES:
+        rows = _read_table(path)
+        if rows is None:
+            continue
+        found = True
+        for row in rows:
+            # sl local_address rem_address st tx:rx tr:when retrnsmt uid timeout inode
+            if row[3] == TCP_LISTEN:
+                address, port = row[1].rsplit(":", 1)
+                sockets[int(row[9])] = (_parse_address(address), int(port, 16))
+    return sockets if found else None
+
+
+def listening_tcp_inodes(port: int, hosts: Optional[Iterable[str]] = None) -> Optional[Set[int]]:
+    """Find TCP sockets listening on given port.
+
+    :param int port: port number
+    :param iterable hosts: IP addresses the port has to be listened on,
+        sockets listening on all addresses always count. Any address
+        by default.
+    :return: inodes of listening sockets, None if they can't be listed
+    :rtype: set
+    """
+    sockets = _listening_tcp_sockets()
+    if sockets is None:
+        return None
+    addresses = None
+    if hosts is not None:
+        addresses = {_ip_address(host.split("%", 1)[0]) for host in hosts}
+    return {
+        inode
+        for inode, (address, listened) in sockets.items()
+        if listened == port
+        and (addresses is None or address.is_unspecified or address in addresses)
+    }
+
+
+def listening_tcp_ports(pids: Iterable[int]) -> Optional[Set[int]]:
+    """Find ports listened on by given processes.
+
+    :param iterable pids: PIDs of processes
+    :return: port numbers, None if listening sockets can't be listed
+    :rtype: set
+    """
+    sockets = _listening_tcp_sockets()
+    if sockets is None:
+        return None
+    ports = set()
+    for pid in pids:
+        try:
+            fds = os.listdir(f"/proc/{pid}/fd")
+        except OSError:
+            continue
+        for fd in fds:
+            try:
+                link = os.readlink(f"/proc/{pid}/fd/{fd}")
+            except OSError:
+                continue
+            if link.startswith("socket:[") and int(link[8:-1]) in sockets:
+                ports.add(sockets[int(link[8:-1])][1])
+    return ports
+
+
+def listening_unix_inodes(path: str) -> Optional[Set[int]]:
+    """Find Unix sockets listening on given path.
+
+    :param str path: socket path
+    :return: inodes of listening sockets, None if they can't be listed
+    :rtype: set
+    """
+    table = _read_table(UNIX_TABLE)
+    if table is None:
+        return None
+    paths = {path, os.path.abspath(path)}
+    return {
+        # Num RefCount Protocol Flags Type St Inode Path
+        int(row[6])
+        for row in table
+        if len(row) > 7 and int(row[3], 16) & SO_ACCEPTCON and " ".join(row[7:]) in paths
+    }
+
+
+def socket_owners(inodes: Iterable[int], pids: Optional[Iterable[int]] = None) -> Set[int]:
+    """Find processes having any of given sockets open.
+
+    Unless running as root, processes of other users are skipped right
+    away, as their file descriptors can not be read anyway.
+
+    :param iterable inodes: inodes of sockets
+    :param iterable pids: PIDs of processes to look into, all processes
+        by default
+    :return: PIDs of processes found
+    :rtype: set
+    """
+    links = {f"socket:[{inode}]" for inode in inodes}
+    owners = set()
+    uid = os.getuid()
+    names = os.listdir("/proc") if pids is None else [str(pid) for pid in pids]
+    for name in names:
+        if not name.isdigit():
+            continue
+        try:
+            if uid != 0 and os.stat(f"/proc/{name}").st_uid != uid:
+                continue
+            fds = os.listdir(f"/proc/{name}/fd")
+        except OSError:
+            # process is gone or we are not allowed to read its descriptors
+            continue
+        for fd in fds:
+            try:
+                if os.readlink(f"/proc/{name}/fd/{fd}") in links:
+                    owners.add(int(name))
+                    break
+            except OSError:
+                continue
+    return owners
+
+
+def executor_listener(executor: SimpleExecutor, inodes: Set[int]) -> Tuple[bool, Optional[int]]:
+    """Check if any of listening sockets belongs to the executor's processes.
+
+    Sockets which owners can't be identified (e.g. processes that switched
+    to other user) are assumed to belong to the executor.
+
+    :param SimpleExecutor executor: executor which processes to look for
+    :param set inodes: inodes of listening sockets
+    :return: whether the executor listens and PID of the listening process,
+        None when it can't be identified
+    :rtype: tuple
+    """
+    if not inodes:
+        return False, None
+    # the executor's process tree gets looked into first, as it's where
+    # the listening process usually is
+    candidates: Set[int] = set()
+    if executor.process is not None:
+        candidates = (process_descendants(executor.process.pid) or set()) | {executor.process.pid}
+    owners = socket_owners(inodes, candidates)
+    if not owners:
+        # daemonized processes are not descendants anymore
+        owners = socket_owners(inodes)
+    if not owners:
+        LOG.debug("Can't identify processes listening on sockets %s", inodes)
+        return True, None
+    ours = processes_with_env(ENV_UUID, executor._uuid, owners)  # pylint:disable=protected-access
+    if executor.process is not None and executor.process.pid in owners:
+        ours.add(executor.process.pid)
+    if not ours:
+        LOG.debug("Sockets %s are listened on by other processes: %s", inodes, owners)
+        return False, None
+    return True, min(ours)
@@ -16,18 +16,224 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
 """Executor that awaits for appearance of a predefined banner in output."""
-import platform
+import io
+import logging
+import os
 import re
-import select
-from typing import IO, Any, List, Optional, Tuple, TypeVar, Union
+import selectors
+import threading
+from collections import deque
+from typing import (
+    IO,
+    Any,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
 
 from mirakuru.base import SimpleExecutor
+from mirakuru.exceptions import ProcessFailedToStart
 
-IS_DARWIN = platform.system() == "Darwin"
-
+LOG = logging.getLogger(__name__)
 
 OutputExecutorType = TypeVar("OutputExecutorType", bound="OutputExecutor")
 
+BannerType = Union[str, bytes, "re.Pattern[str]", "re.Pattern[bytes]"]
+
+BANNER_GROUP = "mirakuru_banner_{}"
+"""Name of the group matching given banner in the combined banners regex."""
+FAILURE_GROUP = "mirakuru_failure"
+"""Name of the group matching failure banner in the combined banners regex."""
+
+_INLINE_FLAGS = ((re.IGNORECASE, "i"), (re.MULTILINE, "m"), (re.DOTALL, "s"), (re.VERBOSE, "x"))
+
+
+def combine_banners(banners: Dict[str, "re.Pattern[Any]"]) -> "re.Pattern[Any]":
+    """Combine many banners into a single regular expression.
+
+    Each banner becomes an alternative in a named group, so a single match
+    tells which of the banners matched first. Flags of the compiled banners are
+    kept as scoped inline flags.
+
+    :param dict banners: mapping of group names to compiled banners
+    :raises: TypeError when mixing text and bytes banners
+    :rtype: re.Pattern
+    """
+    if len({type(banner.pattern) for banner in banners.values()}) > 1:
+        raise TypeError("Can not mix text and bytes banners")
+    alternatives = []
+    for name, banner in banners.items():
+        flags = "".join(letter for flag, letter in _INLINE_FLAGS if banner.flags & flag)
+        source = banner.pattern
+        if isinstance(source, bytes):
+            source = source.decode("latin-1")
+        alternatives.append(
+            f"(?P<{name}>(?{flags}:{source}))" if flags else f"(?P<{name}>{source})"
+        )
+    combined = "|".join(alternatives)
+    if isinstance(next(iter(banners.values())).pattern, bytes):
+        return re.compile(combined.encode("latin-1"))
+    return re.compile(combined)
+
+
+class OutputReader:
+    """Reads lines from many process outputs at once.
+
+    Uses a single selector over all the outputs, and reads whatever is
+    available from the file descriptors directly, bypassing buffers of the
+    output file objects. Waiting for data can be interrupted from other
+    thread with :meth:`wake_up`.
+    """
+
+    CHUNK_SIZE = 65536
+    """Maximum number of bytes read from an output at once."""
+
+    def __init__(self, outputs: List[IO[Any]]) -> None:
+        """Initialize OutputReader.
+
+        :param list outputs: process outputs, nothing should have been read
+            from them with their own methods
+        """
+        self._selector = selectors.DefaultSelector()
+        self._wake_up_lock = threading.Lock()
+        self._wake_up_fds: Optional[Tuple[int, int]] = os.pipe()
+        self._selector.register(self._wake_up_fds[0], selectors.EVENT_READ)
+        self._outputs: Dict[int, IO[Any]] = {}
+        self._partial: Dict[int, bytes] = {}
+        self._encodings: Dict[int, Tuple[str, str]] = {}
+        for output in outputs:
+            self._selector.register(output.fileno(), selectors.EVENT_READ)
+            self._outputs[output.fileno()] = output
+            self._encodings[output.fileno()] = (
+                getattr(output, "encoding", None) or "utf-8",
+                getattr(output, "errors", None) or "strict",
+            )
+
+    @property
+    def fds(self) -> List[int]:
+        """File descriptors of outputs that haven't been closed yet."""
+        return list(self._outputs)
+
+    def read_chunks(self, timeout: Optional[float]) -> List[Tuple[int, bytes]]:
+        """Wait for data in any of the outputs and read all that's available.
+
+        :param float timeout: maximum number of seconds to wait for data,
+            None to wait indefinitely
+        :return: chunks of data read, with file descriptors they come from,
+            in order they were read. Empty chunk means the output got closed.
+            No chunks if woken up before any data came.
+        :rtype: list
+        """
+        chunks: List[Tuple[int, bytes]] = []
+        if not self._outputs:
+            return chunks
+        events = self._selector.select(timeout)
+        while events:
+            for key, _ in events:
+                if key.fd not in self._outputs:
+                    # woken up
+                    os.read(key.fd, self.CHUNK_SIZE)
+                    continue
+                try:
+                    chunk = os.read(key.fd, self.CHUNK_SIZE)
+                except OSError:
+                    chunk = b""
+                chunks.append((key.fd, chunk))
+                if not chunk:
+                    self._selector.unregister(key.fd)
+                    del self._outputs[key.fd]
+            if not self._outputs:
+                break
+            # drain everything that is already there
+            events = self._selector.select(0)
+        return chunks
+
+    def split_lines(self, fd: int, chunk: bytes) -> List[bytes]:
+        """Split chunk read from the output into complete lines.
+
+        Incomplete last line is kept until the rest of it is read, or
+        the output gets closed (chunk is empty).
+        """
+        data = self._partial.pop(fd, b"") + chunk
+        if not chunk:
+            return [data] if data else []
+        end = data.rfind(b"\n") + 1
+        if end < len(data):
+            self._partial[fd] = data[end:]
+        return [line + b"\n" for line in data[:end].split(b"\n")[:-1]]
+
+    def take_pending(self, fd: int) -> bytes:
+        """Return incomplete line read from the output and forget it."""
+        return self._partial.pop(fd, b"")
+
+    def decode(self, fd: int, line: bytes) -> str:
+        """Decode line read from the output, just like the output would."""
+        encoding, errors = self._encodings[fd]
+        return line.decode(encoding, errors=errors).replace("\r\n", "\n")
+
+    def wake_up(self) -> None:
+        """Make waiting for data return right away, safe to call from any thread."""
+        with self._wake_up_lock:
+            if self._wake_up_fds is not None:
+                os.write(self._wake_up_fds[1], b"\0")
+
+    def close(self) -> None:
+        """Close the selector, outputs are left open."""
+        self._selector.close()
+        with self._wake_up_lock:
+            if self._wake_up_fds is not None:
+                for fd in self._wake_up_fds:
+                    os.close(fd)
+                self._wake_up_fds = None
+
+
+class _PrefixedRawOutput(io.RawIOBase):
+    """Raw stream returning given data first, then reading from the output.
+
+    Used to give back data read ahead of the banner.
+    """
+
+    def __init__(self, prefix: bytes, output: IO[Any]) -> None:
+        """Initialize _PrefixedRawOutput.
+
+        :param bytes prefix: data to return first
+        :param output: output to read from afterwards, gets closed along
+        """
+        super().__init__()
+        self._prefix = prefix
+        self._output = output
+
+    def readable(self) -> bool:
+        """Return True, it's readable."""
+        return True
+
+    def fileno(self) -> int:
+        """Return file descriptor of the output."""
+        return self._output.fileno()
+
+    def readinto(self, buffer: Any) -> int:
+        """Read into the buffer, from the prefix first."""
+        size = len(buffer)
+        if self._prefix:
+            data, self._prefix = self._prefix[:size], self._prefix[size:]
+        else:
+            data = os.read(self._output.fileno(), size)
+        buffer[: len(data)] = data
+        return len(data)
+
+    def close(self) -> None:
+        """Close the stream and the output."""
+        if not self.closed:
+            self._output.close()
+        super().close()
+
 
 class OutputExecutor(SimpleExecutor):
     """Executor that awaits for string output being present in output."""
@@ -35,14 +241,38 @@ class OutputExecutor(SimpleExecutor):
     def __init__(
         self,
         command: Union[str, List[str], Tuple[str, ...]],
-        banner: str,
+        banner: Union[BannerType, Iterable[BannerType]],
+        banner_window: int = 4096,
+        failure_banner: Optional[BannerType] = None,
+        buffer_lines: int = 0,
+        on_line: Optional[Callable[[str], None]] = None,
         **kwargs: Any,
     ) -> None:
         """Initialize OutputExecutor executor.
 
         :param (str, list) command: command to be run by the subprocess
         :param str banner: string that has to appear in process output -
-            should compile to regular expression.
+            should compile to regular expression. Text banner has to match
+            the beginning of an output line. Bytes banner is searched for in
+            raw output instead, without decoding or splitting it into lines,
+            so it can span many lines (compile it with ``re.DOTALL`` or
+            ``re.MULTILINE`` flags as needed).
+            Many banners can be given: as a set, if all of them have to
+            appear in any order, or as a list, if they have to appear in the
+            given order. They are all matched with a single combined regex.
+        :param int banner_window: number of bytes of the output kept for
+            searching bytes banner, which limits its length
+        :param str failure_banner: output meaning the process failed to start
+            - if it appears while waiting for the banner, the process is
+            killed and :class:`mirakuru.exceptions.ProcessFailedToStart` is
+            raised right away
+        :param int buffer_lines: number of most recent output lines to keep.
+            When set (or ``on_line`` is given), outputs keep being read in
+            a background thread after the process has started, so a chatty
+            process never blocks on a full pipe. Outputs can't be read with
+            :meth:`output` and :meth:`err_output` then.
+        :param callable on_line: called from the background thread with
+            every line read from the outputs
         :param bool shell: same as the `subprocess.Popen` shell definition
         :param int timeout: number of seconds to wait for the process to start
             or stop. If None or False, wait indefinitely.
@@ -54,10 +284,48 @@ class OutputExecutor(SimpleExecutor):
 
         """
         super().__init__(command, **kwargs)
-        self._banner = re.compile(banner)
+        banners = [banner] if isinstance(banner, (str, bytes, re.Pattern)) else list(banner)
+        self._banners_ordered = not isinstance(banner, (set, frozenset))
+        self._banner_names: List[str] = []
+        self._banner_patterns: Dict[str, "re.Pattern[Any]"] = {}
+        if len(banners) == 1 and failure_banner is None:
+            # no need to tell what matched
+            self._banner: "re.Pattern[Any]" = re.compile(banners[0])
+        else:
+            patterns = {BANNER_GROUP.format(i): re.compile(b) for i, b in enumerate(banners)}
+            self._banner_names = list(patterns)
+            if failure_banner is not None:
+                patterns[FAILURE_GROUP] = re.compile(failure_banner)
+            self._banner_patterns = patterns
+            self._banner = combine_banners(patterns)
+        self._awaited_banners: List[str] = []
+        self._banner_window = banner_window
         if not any((self._stdout, self._stderr)):
             raise TypeError("At least one of stdout or stderr has to be initialized")
 
+        self._capture = bool(buffer_lines or on_line)
+        self._on_line = on_line
+        self._lines: Deque[Tuple[int, str]] = deque(maxlen=buffer_lines or None)
+        self._lines_read = 0
+        self._lines_condition = threading.Condition()
+        self._reader: Optional[threading.Thread] = None
+        self._output_reader: Optional[OutputReader] = None
+        self._stop_reading = threading.Event()
+
+    def _outputs(self) -> List[IO[Any]]:
+        """Return process outputs configured to be read."""
+        outputs = []
+        for output_handle, output_method in (
+            (self._stdout, self.output),
+            (self._stderr, self.err_output),
+        ):
+            if output_handle is not None:
+                output = output_method()
+                if output is None:
+                    raise ValueError("The process is started but the output file is None")
+                outputs.append(output)
+        return outputs
+
     def start(self: OutputExecutorType) -> OutputExecutorType:
         """Start process.
 
@@ -67,82 +335,258 @@ class OutputExecutor(SimpleExecutor):
         .. note::
 
             Process will be considered started, when defined banner will appear
-            in process output.
+            in process output. Waiting blocks on all the outputs at once and
+            everything that gets written to them is checked right away.
         """
         super().start()
+        with self._lines_condition:
+            self._lines.clear()
+        self._awaited_banners = list(self._banner_names)
 
-        if not IS_DARWIN:
-            polls: List[Tuple[select.poll, IO[Any]]] = []
-            for output_handle, output_method in (
-                (self._stdout, self.output),
-                (self._stderr, self.err_output),
-            ):
-                if output_handle is not None:
-                    # get a polling object
-                    std_poll = select.poll()
-
-                    output_file = output_method()
-                    if output_file is None:
-                        raise ValueError("The process is started but the output file is None")
-                    # register a file descriptor
-                    # POLLIN because we will wait for data to read
-                    std_poll.register(output_file, select.POLLIN)
-                    polls.append((std_poll, output_file))
+        reader = OutputReader(self._outputs())
+        try:
+            read_ahead = self._wait_for_banner(reader)
+        except BaseException:
+            reader.close()
+            raise
 
-            try:
+        if self._capture:
+            for fd, chunk in read_ahead:
+                for line in reader.split_lines(fd, chunk):
+                    self._record_line(reader.decode(fd, line))
+            self._start_reader(reader)
+        else:
+            reader.close()
+            self._give_back(reader, read_ahead)
+        return self
 
-                def await_for_output() -> bool:
-                    return self._wait_for_output(*polls)
+    def _wait_for_banner(self, reader: OutputReader) -> List[Tuple[int, bytes]]:
+        """Read the outputs until the banner shows up.
 
-                self.wait_for(await_for_output)
+        :return: data read after the banner
+        :raises: mirakuru.exceptions.TimeoutExpired
+        :raises: mirakuru.exceptions.ProcessFailedToStart
+        """
+        windows: Dict[int, bytes] = {}
+        intervals = self._wait_strategy.intervals()
+        while self.check_timeout() and reader.fds:
+            self._check_failures()
+            timeout = self._remaining_time()
+            if self._failure_checks:
+                # wake up from time to time to run the failure checks again
+                interval = next(intervals)
+                timeout = interval if timeout is None else min(timeout, interval)
+            chunks = reader.read_chunks(timeout)
+            for index, (fd, chunk) in enumerate(chunks):
+                if isinstance(self._banner.pattern, bytes):
+                    rest = self._search_chunk(reader, fd, chunk, windows)
+                else:
+                    rest = self._match_lines(reader, fd, chunk)
+                if rest is not None:
+                    return [(fd, rest)] + chunks[index + 1 :]
+
+        # Either the time is up, or all outputs got closed - the banner will
+        # not show up, but keep waiting for the timeout like always.
+        def never_started() -> bool:
+            self._check_failures()
+            return False
+
+        self.wait_for(never_started)
+        return []  # pragma: no cover
+
+    def _match_lines(self, reader: OutputReader, fd: int, chunk: bytes) -> Optional[bytes]:
+        """Match the banner against every complete line of the chunk.
 
-                for poll, output in polls:
-                    # unregister the file descriptor
-                    # and delete the polling object
-                    poll.unregister(output)
-            finally:
-                for poll_and_output in polls:
-                    del poll_and_output
+        :return: data following the banner line, None if there's no banner
+        """
+        lines = reader.split_lines(fd, chunk)
+        for index, line in enumerate(lines):
+            text = reader.decode(fd, line)
+            if self._capture:
+                self._record_line(text)
+            match = self._banner.match(text)
+            if match and self._banner_matched(match):
+                return b"".join(lines[index + 1 :]) + reader.take_pending(fd)
+        return None
+
+    def _search_chunk(
+        self, reader: OutputReader, fd: int, chunk: bytes, windows: Dict[int, bytes]
+    ) -> Optional[bytes]:
+        """Search the banner in raw chunk, along with the end of previous ones.
+
+        :return: data following the banner, None if there's no banner
+        """
+        window = windows.get(fd, b"") + chunk
+        scanned = len(window) - len(chunk)
+        match = None
+        for found in self._banner.finditer(window):
+            # skip matches already found in the previous window
+            if found.end() > scanned and self._banner_matched(found):
+                match = found
+                break
+        # position where the banner ends within the chunk
+        end = len(chunk) if match is None else max(match.end() - scanned, 0)
+        if self._capture:
+            for line in reader.split_lines(fd, chunk[:end]):
+                self._record_line(reader.decode(fd, line))
+        if match is not None:
+            return chunk[end:]
+        windows[fd] = window[-self._banner_window :]
+        return None
+
+    def _banner_matched(self, match: "re.Match[Any]") -> bool:
+        """Note banner match.
+
+        Combined regex tells only about the first alternative that matched,
+        so each banner is matched separately at the same position, in case
+        the banners overlap.
+
+        :return: True if all banners have appeared
+        :raises: mirakuru.exceptions.ProcessFailedToStart on failure banner
+        """
+        if not self._banner_names:
+            return True
+
+        failure = self._match_banner(FAILURE_GROUP, match)
+        if failure is not None:
+            self.kill()
+            raise ProcessFailedToStart(self, f"{failure.group()!r} found in output")
+        if self._banners_ordered:
+            if self._match_banner(self._awaited_banners[0], match) is not None:
+                self._awaited_banners.pop(0)
         else:
-            outputs = []
-            for output_handle, output_method in (
-                (self._stdout, self.output),
-                (self._stderr, self.err_output),
-            ):
-                if output_handle is not None:
-                    outputs.append(output_method())
+            self._awaited_banners = [
+                name for name in self._awaited_banners if self._match_banner(name, match) is None
+            ]
+        return not self._awaited_banners
 
-            def await_for_output() -> bool:
-                return self._wait_for_darwin_output(*outputs)
+    def _match_banner(self, name: str, match: "re.Match[Any]") -> "Optional[re.Match[Any]]":
+        """Match given banner where the combined banners have matched."""
+        pattern = self._banner_patterns.get(name)
+        if pattern is None:
+            return None
+        return pattern.match(match.string, match.start())
 
-            self.wait_for(await_for_output)
+    def _give_back(self, reader: OutputReader, read_ahead: List[Tuple[int, bytes]]) -> None:
+        """Make data read after the banner readable from the outputs again."""
+        if self.process is None:  # pragma: no cover
+            return
+        for name in ("stdout", "stderr"):
+            output = getattr(self.process, name)
+            if output is None or output.closed:
+                continue
+            fd = output.fileno()
+            data = reader.take_pending(fd)
+            data += b"".join(chunk for chunk_fd, chunk in read_ahead if chunk_fd == fd)
+            if data:
+                raw = _PrefixedRawOutput(data, output)
+                setattr(
+                    self.process,
+                    name,
+                    io.TextIOWrapper(
+                        io.BufferedReader(raw), encoding=output.encoding, errors=output.errors
+                    ),
+                )
 
-        return self
+    def _start_reader(self, reader: OutputReader) -> None:
+        """Start thread draining outputs of the process."""
+        self._stop_reading.clear()
+        self._output_reader = reader
+        self._reader = threading.Thread(
+            target=self._read_outputs,
+            args=(reader,),
+            name=f"mirakuru-output-{self.process.pid if self.process else ''}",
+            daemon=True,
+        )
+        self._reader.start()
+
+    def _read_outputs(self, reader: OutputReader) -> None:
+        """Read lines from the outputs until they get closed."""
+        try:
+            while reader.fds and not self._stop_reading.is_set():
+                self._record_chunks(reader, reader.read_chunks(None))
+            # lines written right before the process was cleared
+            self._record_chunks(reader, reader.read_chunks(0))
+        except (OSError, ValueError):
+            # output got closed
+            pass
+        finally:
+            reader.close()
+            with self._lines_condition:
+                self._lines_condition.notify_all()
+
+    def _record_chunks(self, reader: OutputReader, chunks: List[Tuple[int, bytes]]) -> None:
+        """Record complete lines of the chunks read."""
+        for fd, chunk in chunks:
+            for line in reader.split_lines(fd, chunk):
+                self._record_line(reader.decode(fd, line))
 
-    def _wait_for_darwin_output(self, *fds: Optional[IO[Any]]) -> bool:
-        """Select implementation to be used on MacOSX."""
-        rlist, _, _ = select.select(fds, [], [], 0)
-        for output in rlist:
-            line = output.readline()
-            if self._banner.match(line):
-                return True
-        return False
+    def _record_line(self, line: str) -> None:
+        """Store the line in the buffer and pass it to the callback."""
+        with self._lines_condition:
+            self._lines_read += 1
+            if self._lines.maxlen is not None:
+                self._lines.append((self._lines_read, line))
+            self._lines_condition.notify_all()
+        if self._on_line is not None:
+            try:
+                self._on_line(line)
+            except Exception:  # pylint:disable=broad-except
+                LOG.exception("Output line callback of %s failed", self)
+
+    def _reader_alive(self) -> bool:
+        """Check if the output reading thread is still running."""
+        return self._reader is not None and self._reader.is_alive()
+
+    def recent_lines(self, count: Optional[int] = None) -> List[str]:
+        """Return most recent lines of the process outputs.
+
+        Only available with ``buffer_lines`` set. Lines read while waiting
+        for the banner are included.
 
-    def _wait_for_output(self, *polls: Tuple["select.poll", IO[Any]]) -> bool:
-        """Check if output matches banner.
+        :param int count: number of lines to return, all buffered by default
+        :rtype: list
+        """
+        with self._lines_condition:
+            lines = [line for _, line in self._lines]
+        if count is not None:
+            lines = lines[-count:] if count else []
+        return lines
+
+    def lines(self, timeout: Optional[float] = None) -> Iterator[str]:
+        """Iterate over lines of the process outputs as they come.
 
-        .. warning::
-            Waiting for I/O completion. It does not work on Windows. Sorry.
+        Starts with the lines already in the buffer. Lines that fall out of
+        the buffer before being consumed are skipped. Iteration ends when
+        outputs get closed, or no line comes within the timeout.
+
+        :param float timeout: number of seconds to wait for the next line,
+            wait indefinitely by default
+        :rtype: iterator
         """
-        for poll, output in polls:
-            # Here we should get an empty list or list with a tuple
-            # [(fd, event)]. When we get list with a tuple we can use readline
-            # method on the file descriptor.
-            poll_result = poll.poll(0)
-
-            if poll_result:
-                line = output.readline()
-                if self._banner.match(line):
-                    return True
-
-        return False
+        last = 0
+        while True:
+            with self._lines_condition:
+                if not self._lines_condition.wait_for(
+                    lambda: (self._lines and self._lines[-1][0] > last) or not self._reader_alive(),
+                    timeout,
+                ):
+                    return
+                lines = [(number, line) for number, line in self._lines if number > last]
+            if not lines:
+                return
+            for number, line in lines:
+                last = number
+                yield line
+
+    def _clear_process(self) -> None:
+        """Stop output reading thread, then close the process outputs."""
+        if self._reader is not None and self._output_reader is not None:
+            self._stop_reading.set()
+            self._output_reader.wake_up()
+            if self._reader is not threading.current_thread():
+                # line callback could be the one clearing the process
+                self._reader.join()
+            self._reader = None
+            self._output_reader = None
+        super()._clear_process()
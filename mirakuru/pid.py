@@ -18,9 +18,12 @@
 """Pid executor definition."""
 
 import os.path
-from typing import Any, List, Tuple, Union
+from typing import Any, List, Optional, Tuple, Union
 
-from mirakuru.base import Executor
+from mirakuru.base import ENV_UUID, Executor
+from mirakuru.base_env import processes_with_env
+from mirakuru.inotify import DirectoryWatch, watch_directory
+from mirakuru.wait import EventWait, FixedWait
 
 
 class PidExecutor(Executor):
@@ -35,6 +38,7 @@ class PidExecutor(Executor):
         self,
         command: Union[str, List[str], Tuple[str, ...]],
         filename: str,
+        check_pid: bool = False,
         **kwargs: Any,
     ) -> None:
         """Initialize the PidExecutor executor.
@@ -43,6 +47,9 @@ class PidExecutor(Executor):
 
         :param (str, list) command: command to be run by the subprocess
         :param str filename: the file which is to exist
+        :param bool check_pid: require the file to contain PID of a process
+            started by the executor, instead of just existing. Before start,
+            only file containing PID of a running process counts.
         :param bool shell: same as the `subprocess.Popen` shell definition
         :param int timeout: number of seconds to wait for the process to start
             or stop. If None or False, wait indefinitely.
@@ -60,6 +67,23 @@ class PidExecutor(Executor):
             raise ValueError("filename must be defined")
         self.filename = filename
         """the name of the file which the process is to create."""
+        self.check_pid = check_pid
+        """Whether the file has to contain PID of the executor's process."""
+        if kwargs.get("wait_strategy") is None:
+            # wake up as soon as the file gets written, sleep interval bounds the wait
+            self._wait_strategy = EventWait(FixedWait(self._sleep))
+        self._watch: Optional[DirectoryWatch] = None
+
+    def _read_pid(self) -> Optional[int]:
+        """Return PID written in the file, None if there's none (yet)."""
+        try:
+            with open(self.filename, "rb") as pid_file:
+                content = pid_file.read(64).split(maxsplit=1)
+        except OSError:
+            return None
+        if not content or not content[0].isdigit():
+            return None
+        return int(content[0])
 
     def pre_start_check(self) -> bool:
         """Check if the specified file has been created.
@@ -69,7 +93,18 @@ class PidExecutor(Executor):
             The process will be considered started when it will have created
             the specified file as defined in the initializer.
         """
-        return os.path.isfile(self.filename)
+        if not self.check_pid:
+            return os.path.isfile(self.filename)
+        pid = self._read_pid()
+        if pid is None:
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
 
     def after_start_check(self) -> bool:
         """Check if the process has created the specified file.
@@ -77,6 +112,41 @@ class PidExecutor(Executor):
         .. note::
 
             The process will be considered started when it will have created
-            the specified file as defined in the initializer.
+            the specified file as defined in the initializer. With
+            ``check_pid``, the file has to contain PID of the process or any
+            of its subprocesses.
         """
-        return self.pre_start_check()  # we can reuse logic from `pre_start()`
+        if self._watch is not None:
+            # drain before checking, so the next change wakes us up again
+            self._watch.drain()
+        if not self.check_pid:
+            started = os.path.isfile(self.filename)
+        else:
+            pid = self._read_pid()
+            started = pid is not None and (
+                (self.process is not None and pid == self.process.pid)
+                or bool(processes_with_env(ENV_UUID, self._uuid, [pid]))
+            )
+        if started:
+            self._close_watch()
+        return started
+
+    def _wait_fds(self) -> List[int]:
+        """Return process file descriptor and inotify one watching the file's directory."""
+        if self._watch is None:
+            self._watch = watch_directory(os.path.dirname(os.path.abspath(self.filename)))
+        fds = super()._wait_fds()
+        if self._watch is not None:
+            fds.append(self._watch.fileno())
+        return fds
+
+    def _close_watch(self) -> None:
+        """Stop watching the file's directory."""
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+
+    def _clear_process(self) -> None:
+        """Stop watching the file's directory along with the process."""
+        self._close_watch()
+        super()._clear_process()
@@ -0,0 +1,279 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Pool of executors started ahead of time."""
+
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Callable, Dict, Iterator, List, Optional, Type, TypeVar
+
+from mirakuru.base import SimpleExecutor
+
+LOG = logging.getLogger(__name__)
+
+ExecutorPoolType = TypeVar("ExecutorPoolType", bound="ExecutorPool")
+
+
+class ExecutorPool:
+    """Keeps executors of the same configuration started, ready to be used.
+
+    Executors get started in the background, so acquiring one that's already
+    running takes no time. Released executors get reset (restarted by
+    default) in the background, before being handed out again. Executors idle
+    for longer than ``ttl`` get stopped, and started again when needed.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int], SimpleExecutor],
+        size: int,
+        reset: Optional[Callable[[SimpleExecutor], None]] = None,
+        ttl: Optional[float] = None,
+    ) -> None:
+        """Initialize ExecutorPool.
+
+        :param callable factory: creates executor for given slot number
+            (0 to ``size - 1``), so every executor can use its own port or
+            directory
+        :param int size: number of executors
+        :param callable reset: brings released executor back to its initial
+            state (e.g. truncates database). If it fails, or it's not given,
+            executor gets restarted instead.
+        :param float ttl: number of seconds after which idle executor gets
+            stopped, never by default
+        """
+        if size < 1:
+            raise ValueError("pool size has to be positive")
+        self.executors = [factory(slot) for slot in range(size)]
+        """All executors of the pool."""
+        self._reset = reset
+        self._ttl = ttl
+        self._stopped: List[SimpleExecutor] = list(self.executors)
+        self._idle: Dict[SimpleExecutor, float] = {}
+        self._acquired: List[SimpleExecutor] = []
+        self._errors: List[Exception] = []
+        self._condition = threading.Condition()
+        self._workers: Optional[ThreadPoolExecutor] = None
+        self._evictor: Optional[threading.Thread] = None
+        self._closed = False
+
+    def __enter__(self: ExecutorPoolType) -> ExecutorPoolType:
+        """Enter context manager starting the executors.
+
+        :returns: itself
+        :rtype: ExecutorPool
+        """
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager stopping the executors."""
+        self.stop()
+
+    def start(self: ExecutorPoolType, wait: bool = False) -> ExecutorPoolType:
+        """Start all executors in the background.
+
+        :param bool wait: whether to wait until all of them have started
+        :raises: exception of the first executor that failed to start,
+            when waiting
+        :returns: itself
+        :rtype: ExecutorPool
+        """
+        with self._condition:
+            self._closed = False
+            if self._workers is None:
+                self._workers = ThreadPoolExecutor(
+                    len(self.executors), thread_name_prefix="mirakuru-pool"
+                )
+            while self._stopped:
+                self._submit(self._start, self._stopped.pop(0))
+            if self._ttl is not None and self._evictor is None:
+                self._evictor = threading.Thread(
+                    target=self._evict_idle, name="mirakuru-pool-evictor", daemon=True
+                )
+                self._evictor.start()
+            if wait:
+                while len(self._idle) + len(self._acquired) < len(self.executors):
+                    self._raise_error()
+                    self._condition.wait()
+        return self
+
+    def acquire(self, timeout: Optional[float] = None) -> SimpleExecutor:
+        """Take running executor from the pool.
+
+        Most recently used executor is taken first, so the others can get
+        idle long enough to be stopped. If there's none running, stopped
+        executor gets started.
+
+        :param float timeout: maximum number of seconds to wait for the
+            executor, indefinitely by default
+        :raises: TimeoutError when no executor became available in time,
+            or exception of executor that failed to start in the background
+        :returns: running executor, it has to be released afterwards
+        :rtype: SimpleExecutor
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                if self._closed or self._workers is None:
+                    raise RuntimeError("pool is not started")
+                self._raise_error()
+                if self._idle:
+                    executor = list(self._idle)[-1]
+                    del self._idle[executor]
+                    self._acquired.append(executor)
+                    return executor
+                if self._stopped:
+                    self._submit(self._start, self._stopped.pop(0))
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"No executor available within {timeout} seconds")
+                self._condition.wait(remaining)
+
+    def release(self, executor: SimpleExecutor) -> None:
+        """Give the executor back to the pool.
+
+        Executor gets reset in the background, then it can be acquired again.
+
+        :param SimpleExecutor executor: executor taken with :meth:`acquire`
+        """
+        with self._condition:
+            if self._closed:
+                # stopping the pool stops acquired executors as well
+                return
+            self._acquired.remove(executor)
+            self._submit(self._recycle, executor)
+
+    @contextmanager
+    def executor(self, timeout: Optional[float] = None) -> Iterator[SimpleExecutor]:
+        """Acquire executor for the duration of the context.
+
+        :param float timeout: maximum number of seconds to wait for the executor
+        """
+        executor = self.acquire(timeout)
+        try:
+            yield executor
+        finally:
+            self.release(executor)
+
+    def stop(self) -> None:
+        """Stop all executors, waiting for background work to finish.
+
+        Executors still acquired get stopped too.
+        """
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+            workers, self._workers = self._workers, None
+            evictor, self._evictor = self._evictor, None
+        if evictor is not None:
+            evictor.join()
+        if workers is not None:
+            workers.shutdown(wait=True)
+        with self._condition:
+            running = list(self._idle) + self._acquired
+            self._idle.clear()
+            self._acquired.clear()
+            self._errors.clear()
+            self._stopped = list(self.executors)
+        for executor in running:
+            self._stop(executor)
+
+    def _submit(self, action: Callable[[SimpleExecutor], None], executor: SimpleExecutor) -> None:
+        """Run action for the executor in the background."""
+        assert self._workers is not None
+        self._workers.submit(action, executor)
+
+    def _raise_error(self) -> None:
+        """Raise the first error of background start, if any."""
+        if self._errors:
+            raise self._errors.pop(0)
+
+    def _start(self, executor: SimpleExecutor) -> None:
+        """Start the executor and make it available."""
+        try:
+            executor.start()
+        except Exception as error:  # pylint:disable=broad-except
+            LOG.debug("Executor %s failed to start in the pool: %s", executor, error)
+            with self._condition:
+                self._errors.append(error)
+                self._stopped.append(executor)
+                self._condition.notify_all()
+            return
+        self._make_idle(executor)
+
+    def _recycle(self, executor: SimpleExecutor) -> None:
+        """Reset the executor, restart it if that's not possible."""
+        if self._reset is not None and executor.running():
+            try:
+                self._reset(executor)
+            except Exception as error:  # pylint:disable=broad-except
+                LOG.debug("Failed to reset %s, restarting it: %s", executor, error)
+            else:
+                self._make_idle(executor)
+                return
+        self._stop(executor)
+        self._start(executor)
+
+    def _make_idle(self, executor: SimpleExecutor) -> None:
+        """Make the executor available, unless the pool got stopped meanwhile."""
+        with self._condition:
+            closed = self._closed
+            if not closed:
+                self._idle[executor] = time.monotonic()
+                self._condition.notify_all()
+        if closed:
+            # stopping outside the lock doesn't block acquiring or releasing the others
+            self._stop(executor)
+
+    def _stop(self, executor: SimpleExecutor) -> None:
+        """Stop the executor, ignoring failures."""
+        try:
+            executor.stop()
+        except Exception as error:  # pylint:disable=broad-except
+            LOG.debug("Failed to stop %s, killing it: %s", executor, error)
+            executor.kill()
+
+    def _evict(self, executor: SimpleExecutor) -> None:
+        """Stop the executor, so it can be started again when needed."""
+        self._stop(executor)
+        with self._condition:
+            if not self._closed:
+                self._stopped.append(executor)
+                self._condition.notify_all()
+
+    def _evict_idle(self) -> None:
+        """Stop executors idle for longer than ttl, until the pool gets stopped."""
+        assert self._ttl is not None
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                for executor, since in list(self._idle.items()):
+                    if now - since >= self._ttl:
+                        LOG.debug("Stopping %s, idle for %.1f seconds", executor, now - since)
+                        del self._idle[executor]
+                        self._submit(self._evict, executor)
+                oldest = min(self._idle.values(), default=now)
+                self._condition.wait(oldest + self._ttl - now)
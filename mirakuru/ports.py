@@ -0,0 +1,182 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Free ports reserved across processes.
+
+Port is free when the kernel hands it out for binding, and it's reserved by
+locking its file in a directory shared by all processes (e.g. pytest-xdist
+workers), so no other process gets it until the reservation is released,
+or the process holding it exits. Lock files are removed on release, lock
+files of other users count as reserved ports.
+"""
+
+import errno
+import logging
+import os
+import socket
+import sys
+import tempfile
+import threading
+from types import TracebackType
+from typing import Optional, Set, Type
+
+if sys.platform != "win32":
+    import fcntl
+
+LOG = logging.getLogger(__name__)
+
+PORTS_DIR = os.path.join(tempfile.gettempdir(), "mirakuru-ports")
+"""Directory with lock files of reserved ports."""
+
+ATTEMPTS = 100
+"""Number of ports tried before giving up."""
+
+_RESERVED: Set[int] = set()
+_RESERVED_LOCK = threading.Lock()
+
+
+class PortReservation:
+    """Port reserved for the current process, until released."""
+
+    def __init__(self, port: int, fd: Optional[int], path: Optional[str] = None) -> None:
+        """Initialize PortReservation.
+
+        :param int port: reserved port
+        :param int fd: locked file of the port, None where locking isn't available
+        :param str path: path of the locked file
+        """
+        self.port = port
+        """Reserved port number."""
+        self._fd = fd
+        self._path = path
+
+    def __enter__(self) -> "PortReservation":
+        """Enter context manager.
+
+        :returns: itself
+        :rtype: PortReservation
+        """
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager releasing the port."""
+        self.release()
+
+    def release(self) -> None:
+        """Let other processes reserve the port."""
+        with _RESERVED_LOCK:
+            if self.port not in _RESERVED:
+                return
+            _RESERVED.discard(self.port)
+            if self._fd is not None:
+                # removed while still locked, see _lock
+                if self._path is not None:
+                    try:
+                        os.unlink(self._path)
+                    except OSError:
+                        LOG.debug("Can't remove lock file %s", self._path)
+                # closing the file releases the lock
+                os.close(self._fd)
+                self._fd = None
+
+
+def _free_port(host: str) -> int:
+    """Return port the kernel hands out for binding to the host."""
+    family, kind, proto, _, address = socket.getaddrinfo(host, 0, type=socket.SOCK_STREAM)[0]
+    with socket.socket(family, kind, proto) as sock:
+        sock.bind(address)
+        return int(sock.getsockname()[1])
+
+
+def _lock(path: str) -> Optional[int]:
+    """Lock file of the port.
+
+    :return: file descriptor holding the lock, -1 if somebody else holds it,
+        None if locking isn't available
+    """
+    if sys.platform == "win32":
+        return None
+    try:
+        fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o666)
+    except PermissionError:
+        # lock file of other user
+        return -1
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        # previous holder could have removed the file before it got locked,
+        # then the lock is worthless
+        if os.fstat(fd).st_ino != os.stat(path).st_ino:
+            raise FileNotFoundError(path)
+    except OSError:
+        os.close(fd)
+        return -1
+    return fd
+
+
+def _directory(directory: str) -> str:
+    """Return directory for lock files, creating it shared by all users.
+
+    :param str directory: directory shared by processes reserving ports
+    :returns: the directory, or one of the current user next to it if the
+        shared one can't be written to
+    """
+    try:
+        os.makedirs(directory)
+    except FileExistsError:
+        pass
+    else:
+        try:
+            # like /tmp, so everybody can add lock files, but not remove others'
+            os.chmod(directory, 0o1777)
+        except OSError:
+            LOG.debug("Can't make %s writable for all users", directory)
+    if sys.platform == "win32" or os.access(directory, os.W_OK | os.X_OK):
+        return directory
+    own = f"{directory}-{os.getuid()}"
+    LOG.debug("Can't write to %s, reserving ports in %s", directory, own)
+    os.makedirs(own, exist_ok=True)
+    return own
+
+
+def reserve_port(host: str = "localhost", directory: str = PORTS_DIR) -> PortReservation:
+    """Find free port and reserve it.
+
+    :param str host: host the port will be listened on
+    :param str directory: directory with lock files, shared by processes
+        reserving ports
+    :raises: OSError when no free port could be reserved
+    :rtype: PortReservation
+    """
+    directory = _directory(directory)
+    for _ in range(ATTEMPTS):
+        port = _free_port(host)
+        with _RESERVED_LOCK:
+            if port in _RESERVED:
+                continue
+            path = os.path.join(directory, f"{port}.lock")
+            fd = _lock(path)
+            if fd == -1:
+                LOG.debug("Port %s is already reserved by other process", port)
+                continue
+            _RESERVED.add(port)
+        return PortReservation(port, fd, path)
+    raise OSError(errno.EADDRINUSE, f"No free port reserved after {ATTEMPTS} attempts")
@@ -0,0 +1,282 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Executors shared by many processes, e.g. pytest-xdist workers.
+
+Processes sharing an executor record it in a registry: JSON file guarded by
+a lock file. The first one to start the executor starts its process, the
+others attach to it, and the last one to stop it stops the process. Starting
+and stopping is guarded by a lock file of the executor, so it doesn't hold
+up the other executors.
+"""
+
+import atexit
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import weakref
+from contextlib import contextmanager
+from types import TracebackType
+from typing import Any, Callable, Dict, Iterator, Optional, Type, TypeVar
+
+from mirakuru.attached import pid_running
+from mirakuru.base import ENV_UUID, LIVE_EXECUTORS, SimpleExecutor
+from mirakuru.base_env import processes_with_env
+
+if sys.platform != "win32":
+    import fcntl
+
+LOG = logging.getLogger(__name__)
+
+SHARED_DIR = os.path.join(tempfile.gettempdir(), "mirakuru-shared")
+"""Directory of the default registry."""
+
+SharedExecutorType = TypeVar("SharedExecutorType", bound="SharedExecutor")
+
+_LOCK = threading.Lock()
+_FILE_LOCKS: Dict[str, threading.Lock] = {}
+
+LIVE_SHARED_EXECUTORS: "weakref.WeakSet[SharedExecutor]" = weakref.WeakSet()
+"""Shared executors started by the current process, and not stopped yet."""
+
+
+@atexit.register
+def release_shared_executors() -> None:
+    """On python exit: release shared executors, killing processes nobody else uses."""
+    for shared in list(LIVE_SHARED_EXECUTORS):
+        shared.kill()
+
+
+@contextmanager
+def _file_lock(path: str) -> Iterator[None]:
+    """Hold the lock file, other processes and threads wait for it."""
+    with _LOCK:
+        thread_lock = _FILE_LOCKS.setdefault(path, threading.Lock())
+    with thread_lock, open(path, "a", encoding="utf-8") as lock:
+        if sys.platform != "win32":
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        yield
+
+
+class SharedRegistry:
+    """Registry of shared executors' processes, kept in a directory."""
+
+    def __init__(self, directory: str = SHARED_DIR) -> None:
+        """Initialize SharedRegistry.
+
+        :param str directory: directory of the registry, shared by all the
+            processes sharing executors
+        """
+        self.directory = directory
+        self.path = os.path.join(directory, "executors.json")
+        """File with the registry entries."""
+
+    @contextmanager
+    def locked(self) -> Iterator[Dict[str, Dict[str, Any]]]:
+        """Lock the registry and return its entries.
+
+        Changes of the entries are saved once the context ends. Only one
+        process at a time holds the lock, others wait for it.
+
+        :yields: entries by executor name
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        with _file_lock(f"{self.path}.lock"):
+            try:
+                with open(self.path, encoding="utf-8") as registry:
+                    entries = json.load(registry)
+            except (OSError, ValueError):
+                entries = {}
+            yield entries
+            with open(f"{self.path}.tmp", "w", encoding="utf-8") as registry:
+                json.dump(entries, registry)
+            os.replace(f"{self.path}.tmp", self.path)
+
+    @contextmanager
+    def executor_locked(self, name: str) -> Iterator[None]:
+        """Lock the executor, so only one process at a time starts or stops it.
+
+        Registry isn't locked meanwhile, so other executors can be started.
+        Has to be acquired before the registry lock.
+
+        :param str name: name of the executor
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        digest = hashlib.sha1(name.encode(), usedforsecurity=False).hexdigest()
+        with _file_lock(os.path.join(self.directory, f"{digest}.lock")):
+            yield
+
+
+def _entry_running(entry: Dict[str, Any]) -> bool:
+    """Check if the shared process is still running, and its PID wasn't reused."""
+    return pid_running(entry["pid"]) and bool(
+        processes_with_env(ENV_UUID, entry["marker"], [entry["pid"]])
+    )
+
+
+def _holder_running(holder: str) -> bool:
+    """Check if the process holding shared executor is still running."""
+    pid, _, _ = holder.partition(":")
+    return pid.isdigit() and pid_running(int(pid))
+
+
+class SharedExecutor:
+    """Executor started once and shared by many processes.
+
+    Executors are identified by name, their process gets started by the
+    first process starting the executor, and stopped by the last one stopping
+    it. Executors not stopped get released on exit, and processes that
+    exit abruptly are not counted.
+    """
+
+    def __init__(
+        self,
+        executor: SimpleExecutor,
+        name: Optional[str] = None,
+        registry: Optional[SharedRegistry] = None,
+    ) -> None:
+        """Initialize SharedExecutor.
+
+        :param SimpleExecutor executor: executor to share, configured the
+            same way in every process
+        :param str name: name identifying the executor, its class and
+            command by default
+        :param SharedRegistry registry: registry of shared executors, the
+            one in the temporary directory by default
+        """
+        self.executor = executor
+        """Executor running, or attached to, the shared process."""
+        self.name = name or f"{type(executor).__name__}: {executor.command}"
+        """Name identifying the executor."""
+        self.registry = registry or SharedRegistry()
+        self._holder: Optional[str] = None
+
+    def __enter__(self: SharedExecutorType) -> SharedExecutorType:
+        """Enter context manager starting, or attaching to, the process.
+
+        :returns: itself
+        :rtype: SharedExecutor
+        """
+        return self.start()
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_value: Optional[BaseException],
+        traceback: Optional[TracebackType],
+    ) -> None:
+        """Exit context manager releasing the process."""
+        self.stop()
+
+    def running(self) -> bool:
+        """Check if the shared process is running.
+
+        :rtype: bool
+        """
+        return self.executor.running()
+
+    def start(self: SharedExecutorType) -> SharedExecutorType:
+        """Start the process, or attach to it if other process already has.
+
+        :returns: itself
+        :rtype: SharedExecutor
+        """
+        if self._holder is not None:
+            return self
+        # pylint:disable=protected-access
+        with self.registry.executor_locked(self.name):
+            with self.registry.locked() as entries:
+                entry = entries.get(self.name)
+                attached = False
+                if entry is not None and _entry_running(entry):
+                    LOG.debug("Attaching to %s, process %d", self.name, entry["pid"])
+                    self.executor._attach(entry["pid"], entry["marker"], entry["endpoint"])
+                    self._add_holder(entry)
+                    attached = True
+            if not attached:
+                # registry isn't locked, so other executors can start meanwhile
+                self.executor.start()
+                assert self.executor.process is not None
+                with self.registry.locked() as entries:
+                    entry = {
+                        "pid": self.executor.process.pid,
+                        "marker": self.executor._uuid,
+                        "endpoint": self.executor._endpoint(),
+                        "holders": [],
+                    }
+                    entries[self.name] = entry
+                    self._add_holder(entry)
+        # released on exit, instead of being killed along with other executors
+        LIVE_EXECUTORS.discard(self.executor)
+        LIVE_SHARED_EXECUTORS.add(self)
+        return self
+
+    def stop(self: SharedExecutorType) -> SharedExecutorType:
+        """Release the process, stopping it if nobody else uses it.
+
+        :returns: itself
+        :rtype: SharedExecutor
+        """
+        self._release(self.executor.stop)
+        return self
+
+    def kill(self: SharedExecutorType) -> SharedExecutorType:
+        """Release the process, killing it if nobody else uses it.
+
+        :returns: itself
+        :rtype: SharedExecutor
+        """
+        self._release(self.executor.kill)
+        return self
+
+    def _add_holder(self, entry: Dict[str, Any]) -> None:
+        """Add this process to the holders, dropping the ones no longer running."""
+        # pylint:disable=protected-access
+        self._holder = self.executor._own_uuid
+        holders = [holder for holder in entry["holders"] if _holder_running(holder)]
+        entry["holders"] = holders + [self._holder]
+
+    def _release(self, stop: Callable[[], Any]) -> None:
+        """Remove this process from the holders, and stop the executor if it was the last."""
+        if self._holder is None:
+            return
+        with self.registry.executor_locked(self.name):
+            with self.registry.locked() as entries:
+                entry = entries.get(self.name)
+                holders = []
+                process = self.executor.process
+                if entry is not None and process is not None and entry["pid"] == process.pid:
+                    holders = [
+                        holder
+                        for holder in entry["holders"]
+                        if holder != self._holder and _holder_running(holder)
+                    ]
+                    if holders:
+                        entry["holders"] = holders
+                    else:
+                        del entries[self.name]
+            self._holder = None
+            LIVE_SHARED_EXECUTORS.discard(self)
+            if holders:
+                LOG.debug("Leaving %s running for %d other holders", self.name, len(holders))
+                self.executor.detach()
+            else:
+                stop()
@@ -17,10 +17,124 @@
 # along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
 """TCP executor definition."""
 
+import errno
+import itertools
+import os
+import re
+import selectors
 import socket
-from typing import Any, List, Tuple, Union
+import time
+from typing import IO, Any, Dict, List, Optional, Set, Tuple, TypeVar, Union
 
-from mirakuru.base import Executor
+from mirakuru.base import ENV_UUID, Executor
+from mirakuru.base_env import process_descendants, processes_with_env
+from mirakuru.listening import (
+    executor_listener,
+    listening_tcp_inodes,
+    listening_tcp_ports,
+    socket_owners,
+)
+from mirakuru.output import OutputReader
+from mirakuru.ports import PortReservation, reserve_port
+
+AddressInfo = Tuple[socket.AddressFamily, socket.SocketKind, int, str, Any]
+"""Single address as returned by `socket.getaddrinfo`."""
+
+TCPExecutorType = TypeVar("TCPExecutorType", bound="TCPExecutor")
+
+CONNECT_ATTEMPT_DELAY = 0.25
+"""Seconds to wait for a connection attempt before racing it with the next address.
+
+Same as the default Connection Attempt Delay of Happy Eyeballs (RFC 8305).
+"""
+
+
+def interleave_addresses(addresses: List[AddressInfo]) -> List[AddressInfo]:
+    """Reorder addresses, so their families alternate.
+
+    First address stays first, so the family preferred by the resolver
+    gets tried first.
+
+    :param list addresses: addresses as returned by `socket.getaddrinfo`
+    :rtype: list
+    """
+    by_family: Dict[socket.AddressFamily, List[AddressInfo]] = {}
+    for address in addresses:
+        by_family.setdefault(address[0], []).append(address)
+    return [
+        address
+        for group in itertools.zip_longest(*by_family.values())
+        for address in group
+        if address is not None
+    ]
+
+
+def connect(
+    addresses: List[AddressInfo],
+    timeout: Optional[float] = None,
+    attempt_delay: float = CONNECT_ATTEMPT_DELAY,
+) -> socket.socket:
+    """Connect to the first address accepting connection, Happy Eyeballs style.
+
+    Connections are made in non-blocking mode. Next address gets tried as
+    soon as the previous attempt fails or doesn't succeed within
+    ``attempt_delay``, while earlier attempts keep going. First established
+    connection wins, all the others get closed.
+
+    :param list addresses: addresses as returned by `socket.getaddrinfo`
+    :param float timeout: maximum number of seconds for the whole
+        connecting, None to wait until all attempts finish
+    :param float attempt_delay: seconds to wait before trying next address
+    :raises: socket.timeout when no connection got established in time,
+        OSError of the last attempt when all of them failed
+    :returns: connected socket, in blocking mode
+    :rtype: socket.socket
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    pending = interleave_addresses(addresses)
+    error: OSError = OSError(errno.EADDRNOTAVAIL, "No addresses to connect to")
+    next_attempt = time.monotonic()
+    with selectors.DefaultSelector() as selector:
+        try:
+            while True:
+                now = time.monotonic()
+                if pending and (not selector.get_map() or now >= next_attempt):
+                    family, kind, proto, _, sockaddr = pending.pop(0)
+                    next_attempt = now + attempt_delay
+                    sock = socket.socket(family, kind, proto)
+                    sock.setblocking(False)
+                    code = sock.connect_ex(sockaddr)
+                    if code in (errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EAGAIN):
+                        selector.register(sock, selectors.EVENT_WRITE)
+                        continue
+                    if code == 0:
+                        sock.setblocking(True)
+                        return sock
+                    sock.close()
+                    error = OSError(code, os.strerror(code))
+                    continue
+                if not selector.get_map():
+                    raise error
+                wake_ups = [] if deadline is None else [deadline]
+                if pending:
+                    wake_ups.append(next_attempt)
+                ready = selector.select(max(min(wake_ups) - now, 0) if wake_ups else None)
+                for key, _ in ready:
+                    sock = key.fileobj  # type: ignore[assignment]
+                    selector.unregister(sock)
+                    code = sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if code == 0:
+                        sock.setblocking(True)
+                        return sock
+                    sock.close()
+                    error = OSError(code, os.strerror(code))
+                    # don't wait with the next address, when this one failed
+                    next_attempt = time.monotonic()
+                if not ready and deadline is not None and time.monotonic() >= deadline:
+                    raise socket.timeout("timed out")
+        finally:
+            for key in list(selector.get_map().values()):
+                key.fileobj.close()  # type: ignore[union-attr]
 
 
 class TCPExecutor(Executor):
@@ -28,20 +142,43 @@ class TCPExecutor(Executor):
 
     Used to start (and wait to actually be running) processes that can accept
     TCP connections.
+
+    With port 0, the port is not known upfront. If the command contains
+    ``{port}``, free port gets reserved and put there on every start.
+    Otherwise, the process picks the port itself, and it's found in the
+    process output (``port_banner``) or among the ports listened on by the
+    process and its subprocesses (Linux only). Either way, ``port`` is set
+    until the executor stops.
     """
 
+    PORT_PLACEHOLDER = "{port}"
+    """Replaced with reserved port in the command, when port is 0."""
+
     def __init__(
         self,
         command: Union[str, List[str], Tuple[str, ...]],
         host: str,
         port: int,
+        connect_timeout: Optional[float] = None,
+        passive: bool = False,
+        port_banner: Optional[str] = None,
         **kwargs: Any,
     ) -> None:
         """Initialize TCPExecutor executor.
 
         :param (str, list) command: command to be run by the subprocess
         :param str host: host under which process is accessible
-        :param int port: port under which process is accessible
+        :param int port: port under which process is accessible, 0 to
+            reserve free port or find the port process listens on
+        :param float connect_timeout: maximum number of seconds a single check
+            waits for the connection, by default the time left until timeout
+        :param bool passive: look for the socket listening on the port of
+            the host's addresses (or all addresses), instead of connecting to
+            it (only on Linux, and only for processes running on the local host)
+        :param str port_banner: regular expression matching the output line
+            the process prints its port in, as ``port`` group (or the first
+            one). Used with port 0, the output must be piped, and the lines
+            read to find the port are not available afterwards.
         :param bool shell: same as the `subprocess.Popen` shell definition
         :param int timeout: number of seconds to wait for the process to start
             or stop. If None or False, wait indefinitely.
@@ -57,6 +194,144 @@ class TCPExecutor(Executor):
         """Host name, process is listening on."""
         self.port = port
         """Port number, process is listening on."""
+        self.connect_timeout = connect_timeout
+        """Maximum number of seconds a single check waits for the connection."""
+        self.passive = passive
+        """Whether checks look for the listening socket instead of connecting."""
+        self.listening_pid: Optional[int] = None
+        """PID of the process found listening on the port by the passive check."""
+        self._addresses: Optional[List[AddressInfo]] = None
+        self._dynamic_port = port == 0
+        self._port_banner = re.compile(port_banner) if port_banner is not None else None
+        self._port_reader: Optional[Tuple[IO[Any], OutputReader]] = None
+        self._reservation: Optional[PortReservation] = None
+        self._command_template = (self.command, self.command_parts)
+
+    def _templated(self) -> bool:
+        """Check if the command has a placeholder for the port."""
+        command, parts = self._command_template
+        return self.PORT_PLACEHOLDER in command or any(
+            self.PORT_PLACEHOLDER in part for part in parts
+        )
+
+    def _set_port(self, port: int) -> None:
+        """Use given port for the checks."""
+        self.port = port
+        self._addresses = None
+
+    def start(self: TCPExecutorType) -> TCPExecutorType:
+        """Start the process, reserving port for it first, if needed.
+
+        :returns: itself
+        :rtype: TCPExecutor
+        """
+        if self.process is None and self._dynamic_port and self._templated():
+            self._reservation = reserve_port(self.host)
+            port = str(self._reservation.port)
+            command, parts = self._command_template
+            self.command = command.replace(self.PORT_PLACEHOLDER, port)
+            self.command_parts = [part.replace(self.PORT_PLACEHOLDER, port) for part in parts]
+            self._set_port(self._reservation.port)
+        try:
+            return super().start()
+        except BaseException:
+            self._release_port()
+            raise
+
+    def _find_port(self) -> bool:
+        """Find port the process listens on, when it's not known yet.
+
+        :return: whether the port is known
+        """
+        if self.port:
+            return True
+        port = self._port_from_output() if self._port_banner else self._port_from_sockets()
+        if port:
+            self._set_port(port)
+        return bool(port)
+
+    def _port_from_output(self) -> Optional[int]:
+        """Read the port from the process output, without waiting for it."""
+        assert self._port_banner is not None
+        output = self.process.stdout if self.process is not None else None
+        if output is None:
+            return None
+        if self._port_reader is None or self._port_reader[0] is not output:
+            self._close_port_reader()
+            self._port_reader = (output, OutputReader([output]))
+        reader = self._port_reader[1]
+        for fd, chunk in reader.read_chunks(0):
+            for line in reader.split_lines(fd, chunk):
+                match = self._port_banner.search(reader.decode(fd, line))
+                if match:
+                    self._close_port_reader()
+                    group = "port" if "port" in self._port_banner.groupindex else 1
+                    return int(match.group(group))
+        return None
+
+    def _port_from_sockets(self) -> Optional[int]:
+        """Find the lowest port listened on by the process or its subprocesses."""
+        if self.process is None:
+            return None
+        pids = process_descendants(self.process.pid)
+        if pids is None:
+            pids = processes_with_env(ENV_UUID, self._uuid)
+        ports = listening_tcp_ports({self.process.pid, *pids})
+        return min(ports) if ports else None
+
+    def _close_port_reader(self) -> None:
+        """Stop reading the output for the port."""
+        if self._port_reader is not None:
+            self._port_reader[1].close()
+            self._port_reader = None
+
+    def _release_port(self) -> None:
+        """Forget the port found or reserved for the process."""
+        self._close_port_reader()
+        if self._reservation is not None:
+            self._reservation.release()
+            self._reservation = None
+        if self._dynamic_port:
+            self.command, self.command_parts = self._command_template
+            self._set_port(0)
+
+    def _resolve(self) -> List[AddressInfo]:
+        """Resolve the host, only once.
+
+        :raises: OSError when the host can't be resolved
+        """
+        if self._addresses is None:
+            self._addresses = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)
+        return self._addresses
+
+    def _host_addresses(self) -> Optional[Set[str]]:
+        """Return IP addresses of the host, None if it can't be resolved."""
+        try:
+            return {str(address[4][0]) for address in self._resolve()}
+        except OSError:
+            return None
+
+    def _connect(self) -> socket.socket:
+        """Connect to the process.
+
+        Host gets resolved only once, connection attempts to all of its
+        addresses are raced and never take longer than the time left until
+        the timeout (or ``connect_timeout``). Before the process gets started,
+        they never take longer than the whole timeout.
+
+        :raises: OSError when the connection couldn't be established
+        :rtype: socket.socket
+        """
+        addresses = self._resolve()
+        timeout = self._remaining_time()
+        if timeout is None:
+            # not started yet
+            timeout = self._timeout
+        if self.connect_timeout is not None:
+            timeout = (
+                self.connect_timeout if timeout is None else min(timeout, self.connect_timeout)
+            )
+        return connect(addresses, timeout)
 
     def pre_start_check(self) -> bool:
         """Check if process accepts connections.
@@ -64,17 +339,33 @@ class TCPExecutor(Executor):
         .. note::
 
             Process will be considered started, when it'll be able to accept
-            TCP connections as defined in initializer.
+            TCP connections as defined in initializer. Process without the
+            port known before start is never considered running.
         """
+        if not self.port:
+            return False
+        inodes = listening_tcp_inodes(self.port, self._host_addresses()) if self.passive else None
+        if inodes is not None:
+            owners = socket_owners(inodes) if inodes else set()
+            self.listening_pid = min(owners) if owners else None
+            return bool(inodes)
+        return self._connect_check()
+
+    def _listener(self) -> Optional[int]:
+        """Find the process listening on the port."""
+        inodes = listening_tcp_inodes(self.port, self._host_addresses()) if self.port else None
+        owners = socket_owners(inodes) if inodes else set()
+        return min(owners) if owners else None
+
+    def _connect_check(self) -> bool:
+        """Check if process accepts connections by connecting to it."""
         try:
-            sock = socket.socket()
-            sock.connect((self.host, self.port))
-            return True
-        except (socket.error, socket.timeout):
+            sock = self._connect()
+        except OSError:
             return False
-        finally:
-            # close socket manually for sake of PyPy
-            sock.close()
+        # close socket manually for sake of PyPy
+        sock.close()
+        return True
 
     def after_start_check(self) -> bool:
         """Check if process accepts connections.
@@ -82,6 +373,28 @@ class TCPExecutor(Executor):
         .. note::
 
             Process will be considered started, when it'll be able to accept
-            TCP connections as defined in initializer.
+            TCP connections as defined in initializer. Passive check requires
+            the listening socket to belong to the executor's processes.
         """
-        return self.pre_start_check()  # we can reuse logic from `pre_start()`
+        if not self._find_port():
+            return False
+        inodes = listening_tcp_inodes(self.port, self._host_addresses()) if self.passive else None
+        if inodes is not None:
+            listening, self.listening_pid = executor_listener(self, inodes)
+            return listening
+        return self._connect_check()
+
+    def _endpoint(self) -> Dict[str, Any]:
+        """Return the port the process listens on."""
+        return {"port": self.port}
+
+    def _use_endpoint(self, endpoint: Dict[str, Any]) -> None:
+        """Use the port the process listens on."""
+        if endpoint.get("port") and endpoint["port"] != self.port:
+            self._set_port(endpoint["port"])
+
+    def _clear_process(self) -> None:
+        """Forget resolved addresses and dynamic port along with the process."""
+        self._addresses = None
+        self._release_port()
+        super()._clear_process()
@@ -18,9 +18,10 @@
 """TCP Socket executor definition."""
 import logging
 import socket
-from typing import Any, List, Tuple, Union
+from typing import Any, List, Optional, Tuple, Union
 
 from mirakuru import Executor
+from mirakuru.listening import executor_listener, listening_unix_inodes, socket_owners
 
 LOG = logging.getLogger(__name__)
 
@@ -36,12 +37,15 @@ class UnixSocketExecutor(Executor):
         self,
         command: Union[str, List[str], Tuple[str, ...]],
         socket_name: str,
+        passive: bool = False,
         **kwargs: Any,
     ) -> None:
         """Initialize UnixSocketExecutor executor.
 
         :param (str, list) command: command to be run by the subprocess
         :param str socket_name: unix socket path
+        :param bool passive: look for the socket listening on the path,
+            instead of connecting to it (only on Linux)
         :param bool shell: same as the `subprocess.Popen` shell definition
         :param int timeout: number of seconds to wait for the process to start
             or stop. If None or False, wait indefinitely.
@@ -53,6 +57,10 @@ class UnixSocketExecutor(Executor):
         """
         super().__init__(command, **kwargs)
         self.socket = socket_name
+        self.passive = passive
+        """Whether checks look for the listening socket instead of connecting."""
+        self.listening_pid: Optional[int] = None
+        """PID of the process found listening on the socket by the passive check."""
 
     def pre_start_check(self) -> bool:
         """Check if process accepts connections.
@@ -62,6 +70,21 @@ class UnixSocketExecutor(Executor):
             Process will be considered started, when it'll be able to accept
             Unix Socket connections as defined in initializer.
         """
+        inodes = listening_unix_inodes(self.socket) if self.passive else None
+        if inodes is not None:
+            owners = socket_owners(inodes) if inodes else set()
+            self.listening_pid = min(owners) if owners else None
+            return bool(inodes)
+        return self._connect_check()
+
+    def _listener(self) -> Optional[int]:
+        """Find the process listening on the socket."""
+        inodes = listening_unix_inodes(self.socket)
+        owners = socket_owners(inodes) if inodes else set()
+        return min(owners) if owners else None
+
+    def _connect_check(self) -> bool:
+        """Check if process accepts connections by connecting to it."""
         exec_sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
         try:
             exec_sock.connect(self.socket)
@@ -79,6 +102,11 @@ class UnixSocketExecutor(Executor):
         .. note::
 
             Process will be considered started, when it'll be able to accept
-            Unix Socket connections as defined in initializer.
+            Unix Socket connections as defined in initializer. Passive check
+            requires the listening socket to belong to the executor's processes.
         """
-        return self.pre_start_check()  # we can reuse logic from `pre_start()`
+        inodes = listening_unix_inodes(self.socket) if self.passive else None
+        if inodes is not None:
+            listening, self.listening_pid = executor_listener(self, inodes)
+            return listening
+        return self._connect_check()
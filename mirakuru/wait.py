@@ -0,0 +1,139 @@
+# Copyright (C) 2026 by Clearcode <http://clearcode.cc>
+# and associates (see AUTHORS).
+
+# This file is part of mirakuru.
+
+# mirakuru is free software: you can redistribute it and/or modify
+# it under the terms of the GNU Lesser General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# mirakuru is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU Lesser General Public License for more details.
+
+# You should have received a copy of the GNU Lesser General Public License
+# along with mirakuru.  If not, see <http://www.gnu.org/licenses/>.
+"""Strategies deciding how executors wait between condition checks."""
+
+import itertools
+import random
+import selectors
+import time
+from typing import Iterator, Optional, Sequence
+
+
+class WaitStrategy:
+    """Base class for waiting strategies used by executors' ``wait_for``.
+
+    Strategy does not hold any per-wait state, so a single instance can be
+    shared between many executors (also running in different threads).
+    """
+
+    def intervals(self) -> Iterator[float]:
+        """Return an iterator of consecutive intervals to wait.
+
+        Should be overridden. A new iterator is requested for every
+        ``wait_for`` call.
+        """
+        raise NotImplementedError
+
+    def wait(self, interval: float, fds: Sequence[int]) -> None:
+        """Wait before the next check.
+
+        :param float interval: number of seconds to wait
+        :param list fds: file descriptors which become readable whenever
+            the awaited condition might have changed. Ignored by default.
+        """
+        time.sleep(interval)
+
+
+class FixedWait(WaitStrategy):
+    """Wait the same interval between each check.
+
+    This is the default, mirakuru's classic behaviour.
+    """
+
+    def __init__(self, interval: float = 0.1) -> None:
+        """Initialize FixedWait strategy.
+
+        :param float interval: number of seconds between checks
+        """
+        self.interval = interval
+
+    def intervals(self) -> Iterator[float]:
+        """Return the same interval indefinitely."""
+        return itertools.repeat(self.interval)
+
+
+class BackoffWait(WaitStrategy):
+    """Wait exponentially increasing intervals with a random jitter.
+
+    Starts checking often to catch fast services quickly and then backs off
+    so slowly starting services do not burn CPU on checks.
+    """
+
+    def __init__(
+        self,
+        initial: float = 0.005,
+        maximum: float = 1.0,
+        factor: float = 2.0,
+        jitter: float = 0.1,
+    ) -> None:
+        """Initialize BackoffWait strategy.
+
+        :param float initial: first interval to wait
+        :param float maximum: upper bound of the interval
+        :param float factor: how much the interval grows after each check
+        :param float jitter: fraction of the interval randomly added
+            or subtracted, so many executors do not check in lockstep
+        """
+        self.initial = initial
+        self.maximum = maximum
+        self.factor = factor
+        self.jitter = jitter
+
+    def intervals(self) -> Iterator[float]:
+        """Return growing intervals with jitter applied."""
+        interval = self.initial
+        while True:
+            spread = interval * self.jitter
+            yield max(interval + random.uniform(-spread, spread), 0)
+            interval = min(interval * self.factor, self.maximum)
+
+
+class EventWait(WaitStrategy):
+    """Block on file descriptors relevant for the awaited condition.
+
+    Whenever the executor provides file descriptors for the condition
+    (process output pipes, process file descriptor, inotify descriptor),
+    waiting ends as soon as one of them becomes readable. Intervals of the
+    fallback strategy are still used as an upper bound, since not every
+    condition can be observed through file descriptors (e.g. TCP port being
+    opened by the process).
+    """
+
+    def __init__(self, fallback: Optional[WaitStrategy] = None) -> None:
+        """Initialize EventWait strategy.
+
+        :param WaitStrategy fallback: strategy providing intervals used when
+            there are no file descriptors to wait on or none of them becomes
+            readable. Defaults to :class:`BackoffWait`.
+        """
+        self.fallback = fallback or BackoffWait(initial=0.01)
+
+    def intervals(self) -> Iterator[float]:
+        """Return intervals of the fallback strategy."""
+        return self.fallback.intervals()
+
+    def wait(self, interval: float, fds: Sequence[int]) -> None:
+        """Wait for any of the file descriptors, at most given interval."""
+        if not fds:
+            self.fallback.wait(interval, fds)
+            return
+        # not select.select, which can't handle descriptors above FD_SETSIZE
+        with selectors.DefaultSelector() as selector:
+            for fd in set(fds):
+                selector.register(fd, selectors.EVENT_READ)
+            selector.select(interval)
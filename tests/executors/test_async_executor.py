@@ -0,0 +1,172 @@
+"""Asyncio executors tests."""
+
+import asyncio
+import socket
+import sys
+import time
+
+import pytest
+
+from mirakuru import AlreadyRunning, HTTPExecutor, ProcessExitedWithError, TimeoutExpired
+from mirakuru.aio import (
+    AsyncHTTPExecutor,
+    AsyncOutputExecutor,
+    AsyncSimpleExecutor,
+    AsyncTCPExecutor,
+)
+from tests import HTTP_SERVER_CMD, SAMPLE_DAEMON_PATH, TEST_SERVER_PATH, ps_aux
+
+HOST = "127.0.0.1"
+PORT = 7988
+
+HTTP_NORMAL_CMD = f"{HTTP_SERVER_CMD} {PORT}"
+
+
+def test_simple_executor_start_stop() -> None:
+    """AsyncSimpleExecutor should start and stop the process."""
+
+    async def run() -> None:
+        executor = AsyncSimpleExecutor("sleep 300")
+        await executor.start()
+        assert executor.running() is True
+        await executor.stop()
+        assert executor.running() is False
+
+        async with executor:
+            assert executor.running() is True
+        assert executor.running() is False
+
+    asyncio.run(run())
+
+
+def test_simple_executor_kills_daemon() -> None:
+    """Killing should also kill processes that left the process group."""
+
+    async def run() -> None:
+        executor = AsyncSimpleExecutor(("python", SAMPLE_DAEMON_PATH), shell=True)
+        await executor.start()
+        await asyncio.sleep(2)
+        assert SAMPLE_DAEMON_PATH in ps_aux()
+        await executor.kill()
+
+    asyncio.run(run())
+    assert SAMPLE_DAEMON_PATH not in ps_aux()
+
+
+def test_tcp_executor() -> None:
+    """AsyncTCPExecutor should wait for the port and refuse to double start."""
+
+    async def run() -> None:
+        command = f'bash -c "sleep 1 && {HTTP_NORMAL_CMD}"'
+        async with AsyncTCPExecutor(command, host=HOST, port=PORT, timeout=20) as executor:
+            assert executor.running() is True
+            socket.create_connection((HOST, PORT)).close()
+
+            with pytest.raises(AlreadyRunning):
+                await AsyncTCPExecutor(HTTP_NORMAL_CMD, host=HOST, port=PORT).start()
+
+    asyncio.run(run())
+
+
+def test_tcp_executor_process_exited() -> None:
+    """AsyncTCPExecutor should notice process exiting with an error right away."""
+
+    async def run() -> None:
+        executor = AsyncTCPExecutor("false", host=HOST, port=PORT, sleep=5, timeout=20)
+        started = time.monotonic()
+        with pytest.raises(ProcessExitedWithError):
+            await executor.start()
+        assert time.monotonic() - started < 3
+
+    asyncio.run(run())
+
+
+@pytest.mark.parametrize("method", ("HEAD", "GET", "POST"))
+def test_http_executor_slow_server(method: str) -> None:
+    """AsyncHTTPExecutor should wait for the expected status."""
+    command = f"{sys.executable} {TEST_SERVER_PATH} {HOST}:{PORT} False {method}"
+
+    async def run() -> None:
+        async with AsyncHTTPExecutor(
+            command, f"http://{HOST}:{PORT}/", method=method, timeout=30
+        ) as executor:
+            assert executor.running() is True
+
+    asyncio.run(run())
+
+
+def test_http_executor_request() -> None:
+    """AsyncHTTPExecutor should send the same request as HTTPExecutor, closing the connection."""
+    url = "http://user:secret@[::1]:8000/path"
+    request = AsyncHTTPExecutor(HTTP_NORMAL_CMD, url)._request  # pylint:disable=protected-access
+    assert b"Host: [::1]:8000\r\n" in request
+    assert b"secret" not in request
+    expected = HTTPExecutor(HTTP_NORMAL_CMD, url)._request  # pylint:disable=protected-access
+    assert request == expected.replace(b"\r\n\r\n", b"\r\nConnection: close\r\n\r\n")
+
+
+def test_http_executor_timeout() -> None:
+    """AsyncHTTPExecutor should time out and kill the process."""
+
+    async def run() -> None:
+        executor = AsyncHTTPExecutor(
+            HTTP_NORMAL_CMD, f"http://{HOST}:{PORT}/", status=500, timeout=2
+        )
+        with pytest.raises(TimeoutExpired):
+            await executor.start()
+        assert executor.running() is False
+
+    asyncio.run(run())
+
+
+def test_output_executor() -> None:
+    """AsyncOutputExecutor should start as soon as the banner shows up."""
+
+    async def run() -> None:
+        command = 'bash -c "sleep 1 && echo foo >&2 && sleep 100"'
+        executor = AsyncOutputExecutor(command, "foo", stderr=-1, timeout=10)
+        started = time.monotonic()
+        async with executor:
+            assert executor.running() is True
+            assert time.monotonic() - started < 3
+
+    asyncio.run(run())
+
+
+def test_output_executor_long_line() -> None:
+    """AsyncOutputExecutor should read lines longer than the stream buffer limit."""
+
+    async def run() -> None:
+        command = f"{sys.executable} -c \"print('x' * 200000); print('foo', flush=True); input()\""
+        async with AsyncOutputExecutor(command, "foo", timeout=10) as executor:
+            assert executor.running() is True
+
+    asyncio.run(run())
+
+
+def test_output_executor_closed_output() -> None:
+    """AsyncOutputExecutor should fail right away when output gets closed."""
+
+    async def run() -> None:
+        executor = AsyncOutputExecutor('bash -c "exec >&-; sleep 100"', "foo", timeout=20)
+        started = time.monotonic()
+        with pytest.raises(TimeoutExpired):
+            await executor.start()
+        assert executor.running() is False
+        assert time.monotonic() - started < 3
+
+    asyncio.run(run())
+
+
+def test_many_executors_concurrently() -> None:
+    """Many executors should start concurrently in a single thread."""
+
+    async def run() -> None:
+        command = 'bash -c "sleep 1 && echo ready && sleep 100"'
+        executors = [AsyncOutputExecutor(command, "ready", timeout=10) for _ in range(20)]
+        started = time.monotonic()
+        await asyncio.gather(*(executor.start() for executor in executors))
+        assert time.monotonic() - started < 5
+        await asyncio.gather(*(executor.stop() for executor in executors))
+
+    asyncio.run(run())
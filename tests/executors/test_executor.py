@@ -1,8 +1,10 @@
 # mypy: no-strict-optional
 """Test basic executor functionality."""
 import gc
+import os
 import shlex
 import signal
+import time
 import uuid
 from subprocess import check_output
 from typing import List, Union
@@ -13,6 +15,7 @@ import pytest
 from mirakuru import Executor
 from mirakuru.base import SimpleExecutor
 from mirakuru.exceptions import ProcessExitedWithError, TimeoutExpired
+from mirakuru.wait import EventWait, FixedWait
 from tests import SAMPLE_DAEMON_PATH, ps_aux
 from tests.retry import retry
 
@@ -33,6 +36,19 @@ def test_running_process(command: Union[str, List[str]]) -> None:
     assert SLEEP_300 in str(executor)
 
 
+def test_process_in_new_session() -> None:
+    """Process should lead its own session, started without preexec_fn."""
+    executor = SimpleExecutor(SLEEP_300, envvars={"MIRAKURU_TEST": "1"})
+    assert "preexec_fn" not in executor._popen_kwargs
+    with executor:
+        assert os.getsid(executor.process.pid) == executor.process.pid
+        env = executor._popen_kwargs["env"]
+        assert env["MIRAKURU_TEST"] == "1"
+    # environment is built only once
+    with executor:
+        assert executor._popen_kwargs["env"] is env
+
+
 @pytest.mark.parametrize("command", (SLEEP_300, SLEEP_300.split()))
 def test_command(command: Union[str, List[str]]) -> None:
     """Check that the command and command parts are equivalent."""
@@ -137,6 +153,13 @@ def test_start_check_executor() -> None:
         executor.after_start_check()
 
 
+def test_executor_positional_arguments() -> None:
+    """Executor should take the same positional arguments as SimpleExecutor."""
+    executor = Executor(SLEEP_300, "/tmp")
+    assert executor._cwd == "/tmp"  # pylint:disable=protected-access
+    assert executor.adopt is False
+
+
 def test_stopping_not_yet_running_executor() -> None:
     """Test if SimpleExecutor can be stopped even it was never running.
 
@@ -202,6 +225,34 @@ def test_executor_raises_if_process_exits_with_error() -> None:
     assert failing_executor.pre_start_check.called is True
 
 
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd support")
+def test_stop_blocks_on_process_exit() -> None:
+    """Test that stopping does not wait for the next poll tick."""
+    executor = SimpleExecutor(SLEEP_300, sleep=5)
+    executor.start()
+    stopping = time.monotonic()
+    executor.stop()
+    assert time.monotonic() - stopping < 2
+    assert executor.running() is False
+
+
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="requires pidfd support")
+def test_executor_notices_exit_immediately() -> None:
+    """Test that event-driven wait notices the process exit immediately."""
+    executor = Executor(
+        ["bash", "-c", "sleep 0.5 && exit 3"],
+        timeout=10,
+        wait_strategy=EventWait(FixedWait(5)),
+    )
+    executor.pre_start_check = mock.Mock(return_value=False)  # type: ignore
+    executor.after_start_check = mock.Mock(return_value=False)  # type: ignore
+
+    starting = time.monotonic()
+    with pytest.raises(ProcessExitedWithError):
+        executor.start()
+    assert time.monotonic() - starting < 3
+
+
 def test_executor_ignores_processes_exiting_with_0() -> None:
     """Test process exit detection.
 
@@ -11,9 +11,12 @@ from unittest.mock import patch
 import pytest
 
 from mirakuru import HTTPExecutor, SimpleExecutor
+from mirakuru.base import LIVE_EXECUTORS, kill_executors
+from mirakuru.base_env import processes_env_values, processes_with_env
 from mirakuru.compat import SIGKILL
 from mirakuru.exceptions import ProcessFinishedWithError
 from tests import SAMPLE_DAEMON_PATH, TEST_SERVER_PATH, ps_aux
+from tests.retry import retry
 
 SLEEP_300 = "sleep 300"
 
@@ -72,6 +75,93 @@ def test_daemons_killing() -> None:
     assert SAMPLE_DAEMON_PATH not in ps_aux()
 
 
+def test_daemons_killing_tree_discovery() -> None:
+    """Test if daemons are found by tree discovery falling back to the scan."""
+    executor = SimpleExecutor(("python", SAMPLE_DAEMON_PATH), shell=True, discovery="tree")
+    executor.start()
+    time.sleep(2)
+    assert executor.running() is not True
+
+    assert SAMPLE_DAEMON_PATH in ps_aux()
+    executor.kill()
+    assert SAMPLE_DAEMON_PATH not in ps_aux()
+
+
+@pytest.mark.parametrize("method", ("stop", "kill"))
+def test_tree_discovery_kills_subprocesses(method: str) -> None:
+    """Test if tree discovery kills subprocesses without scanning all processes."""
+    executor = SimpleExecutor(
+        "sleep 300 && true", shell=True, stop_signal=signal.SIGKILL, discovery="tree"
+    )
+    executor.start()
+    time.sleep(1)  # let the shell start its subprocess
+    kids = executor._find_kids()
+    assert kids is not None
+    assert len(kids) == 2
+
+    with patch("mirakuru.base.processes_with_env", wraps=processes_with_env) as mocked:
+        getattr(executor, method)()
+    assert mocked.call_args.args[2] == kids
+    assert executor.running() is False
+
+
+def test_unknown_discovery() -> None:
+    """Check that unknown discovery mode is rejected."""
+    with pytest.raises(ValueError):
+        SimpleExecutor(SLEEP_300, discovery="unknown")
+
+
+def test_kill_executors() -> None:
+    """Test if many executors are killed with a single processes scan."""
+    executors = [SimpleExecutor("sleep 300 && true", shell=True).start() for _ in range(3)]
+    time.sleep(1)  # let the shells start their subprocesses
+    pids = set().union(*(processes_with_env("mirakuru_uuid", ex._uuid) for ex in executors))
+    assert len(pids) == 6
+    assert set(executors) <= set(LIVE_EXECUTORS)
+
+    with patch("mirakuru.base.processes_env_values", wraps=processes_env_values) as mocked:
+        # most of them are already killed with their process groups
+        assert kill_executors(executors) <= pids
+    mocked.assert_called_once()
+
+    for executor in executors:
+        assert executor.running() is False
+        assert executor not in LIVE_EXECUTORS
+
+    def no_leftovers() -> None:
+        # killed processes might need a moment to exit
+        assert not processes_with_env("mirakuru_uuid", str(os.getpid()))
+
+    retry(no_leftovers, timeout=5, possible_exception=AssertionError)
+
+
+def test_restart_after_detach() -> None:
+    """Process started after detaching should get new marker, and its children killed."""
+    executor = SimpleExecutor("sleep 300 && true", shell=True).start()
+    detached = executor._uuid
+    time.sleep(1)  # let the shell start its subprocess
+    detached_pids = processes_with_env("mirakuru_uuid", detached)
+    assert len(detached_pids) == 2
+    executor.detach()
+
+    executor.start()
+    time.sleep(1)
+    assert executor._uuid != detached
+    pids = processes_with_env("mirakuru_uuid", executor._uuid)
+    assert executor.process.pid in pids
+    assert len(pids) == 2
+    executor.kill()
+
+    def no_leftovers() -> None:
+        assert not processes_with_env("mirakuru_uuid", executor._uuid)
+
+    retry(no_leftovers, timeout=5, possible_exception=AssertionError)
+    # detached process is left running
+    assert processes_with_env("mirakuru_uuid", detached) == detached_pids
+    for pid in detached_pids:
+        os.kill(pid, SIGKILL)
+
+
 def test_stopping_brutally() -> None:
     """Test if SimpleExecutor is stopping insubordinate process.
 
@@ -2,8 +2,11 @@
 
 import socket
 import sys
+import threading
+import time
 from functools import partial
 from http.client import OK, HTTPConnection
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from typing import Any, Dict, Union
 from unittest.mock import patch
 
@@ -160,6 +163,16 @@ def test_default_port() -> None:
     executor.stop()
 
 
+def test_reserved_port() -> None:
+    """URL with port 0 should be requested on the port reserved for the process."""
+    executor = HTTPExecutor(f"{HTTP_SERVER_CMD} {{port}}", f"http://{HOST}:0/", timeout=10)
+    with executor:
+        assert executor.port != 0
+        assert executor.url.port == executor.port
+        assert executor.after_start_check() is True
+    assert executor.url.port == 0
+
+
 @pytest.mark.parametrize(
     "accepted_status, expected_timeout",
     (
@@ -197,3 +210,57 @@ def test_http_status_codes(accepted_status: Union[None, int, str], expected_time
         with pytest.raises(TimeoutExpired):
             executor.start()
             executor.stop()
+
+
+def test_checks_reuse_connection() -> None:
+    """Checks should be sent over a single keep-alive connection."""
+    connections = []
+    requests = []
+
+    class KeepAliveHandler(BaseHTTPRequestHandler):
+        """Responds with 503 to the first requests, keeping the connection."""
+
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            connections.append(self.client_address)
+            super().setup()
+
+        def do_HEAD(self) -> None:  # pylint:disable=invalid-name
+            requests.append(self.headers["Host"])
+            self.send_response(200 if len(requests) > 3 else 503)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args: Any) -> None:
+            pass
+
+    server = ThreadingHTTPServer((HOST, PORT), KeepAliveHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        executor = HTTPExecutor("sleep 100", f"http://{HOST}:{PORT}/", timeout=10, sleep=0.01)
+        # the server is already running, only the checks after start matter
+        executor.pre_start_check = lambda: False  # type: ignore[method-assign]
+        with executor:
+            assert len(requests) == 4
+            assert requests[0] == f"{HOST}:{PORT}"
+            assert len(connections) == 1
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_check_does_not_exceed_timeout() -> None:
+    """Server not responding at all should not block the check past the timeout."""
+    with socket.socket() as listening:
+        listening.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        listening.bind((HOST, PORT))
+        # connections get queued, but nothing is ever sent back
+        listening.listen()
+        executor = HTTPExecutor("sleep 100", f"http://{HOST}:{PORT}/", timeout=1)
+        executor.pre_start_check = lambda: False  # type: ignore[method-assign]
+        started = time.monotonic()
+        with pytest.raises(TimeoutExpired):
+            executor.start()
+        assert time.monotonic() - started < 3
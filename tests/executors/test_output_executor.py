@@ -1,11 +1,15 @@
 # mypy: no-strict-optional
 """Output executor test."""
+import re
 import subprocess
+import sys
+import time
+from typing import Any, List
 
 import pytest
 
 from mirakuru import OutputExecutor
-from mirakuru.exceptions import TimeoutExpired
+from mirakuru.exceptions import ProcessFailedToStart, TimeoutExpired
 
 
 def test_executor_waits_for_process_output() -> None:
@@ -48,3 +52,137 @@ def test_executor_dont_start() -> None:
         executor.start()
 
     assert executor.running() is False
+
+
+def test_executor_drains_output() -> None:
+    """Chatty process should not block on output, recent lines are kept."""
+    # way more than fits in a pipe buffer
+    command = 'bash -c "echo foo; for i in $(seq 100000); do echo line $i; done; sleep 100"'
+    seen: List[str] = []
+    executor = OutputExecutor(command, "foo", timeout=10, buffer_lines=10, on_line=seen.append)
+    with executor:
+        deadline = time.monotonic() + 10
+        while executor.recent_lines(1) != ["line 100000\n"] and time.monotonic() < deadline:
+            time.sleep(0.1)
+        assert executor.recent_lines() == [f"line {i}\n" for i in range(99991, 100001)]
+        assert executor.recent_lines(2) == ["line 99999\n", "line 100000\n"]
+    assert seen[0] == "foo\n"
+    assert len(seen) == 100001
+
+
+def test_executor_lines_iterator() -> None:
+    """Lines should be iterated as they come until output gets closed."""
+    command = 'bash -c "echo foo; sleep 0.5; echo bar; echo baz"'
+    executor = OutputExecutor(command, "foo", timeout=10, buffer_lines=10)
+    executor.start()
+    assert list(executor.lines(timeout=5)) == ["foo\n", "bar\n", "baz\n"]
+    executor.stop()
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc is available only on Linux")
+def test_executor_stops_reading_held_output() -> None:
+    """Reading thread should stop with the process, even if others hold the output."""
+    executor = OutputExecutor('bash -c "echo foo; sleep 100"', "foo", timeout=10, buffer_lines=10)
+    executor.start()
+    reader = executor._reader  # pylint:disable=protected-access
+    # the test keeps the write end of the output open
+    with open(f"/proc/{executor.process.pid}/fd/1", "wb"):
+        started = time.monotonic()
+        executor.stop()
+        assert time.monotonic() - started < 0.5
+    assert reader is not None and not reader.is_alive()
+
+
+def test_executor_reads_all_available_output() -> None:
+    """Lots of output before the banner should be read at once, not line by line."""
+    command = 'bash -c "seq 5000; echo foo; echo bar; sleep 100"'
+    executor = OutputExecutor(command, "foo", timeout=10, sleep=1)
+    started = time.monotonic()
+    executor.start()
+    assert time.monotonic() - started < 2
+    # lines read ahead of the banner are still there
+    assert executor.output().readline() == "bar\n"
+    executor.stop()
+
+
+def test_executor_banner_in_partial_line() -> None:
+    """Banner split between writes should still be found."""
+    command = 'bash -c "printf fo; sleep 1; echo o; sleep 100"'
+    with OutputExecutor(command, "foo", timeout=10) as executor:
+        assert executor.running() is True
+
+
+def test_executor_bytes_banner_search() -> None:
+    """Bytes banner should be searched for anywhere in the output."""
+    command = 'bash -c "echo some foo; echo bar; sleep 100"'
+    executor = OutputExecutor(command, b"foo", timeout=10).start()
+    assert executor.running() is True
+    assert executor.output().readline() == "\n"
+    assert executor.output().readline() == "bar\n"
+    executor.stop()
+
+
+def test_executor_bytes_banner_multiline() -> None:
+    """Bytes banner can span many lines and many writes."""
+    command = 'bash -c "echo foo; sleep 0.5; echo -n ba; sleep 0.5; echo r; sleep 100"'
+    banner = re.compile(rb"^foo\nbar$", re.MULTILINE)
+    with OutputExecutor(command, banner, timeout=10) as executor:
+        assert executor.running() is True
+
+
+def test_executor_bytes_banner_window() -> None:
+    """Banner longer than the window can't be found."""
+    command = 'bash -c "echo foo; sleep 0.5; echo bar; sleep 100"'
+    executor = OutputExecutor(command, rb"foo\nbar", timeout=2, banner_window=2)
+    with pytest.raises(TimeoutExpired):
+        executor.start()
+
+
+@pytest.mark.parametrize(
+    "banners",
+    (["listening", "ready"], {"ready", "listening"}, [b"listening", rb"ready\n"]),
+)
+def test_executor_many_banners(banners: Any) -> None:
+    """Executor should start once all banners have appeared."""
+    command = 'bash -c "echo listening; sleep 1; echo ready; sleep 100"'
+    executor = OutputExecutor(command, banners, timeout=10)
+    started = time.monotonic()
+    with executor:
+        assert time.monotonic() - started >= 1
+
+
+@pytest.mark.parametrize(
+    "banners",
+    (["ready", "ready for connections"], {"listening", "listening on 5432"}),
+)
+def test_executor_overlapping_banners(banners: Any) -> None:
+    """Banner should be noticed even if other one matches the same line first."""
+    command = 'bash -c "echo ready; echo listening on 5432; echo ready for connections; sleep 100"'
+    with OutputExecutor(command, banners, timeout=3) as executor:
+        assert executor.running() is True
+
+
+def test_executor_ordered_banners() -> None:
+    """Banners given as a list have to appear in order."""
+    command = 'bash -c "echo ready; echo listening; sleep 100"'
+    executor = OutputExecutor(command, ["listening", "ready"], timeout=2)
+    with pytest.raises(TimeoutExpired):
+        executor.start()
+
+
+def test_executor_failure_banner() -> None:
+    """Failure banner should abort start right away."""
+    command = 'bash -c "echo FATAL: address already in use; sleep 100"'
+    executor = OutputExecutor(command, "ready", failure_banner="FATAL", timeout=20)
+    started = time.monotonic()
+    with pytest.raises(ProcessFailedToStart) as exc:
+        executor.start()
+    assert time.monotonic() - started < 3
+    assert executor.running() is False
+    assert "'FATAL' found in output" in str(exc.value)
+
+
+def test_executor_mixed_banners() -> None:
+    """Text and bytes banners can't be mixed."""
+    with pytest.raises(TypeError):
+        OutputExecutor("echo", ["foo", b"bar"])
@@ -1,11 +1,14 @@
 """PidExecutor tests."""
 
 import os
+import subprocess
+import time
 from typing import Iterator, Optional
 
 import pytest
 
 from mirakuru import AlreadyRunning, PidExecutor, TimeoutExpired
+from mirakuru.inotify import LIBC
 
 FILENAME = f"pid-test-tmp{os.getpid()}"
 SLEEP = f'bash -c "sleep 1 && touch {FILENAME} && sleep 1"'
@@ -78,3 +81,35 @@ def test_fail_if_other_executor_running() -> None:
 
         with pytest.raises(AlreadyRunning):
             executor2.start()
+
+
+@pytest.mark.skipif(LIBC is None, reason="inotify is not available")
+def test_file_noticed_right_away() -> None:
+    """Start should finish as soon as the file appears, not on the next check."""
+    process = f'bash -c "sleep 1 && touch {FILENAME} && sleep 10"'
+    executor = PidExecutor(process, FILENAME, sleep=5, timeout=10)
+    started = time.monotonic()
+    with executor:
+        assert time.monotonic() - started < 3
+
+
+def test_check_pid() -> None:
+    """File should count only once it contains PID of the executor's process."""
+    process = f"bash -c 'echo 1 > {FILENAME}; sleep 1; echo $$ > {FILENAME}; sleep 10'"
+    executor = PidExecutor(process, FILENAME, check_pid=True, timeout=10)
+    started = time.monotonic()
+    with executor:
+        assert time.monotonic() - started >= 1
+        assert executor.process is not None
+        with open(FILENAME, encoding="utf-8") as pid_file:
+            assert int(pid_file.read()) == executor.process.pid
+
+
+def test_check_pid_stale_file() -> None:
+    """File left by a process that's gone should not count as running."""
+    with subprocess.Popen(["true"]) as finished:
+        finished.wait()
+    with open(FILENAME, "w", encoding="utf-8") as pid_file:
+        pid_file.write(f"{finished.pid}\n")
+    assert PidExecutor(SLEEP, FILENAME).pre_start_check() is True
+    assert PidExecutor(SLEEP, FILENAME, check_pid=True).pre_start_check() is False
@@ -5,11 +5,20 @@ Some of these tests run ``nc``: when running Debian, make sure the
 """
 
 import logging
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Iterator, List, Tuple
 
 import pytest
 from _pytest.logging import LogCaptureFixture
+from _pytest.monkeypatch import MonkeyPatch
 
 from mirakuru import AlreadyRunning, TCPExecutor, TimeoutExpired
+from mirakuru.attached import pid_running
+from mirakuru.listening import listening_tcp_ports
+from mirakuru.tcp import connect
 from tests import HTTP_SERVER_CMD
 
 PORT = 7986
@@ -60,3 +69,188 @@ def test_fail_if_other_executor_running() -> None:
         with pytest.raises(AlreadyRunning):
             with executor2:
                 pass
+
+
+@pytest.fixture(name="blackhole")
+def blackhole_fixture() -> Iterator[Tuple[str, int]]:
+    """Listen on a port without accepting connections, so connecting hangs."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen(0)
+    address = server.getsockname()
+    # fill the backlog, next connections won't be established
+    client = socket.create_connection(address)
+    try:
+        yield address
+    finally:
+        client.close()
+        server.close()
+
+
+def test_check_does_not_exceed_timeout(blackhole: Tuple[str, int]) -> None:
+    """Hanging connection attempts should not make executor exceed its timeout."""
+    host, port = blackhole
+    executor = TCPExecutor("sleep 300", host=host, port=port, timeout=2)
+    started = time.monotonic()
+    with pytest.raises(TimeoutExpired):
+        executor.start()
+    # timeout is applied both to the pre start check and to the start
+    assert time.monotonic() - started < 5
+    assert executor.running() is False
+
+
+def test_connect_races_addresses(blackhole: Tuple[str, int]) -> None:
+    """Connection to the next address should be tried while the first one hangs."""
+    server = socket.socket()
+    server.bind(("127.0.0.1", 0))
+    server.listen()
+    addresses: List[Any] = [
+        (socket.AF_INET, socket.SOCK_STREAM, 0, "", blackhole),
+        (socket.AF_INET, socket.SOCK_STREAM, 0, "", server.getsockname()),
+    ]
+    started = time.monotonic()
+    with server, connect(addresses, timeout=5) as sock:
+        assert sock.getpeername() == server.getsockname()
+        assert sock.getblocking() is True
+    assert time.monotonic() - started < 1
+
+    with pytest.raises(socket.timeout):
+        connect(addresses[:1], timeout=0.5)
+
+
+def test_resolves_host_once(monkeypatch: MonkeyPatch) -> None:
+    """Host should get resolved only once for all the checks."""
+    calls = []
+    getaddrinfo = socket.getaddrinfo
+
+    def counting_getaddrinfo(*args: Any, **kwargs: Any) -> Any:
+        calls.append(args)
+        return getaddrinfo(*args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting_getaddrinfo)
+    executor = TCPExecutor(HTTP_SERVER, host="localhost", port=PORT, timeout=10)
+    with executor:
+        assert executor.after_start_check() is True
+    assert len(calls) == 1
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc is available only on Linux")
+def test_passive_check() -> None:
+    """Passive check should not connect to the process."""
+    # the server exits as soon as anybody connects to it
+    command = (
+        f'{sys.executable} -c "import socket, time; time.sleep(1); '
+        f"server = socket.create_server(('127.0.0.1', {PORT})); server.accept()\""
+    )
+    executor = TCPExecutor(command, host="127.0.0.1", port=PORT, passive=True, timeout=10)
+    with executor:
+        assert executor.process is not None
+        assert executor.listening_pid == executor.process.pid
+        time.sleep(0.5)
+        assert executor.running() is True
+
+        other = TCPExecutor(command, host="127.0.0.1", port=PORT, passive=True)
+        with pytest.raises(AlreadyRunning) as exc:
+            other.start()
+        assert f"Process {executor.process.pid} is listening" in str(exc.value)
+        assert executor.running() is True
+
+
+def test_reserved_port() -> None:
+    """Reserved port should be put in the command, and released on stop."""
+    executor = TCPExecutor(f"{HTTP_SERVER_CMD} {{port}}", host="localhost", port=0, timeout=10)
+    with executor:
+        assert executor.port != 0
+        assert executor.command.endswith(f" {executor.port}")
+        first = executor.port
+    assert executor.port == 0
+    assert executor.command.endswith(" {port}")
+    with executor:
+        assert executor.port not in (0, first)
+
+
+LISTEN_ANY_PORT = (
+    f'{sys.executable} -c "import socket, time; '
+    "server = socket.create_server(('127.0.0.1', 0)); "
+    "print('listening on', server.getsockname()[1], flush=True); time.sleep(300)\""
+)
+
+
+@pytest.mark.parametrize(
+    "port_banner",
+    (
+        # port found in the process' sockets
+        pytest.param(
+            None,
+            marks=pytest.mark.skipif(
+                not sys.platform.startswith("linux"), reason="/proc is available only on Linux"
+            ),
+        ),
+        r"listening on (?P<port>\d+)",
+    ),
+)
+def test_discovered_port(port_banner: str) -> None:
+    """Port picked by the process should be found in its sockets or its output."""
+    executor = TCPExecutor(
+        LISTEN_ANY_PORT, host="127.0.0.1", port=0, port_banner=port_banner, timeout=10
+    )
+    with executor:
+        assert executor.port != 0
+        assert executor.process is not None
+        assert executor.port in (listening_tcp_ports([executor.process.pid]) or ())
+    assert executor.port == 0
+
+
+def test_adopt_detached_process() -> None:
+    """Process left running by other executor should be adopted, and stopped."""
+    executor = TCPExecutor(HTTP_SERVER, host="localhost", port=PORT, timeout=10)
+    executor.start()
+    assert executor.process is not None
+    pid = executor.process.pid
+    executor.detach()
+    assert executor.running() is False
+
+    adopting = TCPExecutor(HTTP_SERVER, host="localhost", port=PORT, adopt=True, timeout=10)
+    with adopting:
+        assert adopting.process is not None
+        assert adopting.process.pid == pid
+        assert adopting.running() is True
+    assert pid_running(pid) is False
+
+
+DETACH_CODE = f"""
+from mirakuru import TCPExecutor
+executor = TCPExecutor("{HTTP_SERVER}", host="localhost", port={PORT}, timeout=10).start()
+print(executor.process.pid)
+executor.detach()
+"""
+
+
+def test_adopt_process_detached_by_other_interpreter() -> None:
+    """Process detached by an interpreter that has exited should be adopted."""
+    pid = int(subprocess.check_output([sys.executable, "-c", DETACH_CODE]))
+    assert pid_running(pid) is True
+
+    adopting = TCPExecutor(HTTP_SERVER, host="localhost", port=PORT, adopt=True, timeout=10)
+    with adopting:
+        assert adopting.process is not None
+        assert adopting.process.pid == pid
+    assert pid_running(pid) is False
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc is available only on Linux")
+def test_adopt_listening_process() -> None:
+    """Process listening on the port should be adopted, even if not started by an executor."""
+    with subprocess.Popen(HTTP_SERVER.split(), stdout=subprocess.DEVNULL) as process:
+        adopting = TCPExecutor(
+            f"{HTTP_SERVER} --other", host="localhost", port=PORT, adopt=True, timeout=10
+        )
+        for _ in range(100):
+            if adopting.pre_start_check():
+                break
+            time.sleep(0.1)
+        adopting.start()
+        assert adopting.process is not None
+        assert adopting.process.pid == process.pid
+        adopting.kill()
+        assert process.wait(5) != 0
@@ -38,3 +38,19 @@ def test_start_and_timeout(
         executor.start()
 
     assert executor.running() is False
+
+
+@pytest.mark.skipif(not sys.platform.startswith("linux"), reason="/proc is available only on Linux")
+def test_passive_check(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> None:
+    """Passive check should find the listening socket and its process."""
+    socker_path = tmp_path_factory.getbasetemp() / "mirakuru.sock"
+    socket_server_cmd = f"{sys.executable} {TEST_SOCKET_SERVER_PATH} {socker_path}"
+    executor = UnixSocketExecutor(
+        socket_server_cmd + " 2", socket_name=str(socker_path), passive=True, timeout=5
+    )
+    with executor:
+        assert executor.running() is True
+        assert executor.process is not None
+        assert executor.listening_pid == executor.process.pid
@@ -0,0 +1,91 @@
+# mypy: no-strict-optional
+"""Tests for finding processes by their environment."""
+
+import os
+import shutil
+import time
+from typing import Callable, Set
+
+import pytest
+
+from mirakuru import SimpleExecutor
+from mirakuru.base import ENV_UUID
+from mirakuru.base_env import (
+    _proc_children_index,
+    process_descendants,
+    processes_with_env_proc,
+    processes_with_env_ps,
+    processes_with_env_psutil,
+)
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+BACKENDS = (
+    pytest.param(
+        processes_with_env_proc,
+        marks=pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="requires /proc"),
+        id="proc",
+    ),
+    pytest.param(
+        processes_with_env_psutil,
+        marks=pytest.mark.skipif(psutil is None, reason="requires psutil"),
+        id="psutil",
+    ),
+    pytest.param(
+        processes_with_env_ps,
+        marks=pytest.mark.skipif(shutil.which("ps") is None, reason="requires ps"),
+        id="ps",
+    ),
+)
+
+
+@pytest.mark.parametrize("processes_with_env", BACKENDS)
+def test_processes_with_env(processes_with_env: Callable[[str, str], Set[int]]) -> None:
+    """Check if all backends find processes started by the executor."""
+    with SimpleExecutor("sleep 300") as executor:
+        assert processes_with_env(ENV_UUID, executor._uuid) == {executor.process.pid}
+        # value prefix, as used by cleanup_subprocesses
+        assert executor.process.pid in processes_with_env(ENV_UUID, str(os.getpid()))
+        assert not processes_with_env(ENV_UUID, "not-a-mirakuru-uuid")
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="requires /proc")
+def test_processes_with_env_proc_whole_entry() -> None:
+    """Check that only whole environment entries are matched."""
+    executor = SimpleExecutor("sleep 300", envvars={f"NOT_{ENV_UUID}": "marker"})
+    with executor:
+        assert not processes_with_env_proc(ENV_UUID, "marker")
+        assert processes_with_env_proc(f"NOT_{ENV_UUID}", "marker") == {executor.process.pid}
+
+
+def test_process_descendants() -> None:
+    """Check if descendants of the process are found in its process tree."""
+    with SimpleExecutor("sleep 300 && true", shell=True) as executor:
+        time.sleep(1)  # let the shell start its subprocess
+        descendants = process_descendants(executor.process.pid)
+        assert descendants is not None
+        assert len(descendants) == 1
+        assert executor.process.pid not in descendants
+        # descendants inherit the environment marker
+        assert processes_with_env_proc(ENV_UUID, executor._uuid) == descendants | {
+            executor.process.pid
+        }
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="requires /proc")
+def test_proc_children_index() -> None:
+    """Check if the parent-child index lists children of the process."""
+    with SimpleExecutor("sleep 300") as executor:
+        assert executor.process.pid in _proc_children_index()[os.getpid()]
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self"), reason="requires /proc")
+def test_processes_with_env_given_pids() -> None:
+    """Check that only given processes are checked for environment variable."""
+    with SimpleExecutor("sleep 300") as executor:
+        pid = executor.process.pid
+        assert processes_with_env_proc(ENV_UUID, executor._uuid, {pid}) == {pid}
+        assert processes_with_env_proc(ENV_UUID, executor._uuid, {os.getpid()}) == set()
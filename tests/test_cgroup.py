@@ -0,0 +1,85 @@
+# mypy: no-strict-optional
+"""cgroup v2 containment tests."""
+
+import os
+import time
+from typing import Iterator, Optional
+
+import pytest
+
+from mirakuru import SimpleExecutor
+from mirakuru.cgroup import CGroup
+from tests import SAMPLE_DAEMON_PATH, ps_aux
+
+
+def cgroup2_path() -> Optional[str]:
+    """Return path of the cgroup v2 group of the current process, if any."""
+    mount = group = None
+    with open("/proc/self/mounts", encoding="utf-8") as mounts:
+        for line in mounts:
+            _, path, fs_type, *_ = line.split()
+            if fs_type == "cgroup2":
+                mount = path
+    with open("/proc/self/cgroup", encoding="utf-8") as cgroups:
+        for line in cgroups:
+            if line.startswith("0::"):
+                group = line.strip()[3:]
+    if mount is None or group is None:
+        return None
+    return os.path.join(mount, group.lstrip("/"))
+
+
+@pytest.fixture
+def cgroup_parent() -> Iterator[str]:
+    """Create a cgroup v2 directory for executors, skip if not possible."""
+    path = cgroup2_path() if os.path.isdir("/proc/self") else None
+    if path is None:
+        pytest.skip("cgroup v2 is not available")
+    parent = os.path.join(path, f"mirakuru-tests-{os.getpid()}")
+    try:
+        os.mkdir(parent)
+    except OSError as err:
+        pytest.skip(f"cgroup v2 is not delegated: {err}")
+    yield parent
+    os.rmdir(parent)
+
+
+def test_cgroup_contains_process(cgroup_parent: str) -> None:
+    """Check if executor starts its process in its own cgroup."""
+    executor = SimpleExecutor("sleep 300 && true", shell=True, cgroup=cgroup_parent)
+    with executor:
+        time.sleep(1)  # let the shell start its subprocess
+        pids = executor._cgroup.pids()
+        assert executor.process.pid in pids
+        assert len(pids) == 2
+        assert "usage_usec" in executor.resource_usage()
+    assert not executor._cgroup.exists()
+    assert executor.resource_usage() == {}
+
+
+def test_cgroup_kills_daemons(cgroup_parent: str) -> None:
+    """Check if daemons are killed through the cgroup without scanning processes."""
+    executor = SimpleExecutor(("python", SAMPLE_DAEMON_PATH), shell=True, cgroup=cgroup_parent)
+    executor.start()
+    time.sleep(2)
+    assert executor.running() is not True
+    assert SAMPLE_DAEMON_PATH in ps_aux()
+    assert executor._cgroup.populated()
+
+    executor.kill()
+    assert SAMPLE_DAEMON_PATH not in ps_aux()
+    assert not executor._cgroup.exists()
+
+
+def test_cgroup_removed_on_failed_start(cgroup_parent: str) -> None:
+    """Check that the cgroup is removed if the process can not be started."""
+    executor = SimpleExecutor("/not/existing/command", cgroup=cgroup_parent)
+    with pytest.raises(OSError):
+        executor.start()
+    assert not executor._cgroup.exists()
+
+
+def test_not_a_cgroup(tmp_path_factory: pytest.TempPathFactory) -> None:
+    """Check that a directory which is not a cgroup is rejected."""
+    with pytest.raises(ValueError):
+        CGroup(str(tmp_path_factory.getbasetemp()), "mirakuru")
@@ -0,0 +1,105 @@
+"""Composable checks tests."""
+
+import os
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from mirakuru import CheckExecutor, SimpleExecutor
+from mirakuru.checks import (
+    AllOf,
+    AnyOf,
+    CheckType,
+    HTTPCheck,
+    OutputCheck,
+    PidFileCheck,
+    Sequence,
+    TCPCheck,
+)
+from tests import HTTP_SERVER_CMD
+
+PORT = 7991
+EXECUTOR = SimpleExecutor("true")
+
+
+def probe(results: List[bool], calls: List[str], name: str, delay: float = 0) -> CheckType:
+    """Return check giving consecutive results and recording its calls."""
+    lock = threading.Lock()
+
+    def check(executor: SimpleExecutor) -> bool:
+        with lock:
+            calls.append(name)
+        time.sleep(delay)
+        return results.pop(0) if len(results) > 1 else results[0]
+
+    return check
+
+
+def test_all_of_remembers_passed() -> None:
+    """Checks that passed should not run again."""
+    calls: List[str] = []
+    check = AllOf(probe([True], calls, "port"), probe([False, True], calls, "health"))
+    assert check(EXECUTOR) is False
+    assert check(EXECUTOR) is True
+    assert check(EXECUTOR) is True
+    assert sorted(calls) == ["health", "health", "port"]
+
+    check.reset()
+    assert check(EXECUTOR) is True
+    assert len(calls) == 5
+
+
+def test_all_of_runs_concurrently() -> None:
+    """Slow checks should run at the same time."""
+    calls: List[str] = []
+    check = AllOf(*(probe([True], calls, str(index), delay=0.5) for index in range(4)))
+    started = time.monotonic()
+    assert check(EXECUTOR) is True
+    assert time.monotonic() - started < 1
+    check.reset()
+
+
+def test_any_of_short_circuits() -> None:
+    """Passing check should not wait for slow ones, which aren't run twice."""
+    calls: List[str] = []
+    check = AnyOf(probe([False], calls, "slow", delay=1), probe([True], calls, "fast"))
+    started = time.monotonic()
+    assert check(EXECUTOR) is True
+    assert time.monotonic() - started < 0.5
+    assert check(EXECUTOR) is True
+    assert sorted(calls) == ["fast", "slow"]
+    check.reset()
+
+
+def test_sequence_runs_in_order() -> None:
+    """Check should run only once the previous ones have passed."""
+    calls: List[str] = []
+    check = Sequence(probe([False, True], calls, "port"), probe([True], calls, "health"))
+    assert check(EXECUTOR) is False
+    assert calls == ["port"]
+    assert check(EXECUTOR) is True
+    assert calls == ["port", "port", "health"]
+
+
+def test_executor_with_http_check() -> None:
+    """Executor should start once all the probes pass."""
+    check = AllOf(
+        TCPCheck("127.0.0.1", PORT),
+        Sequence(TCPCheck("127.0.0.1", PORT), HTTPCheck(f"http://127.0.0.1:{PORT}/")),
+    )
+    with CheckExecutor(f"{HTTP_SERVER_CMD} {PORT}", check, timeout=10) as executor:
+        assert executor.running() is True
+        assert HTTPCheck(f"http://127.0.0.1:{PORT}/")(executor) is True
+
+
+def test_executor_with_output_check(tmp_path: Path) -> None:
+    """Output and file probes should be combined."""
+    filename = tmp_path / "process.pid"
+    command = f'bash -c "echo starting && sleep 1 && echo ready && touch {filename} && sleep 10"'
+    check = AllOf(OutputCheck("ready"), PidFileCheck(str(filename)))
+    started = time.monotonic()
+    with CheckExecutor(command, check, timeout=10) as executor:
+        assert time.monotonic() - started >= 1
+        assert os.path.isfile(filename)
+        assert executor.running() is True
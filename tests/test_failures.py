@@ -0,0 +1,92 @@
+"""Failure checks tests."""
+
+import socket
+import time
+
+import pytest
+
+from mirakuru import OutputExecutor, ProcessFailedToStart, TCPExecutor
+from mirakuru.failures import PortTaken, exited_without_subprocesses
+from tests import HTTP_SERVER_CMD
+
+PORT = 7990
+
+
+def test_exited_without_subprocesses() -> None:
+    """Start should fail right away when the process exits leaving nothing."""
+    executor = TCPExecutor(
+        "true",
+        host="127.0.0.1",
+        port=PORT,
+        timeout=20,
+        failure_checks=[exited_without_subprocesses],
+    )
+    started = time.monotonic()
+    with pytest.raises(ProcessFailedToStart) as exc:
+        executor.start()
+    assert time.monotonic() - started < 3
+    assert "without leaving any subprocesses" in str(exc.value)
+    assert executor.running() is False
+
+
+def test_output_executor_failure_check() -> None:
+    """Failure checks should also run while waiting for the banner."""
+    executor = OutputExecutor(
+        'bash -c "exec >&-; exit 0"',
+        "ready",
+        timeout=20,
+        failure_checks=[exited_without_subprocesses],
+    )
+    started = time.monotonic()
+    with pytest.raises(ProcessFailedToStart):
+        executor.start()
+    assert time.monotonic() - started < 3
+
+
+def test_port_taken() -> None:
+    """Start should fail when another process holds the port."""
+    pytest.importorskip("psutil")
+    with socket.socket() as other:
+        other.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        # the port gets taken once our process has passed pre-start check
+        executor = TCPExecutor(
+            f'bash -c "sleep 1 && {HTTP_SERVER_CMD} {PORT}"',
+            host="127.0.0.1",
+            port=PORT,
+            timeout=20,
+            failure_checks=[PortTaken(PORT)],
+        )
+        original = executor.pre_start_check
+
+        def pre_start_check() -> bool:
+            result = original()
+            other.bind(("127.0.0.1", PORT))
+            other.listen()
+            return result
+
+        executor.pre_start_check = pre_start_check  # type: ignore[method-assign]
+        with pytest.raises(ProcessFailedToStart) as exc:
+            executor.start()
+    assert f"port {PORT} is held by another process" in str(exc.value)
+    assert executor.running() is False
+
+
+def test_port_taken_by_own_process() -> None:
+    """Port held by the executor's own process is fine."""
+    pytest.importorskip("psutil")
+    executor = TCPExecutor(
+        f"{HTTP_SERVER_CMD} {PORT}",
+        host="127.0.0.1",
+        port=PORT,
+        timeout=20,
+        failure_checks=[PortTaken(PORT)],
+    )
+    with executor:
+        assert executor.running() is True
+
+
+def test_port_taken_by_unknown_process() -> None:
+    """Port held by a process that can't be identified is not proven to be taken."""
+    check = PortTaken(PORT)
+    check.owners = lambda: {None}  # type: ignore[method-assign]
+    assert check(TCPExecutor("sleep 1", host="127.0.0.1", port=PORT)) is None
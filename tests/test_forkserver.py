@@ -0,0 +1,155 @@
+"""Fork server tests."""
+
+import os
+import sys
+from pathlib import Path
+from typing import Iterator
+
+import pytest
+
+import mirakuru
+from mirakuru import OutputExecutor, SimpleExecutor, TCPExecutor
+from mirakuru.base import ENV_UUID
+from mirakuru.base_env import processes_with_env
+from mirakuru.exceptions import ProcessExitedWithError
+from mirakuru.forkserver import ForkServer, parse_command
+from tests import TEST_SERVER_PATH
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="fork server is supported only on Linux"
+)
+
+SLEEP_CODE = (
+    "import os, sys, time; print('ready', os.environ['FORKED'], *sys.argv, flush=True); "
+    "time.sleep(300)"
+)
+
+
+@pytest.fixture(name="fork_server", scope="module")
+def fixture_fork_server() -> Iterator[ForkServer]:
+    """Fork server shared by the tests."""
+    with ForkServer(preload=["http.server"]) as server:
+        yield server
+
+
+def test_start_forked_process(fork_server: ForkServer) -> None:
+    """Process forked by the fork server should be checked and stopped like any other."""
+    executor = OutputExecutor(
+        [sys.executable, "-c", SLEEP_CODE, "argument"],
+        banner="ready yes -c argument",
+        fork_server=fork_server,
+        envvars={"FORKED": "yes"},
+        timeout=10,
+    )
+    with executor:
+        assert executor.running() is True
+        assert executor.process is not None
+        pid = executor.process.pid
+        assert fork_server.process is not None
+        assert pid != fork_server.process.pid
+        # found by the marker, not the fork server's placeholder
+        assert processes_with_env(ENV_UUID, executor._uuid) == {pid}
+    assert executor.running() is False
+    assert processes_with_env(ENV_UUID, executor._uuid) == set()
+
+
+def test_start_module(fork_server: ForkServer) -> None:
+    """Script and module should run as __main__."""
+    executor = TCPExecutor(
+        [sys.executable, TEST_SERVER_PATH, "localhost:7997"],
+        host="localhost",
+        port=7997,
+        fork_server=fork_server,
+        timeout=10,
+    )
+    with executor:
+        assert executor.running() is True
+    module = SimpleExecutor(
+        [sys.executable, "-m", "json.tool", "--help"], fork_server=fork_server, stderr=None
+    )
+    with module:
+        assert module.process is not None
+        assert module.process.wait(5) == 0
+        assert module.process.stdout is not None
+        assert "usage" in module.process.stdout.read()
+
+
+def test_exit_code(fork_server: ForkServer) -> None:
+    """Exit code of the forked process should be reported."""
+    executor = SimpleExecutor(
+        [sys.executable, "-c", "raise SystemExit(3)"], fork_server=fork_server
+    )
+    executor.start()
+    assert executor.process is not None
+    assert executor.process.wait(5) == 3
+    assert executor.running() is False
+    executor.kill()
+
+
+def test_exited_while_starting(fork_server: ForkServer) -> None:
+    """Process exiting before it has started should be reported like any other."""
+    executor = TCPExecutor(
+        [sys.executable, "-c", "import nonexistent_module"],
+        host="localhost",
+        port=7998,
+        fork_server=fork_server,
+        timeout=10,
+    )
+    with pytest.raises(ProcessExitedWithError):
+        executor.start()
+
+
+def test_restart_is_fast(fork_server: ForkServer) -> None:
+    """Forked process should not import preloaded modules again."""
+    code = "import sys; print('http.server' in sys.modules, flush=True); input()"
+    executor = OutputExecutor(
+        [sys.executable, "-c", code], banner="True", fork_server=fork_server, timeout=5
+    )
+    for _ in range(3):
+        with executor:
+            assert executor.running() is True
+
+
+def test_not_python_command() -> None:
+    """Only Python commands can be run by the fork server."""
+    with pytest.raises(ValueError):
+        parse_command(["bash", "-c", "sleep 1"])
+    with pytest.raises(ValueError):
+        parse_command([sys.executable, "-u", "script.py"])
+    assert parse_command([sys.executable, "-m", "http.server", "8000"]) == (
+        "module",
+        "http.server",
+        ["http.server", "8000"],
+    )
+    with pytest.raises(ValueError):
+        SimpleExecutor(f"{sys.executable} -c pass", shell=True, fork_server=ForkServer())
+
+
+def test_preload_failure() -> None:
+    """Fork server failing to import modules should fail to start."""
+    server = ForkServer(preload=["nonexistent_module"])
+    with pytest.raises(RuntimeError):
+        server.start()
+    assert server.running() is False
+
+
+def server_pythonpath(server: ForkServer) -> str:
+    """Read PYTHONPATH of the fork server process."""
+    assert server.process is not None
+    with open(f"/proc/{server.process.pid}/environ", "rb") as environ:
+        variables = dict(
+            variable.partition(b"=")[::2] for variable in environ.read().split(b"\0") if variable
+        )
+    return variables.get(b"PYTHONPATH", b"").decode()
+
+
+def test_pythonpath(monkeypatch: pytest.MonkeyPatch, tmp_path: Path) -> None:
+    """PYTHONPATH should be extended only when mirakuru can't be imported otherwise."""
+    monkeypatch.delenv("PYTHONPATH", raising=False)
+    root = os.path.dirname(os.path.dirname(os.path.abspath(mirakuru.__file__)))
+    monkeypatch.chdir(root)
+    with ForkServer() as server:
+        assert server_pythonpath(server) == ""
+    monkeypatch.chdir(tmp_path)
+    with ForkServer() as server:
+        assert server_pythonpath(server) == root
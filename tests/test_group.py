@@ -0,0 +1,161 @@
+"""Executor group tests."""
+
+import signal
+import time
+from typing import List, Optional, Tuple
+
+import pytest
+
+from mirakuru import (
+    ExecutorGroup,
+    ExecutorGroupError,
+    OutputExecutor,
+    ProcessExitedWithError,
+    SimpleExecutor,
+    TCPExecutor,
+)
+
+SLOW_COMMAND = 'bash -c "sleep 1 && echo ready && sleep 100"'
+
+
+def test_group_starts_concurrently() -> None:
+    """Group should start executors concurrently and stop all of them."""
+    executors = [OutputExecutor(SLOW_COMMAND, "ready", timeout=10) for _ in range(5)]
+    group = ExecutorGroup(*executors)
+    started = time.monotonic()
+    with group:
+        assert time.monotonic() - started < 3
+        assert group.running() is True
+    assert not any(executor.running() for executor in executors)
+
+
+def test_group_failed_start_stops_others() -> None:
+    """Started executors should be stopped when any other fails to start."""
+    healthy = OutputExecutor(SLOW_COMMAND, "ready", timeout=10)
+    failing = TCPExecutor("false", host="localhost", port=7989, timeout=10)
+    timing_out = OutputExecutor("sleep 100", "ready", timeout=1)
+    group = ExecutorGroup(healthy, failing, timing_out)
+
+    with pytest.raises(ExecutorGroupError) as exc:
+        group.start()
+
+    # the others were still starting, so they got cancelled
+    assert set(exc.value.errors) == {failing}
+    assert isinstance(exc.value.errors[failing], ProcessExitedWithError)
+    assert "1 executor(s) failed" in str(exc.value)
+    assert healthy.running() is False
+    assert timing_out.running() is False
+
+
+def test_group_failed_start_cancels_starting() -> None:
+    """Executors still starting should be cancelled as soon as any other fails."""
+    slow = OutputExecutor("sleep 100", "ready", timeout=30)
+    failing = TCPExecutor("false", host="localhost", port=7989, timeout=10)
+    group = ExecutorGroup(slow, failing)
+
+    started = time.monotonic()
+    with pytest.raises(ExecutorGroupError) as exc:
+        group.start()
+
+    assert time.monotonic() - started < 5
+    assert set(exc.value.errors) == {failing}
+    assert slow.running() is False
+
+
+def test_group_failed_start_cleanup_errors() -> None:
+    """Errors stopping started executors should be attached to the start error."""
+    healthy = SimpleExecutor("sleep 100", stop_signal=signal.SIGKILL, expected_returncode=1)
+    failing = TCPExecutor("false", host="localhost", port=7989, timeout=10)
+    group = ExecutorGroup(healthy)
+    group.add(failing, depends_on=[healthy])
+
+    with pytest.raises(ExecutorGroupError) as exc:
+        group.start()
+
+    assert list(exc.value.errors) == [failing]
+    assert list(exc.value.cleanup_errors) == [healthy]
+    assert "failed to stop" in str(exc.value)
+    assert healthy.running() is False
+
+
+def test_group_stop_aggregates_errors() -> None:
+    """All executors should be stopped even if some of them fail."""
+    failing = SimpleExecutor("sleep 100", stop_signal=signal.SIGKILL, expected_returncode=1)
+    other = SimpleExecutor("sleep 100")
+    group = ExecutorGroup(failing, other).start()
+
+    with pytest.raises(ExecutorGroupError) as exc:
+        group.stop()
+
+    assert list(exc.value.errors) == [failing]
+    assert not failing.running()
+    assert not other.running()
+
+
+def test_group_dependencies_order() -> None:
+    """Executors should start after their dependencies, and stop before them."""
+    events: List[Tuple[str, SimpleExecutor]] = []
+
+    class RecordingExecutor(OutputExecutor):
+        """OutputExecutor recording when it starts and stops."""
+
+        def start(self) -> "RecordingExecutor":
+            events.append(("starting", self))
+            super().start()
+            events.append(("started", self))
+            return self
+
+        def stop(
+            self, stop_signal: Optional[int] = None, expected_returncode: Optional[int] = None
+        ) -> "RecordingExecutor":
+            events.append(("stopping", self))
+            super().stop(stop_signal, expected_returncode)
+            events.append(("stopped", self))
+            return self
+
+    group = ExecutorGroup()
+    database = group.add(RecordingExecutor(SLOW_COMMAND, "ready", timeout=10))
+    cache = group.add(RecordingExecutor(SLOW_COMMAND, "ready", timeout=10))
+    api = group.add(
+        RecordingExecutor(SLOW_COMMAND, "ready", timeout=10), depends_on=[database, cache]
+    )
+
+    started = time.monotonic()
+    with group:
+        # database and cache start in parallel, api after them
+        assert time.monotonic() - started < 3.5
+    assert events.index(("starting", api)) > events.index(("started", database))
+    assert events.index(("starting", api)) > events.index(("started", cache))
+    assert events.index(("starting", cache)) < events.index(("started", database))
+    assert events.index(("stopping", database)) > events.index(("stopped", api))
+    assert events.index(("stopping", cache)) > events.index(("stopped", api))
+
+
+def test_group_failed_dependency() -> None:
+    """Dependents of executor that failed to start should not be started."""
+    group = ExecutorGroup()
+    failing = group.add(TCPExecutor("false", host="localhost", port=7989, timeout=10))
+    dependent = group.add(SimpleExecutor("sleep 100"), depends_on=[failing])
+
+    with pytest.raises(ExecutorGroupError) as exc:
+        group.start()
+
+    assert list(exc.value.errors) == [failing]
+    assert dependent.process is None
+
+
+def test_group_unknown_dependency() -> None:
+    """Dependencies have to be added to the group first."""
+    with pytest.raises(ValueError):
+        ExecutorGroup().add(SimpleExecutor("sleep 100"), depends_on=[SimpleExecutor("sleep 1")])
+
+
+def test_group_rejects_duplicates() -> None:
+    """Executor can be added to the group only once."""
+    executor = SimpleExecutor("sleep 100")
+    group = ExecutorGroup(executor)
+    with pytest.raises(ValueError):
+        group.add(executor)
+    with pytest.raises(ValueError):
+        ExecutorGroup(executor, executor)
+    assert group.executors == [executor]
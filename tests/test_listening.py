@@ -0,0 +1,76 @@
+"""Listening sockets lookup tests."""
+
+import os
+import socket
+from pathlib import Path
+
+import pytest
+
+from mirakuru.listening import (
+    listening_tcp_inodes,
+    listening_tcp_ports,
+    listening_unix_inodes,
+    socket_owners,
+)
+
+pytestmark = pytest.mark.skipif(
+    not os.path.exists("/proc/net/tcp"), reason="/proc/net is available only on Linux"
+)
+
+
+def test_listening_tcp_inodes() -> None:
+    """Only listening sockets on the port should be found."""
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        port = server.getsockname()[1]
+        assert listening_tcp_inodes(port) == set()
+
+        server.listen()
+        inodes = listening_tcp_inodes(port)
+        assert inodes == {os.fstat(server.fileno()).st_ino}
+        assert socket_owners(inodes) == {os.getpid()}
+
+
+def test_listening_tcp_inodes_host() -> None:
+    """Sockets should be filtered by the address they listen on."""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        inode = os.fstat(server.fileno()).st_ino
+        assert listening_tcp_inodes(port, ["127.0.0.1"]) == {inode}
+        assert listening_tcp_inodes(port, ["127.0.0.2"]) == set()
+    with socket.create_server(("0.0.0.0", 0)) as server:
+        port = server.getsockname()[1]
+        inode = os.fstat(server.fileno()).st_ino
+        # listening on all addresses
+        assert listening_tcp_inodes(port, ["127.0.0.2"]) == {inode}
+
+
+def test_socket_owners_of_given_processes() -> None:
+    """Only given processes should be looked into, if any."""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        inodes = {os.fstat(server.fileno()).st_ino}
+        assert socket_owners(inodes, [os.getpid()]) == {os.getpid()}
+        assert socket_owners(inodes, [os.getppid()]) == set()
+
+
+def test_listening_tcp_ports() -> None:
+    """Ports listened on by the process should be found."""
+    with socket.create_server(("127.0.0.1", 0)) as server:
+        port = server.getsockname()[1]
+        ports = listening_tcp_ports([os.getpid()])
+        assert ports is not None
+        assert port in ports
+        assert listening_tcp_ports([]) == set()
+
+
+def test_listening_unix_inodes(tmp_path: Path) -> None:
+    """Unix sockets should be found by their path."""
+    path = str(tmp_path / "mirakuru.sock")
+    with socket.socket(socket.AF_UNIX) as server:
+        server.bind(path)
+        assert listening_unix_inodes(path) == set()
+
+        server.listen()
+        inodes = listening_unix_inodes(path)
+        assert inodes == {os.fstat(server.fileno()).st_ino}
+        assert socket_owners(inodes) == {os.getpid()}
@@ -0,0 +1,86 @@
+"""Executor pool tests."""
+
+import time
+from typing import List
+
+import pytest
+
+from mirakuru import (
+    ExecutorPool,
+    OutputExecutor,
+    ProcessExitedWithError,
+    SimpleExecutor,
+    TCPExecutor,
+)
+
+READY_CMD = 'bash -c "sleep 0.5 && echo ready && sleep 300"'
+
+
+def output_executor(slot: int) -> OutputExecutor:
+    """Create executor taking a while to start."""
+    return OutputExecutor(READY_CMD, banner="ready", timeout=10)
+
+
+def test_acquire_started_executor() -> None:
+    """Executors started ahead should be handed out right away and restarted after use."""
+    with ExecutorPool(output_executor, size=2).start(wait=True) as pool:
+        assert all(executor.running() for executor in pool.executors)
+        started = time.monotonic()
+        with pool.executor() as executor:
+            assert time.monotonic() - started < 0.1
+            assert executor.running() is True
+            assert executor.process is not None
+            pid = executor.process.pid
+
+        with pool.executor() as other:
+            assert other is not executor
+        with pool.executor(timeout=10) as again:
+            assert again.running() is True
+            assert again.process is not None
+            if again is executor:
+                assert again.process.pid != pid
+    assert not any(executor.running() for executor in pool.executors)
+
+
+def test_reset_instead_of_restart() -> None:
+    """Released executor should be reset, not restarted, when reset is given."""
+    resets: List[SimpleExecutor] = []
+    with ExecutorPool(output_executor, size=1, reset=resets.append) as pool:
+        executor = pool.acquire(timeout=10)
+        assert executor.process is not None
+        pid = executor.process.pid
+        pool.release(executor)
+
+        assert pool.acquire(timeout=10) is executor
+        assert executor.process is not None
+        assert executor.process.pid == pid
+        assert resets == [executor]
+
+
+def test_acquire_timeout() -> None:
+    """Acquiring should time out when all executors are taken."""
+    with ExecutorPool(output_executor, size=1) as pool:
+        pool.acquire(timeout=10)
+        with pytest.raises(TimeoutError):
+            pool.acquire(timeout=0.2)
+
+
+def test_idle_executors_evicted() -> None:
+    """Executors idle for longer than ttl should be stopped and started on demand."""
+    with ExecutorPool(output_executor, size=2, ttl=0.5).start(wait=True) as pool:
+        time.sleep(1.5)
+        assert not any(executor.running() for executor in pool.executors)
+
+        with pool.executor(timeout=10) as executor:
+            assert executor.running() is True
+
+
+def test_start_failure() -> None:
+    """Failure of a background start should be raised by acquire."""
+
+    def failing_executor(slot: int) -> TCPExecutor:
+        return TCPExecutor("false", host="127.0.0.1", port=7992 + slot, timeout=10)
+
+    with ExecutorPool(failing_executor, size=1) as pool:
+        with pytest.raises(ProcessExitedWithError):
+            pool.acquire(timeout=10)
@@ -0,0 +1,77 @@
+"""Port reservation tests."""
+
+import errno
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+from mirakuru import ports
+from mirakuru.ports import reserve_port
+
+RESERVE_CODE = """
+import sys
+from mirakuru import ports
+ports._free_port = lambda host: int(sys.argv[1])
+ports.ATTEMPTS = 1
+try:
+    ports.reserve_port(directory=sys.argv[2])
+except OSError:
+    sys.exit(1)
+"""
+
+
+def reserve_in_other_process(port: int, directory: Path) -> int:
+    """Try to reserve the port in other process, return its exit code."""
+    return subprocess.call([sys.executable, "-c", RESERVE_CODE, str(port), str(directory)])
+
+
+def test_reserve_port(tmp_path: Path) -> None:
+    """Reserved port should not be handed out again, until released."""
+    with reserve_port(directory=str(tmp_path)) as reservation:
+        with reserve_port(directory=str(tmp_path)) as other:
+            assert other.port != reservation.port
+        assert reserve_in_other_process(reservation.port, tmp_path) == 1
+    # lock files are removed on release
+    assert not list(tmp_path.iterdir())
+    assert reserve_in_other_process(reservation.port, tmp_path) == 0
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="ports are not locked on Windows")
+def test_reserve_port_of_other_user(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Port which lock file belongs to other user should count as reserved."""
+    taken = str(tmp_path / "7991.lock")
+    original = os.open
+
+    def open_lock(path: str, *args: Any) -> int:
+        if path == taken:
+            raise PermissionError(path)
+        return original(path, *args)
+
+    monkeypatch.setattr(os, "open", open_lock)
+    monkeypatch.setattr(ports, "_free_port", lambda host: 7991)
+    monkeypatch.setattr(ports, "ATTEMPTS", 1)
+    with pytest.raises(OSError) as exc:
+        reserve_port(directory=str(tmp_path))
+    assert exc.value.errno == errno.EADDRINUSE
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="ports are not locked on Windows")
+def test_reserve_port_in_shared_directory(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Created directory should be shared by all users, other user's one should be avoided."""
+    shared = tmp_path / "ports"
+    with reserve_port(directory=str(shared)):
+        assert shared.stat().st_mode & 0o7777 == 0o1777
+
+    # created by other user, not writable for the current one
+    shared.chmod(0o755)
+    original = os.access
+    monkeypatch.setattr(
+        os, "access", lambda path, mode: path != str(shared) and original(path, mode)
+    )
+    with reserve_port(directory=str(shared)) as reservation:
+        own = tmp_path / f"ports-{os.getuid()}"
+        assert (own / f"{reservation.port}.lock").exists()
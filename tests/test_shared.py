@@ -0,0 +1,159 @@
+"""Shared executor tests."""
+
+import json
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import List
+
+from mirakuru import OutputExecutor, SharedExecutor, TCPExecutor
+from mirakuru.attached import pid_running
+from mirakuru.shared import SharedRegistry
+from tests import HTTP_SERVER_CMD
+
+PORT = 7991
+
+OTHER_PROCESS = """
+import os
+import sys
+from mirakuru import SharedExecutor, TCPExecutor
+from mirakuru.shared import SharedRegistry
+shared = SharedExecutor(
+    TCPExecutor(sys.argv[1], host="localhost", port=int(sys.argv[2]), timeout=10),
+    registry=SharedRegistry(sys.argv[3]),
+)
+shared.start()
+print(shared.executor.process.pid)
+if sys.argv[4] == "stop":
+    shared.stop()
+elif sys.argv[4] == "crash":
+    sys.stdout.flush()
+    os._exit(1)
+elif sys.argv[4] == "wait":
+    sys.stdout.flush()
+    sys.stdin.readline()
+"""
+
+
+def shared_executor(registry: Path) -> SharedExecutor:
+    """Create executor shared through the registry."""
+    executor = TCPExecutor(f"{HTTP_SERVER_CMD} {PORT}", host="localhost", port=PORT, timeout=10)
+    return SharedExecutor(executor, registry=SharedRegistry(str(registry)))
+
+
+def other_process_command(registry: Path, action: str) -> List[str]:
+    """Return command of other process starting the shared executor."""
+    return [
+        sys.executable,
+        "-c",
+        OTHER_PROCESS,
+        f"{HTTP_SERVER_CMD} {PORT}",
+        str(PORT),
+        str(registry),
+        action,
+    ]
+
+
+def start_in_other_process(registry: Path, action: str) -> int:
+    """Start the shared executor in other process, return the PID of its process."""
+    output = subprocess.run(
+        other_process_command(registry, action), stdout=subprocess.PIPE, check=False
+    ).stdout
+    return int(output)
+
+
+def test_attach_to_running_process(tmp_path: Path) -> None:
+    """Other processes should attach to the process and leave it running."""
+    with shared_executor(tmp_path) as shared:
+        assert shared.executor.process is not None
+        pid = shared.executor.process.pid
+        assert start_in_other_process(tmp_path, "stop") == pid
+        assert shared.running() is True
+    assert pid_running(pid) is False
+
+
+def test_released_on_exit(tmp_path: Path) -> None:
+    """Process exiting without stopping the executor should release it."""
+    with shared_executor(tmp_path) as shared:
+        assert shared.executor.process is not None
+        assert start_in_other_process(tmp_path, "exit") == shared.executor.process.pid
+        assert shared.running() is True
+
+
+def test_last_holder_stops_process(tmp_path: Path) -> None:
+    """Process should be stopped by the last holder, not the one that started it."""
+    # the other process exits without releasing the executor
+    pid = start_in_other_process(tmp_path, "crash")
+    assert pid_running(pid) is True
+    shared = shared_executor(tmp_path).start()
+    other = shared_executor(tmp_path).start()
+    assert shared.executor.process is not None
+    assert shared.executor.process.pid == pid
+    assert isinstance(shared.executor, TCPExecutor)
+    assert shared.executor.after_start_check() is True
+
+    shared.stop()
+    assert pid_running(pid) is True
+    assert other.running() is True
+    other.stop()
+    assert pid_running(pid) is False
+    assert other.running() is False
+
+
+def test_starter_exits_first(tmp_path: Path) -> None:
+    """Process should outlive the process that started it, while others hold it."""
+    with subprocess.Popen(
+        other_process_command(tmp_path, "wait"), stdin=subprocess.PIPE, stdout=subprocess.PIPE
+    ) as starter:
+        assert starter.stdout is not None
+        pid = int(starter.stdout.readline())
+        shared = shared_executor(tmp_path).start()
+        assert shared.executor.process is not None
+        assert shared.executor.process.pid == pid
+        # the starter exits normally, releasing the executor
+        starter.communicate(b"\n")
+    assert pid_running(pid) is True
+    assert shared.running() is True
+    registry = json.loads((tmp_path / "executors.json").read_text())
+    assert [entry["holders"] for entry in registry.values()] == [[shared.executor._own_uuid]]
+
+    shared.stop()
+    assert pid_running(pid) is False
+
+
+def test_reused_pid_not_attached(tmp_path: Path) -> None:
+    """Process which PID got reused by other process should be started again."""
+    with subprocess.Popen(["sleep", "100"]) as other:
+        registry = SharedRegistry(str(tmp_path))
+        shared = shared_executor(tmp_path)
+        with registry.locked() as entries:
+            entries[shared.name] = {
+                "pid": other.pid,
+                "marker": "1:gone",
+                "endpoint": {},
+                "holders": ["1:gone"],
+            }
+        with shared:
+            assert shared.executor.process is not None
+            assert shared.executor.process.pid != other.pid
+        other.kill()
+
+
+def test_start_other_executor_meanwhile(tmp_path: Path) -> None:
+    """Executor taking long to start should not hold up starting the other ones."""
+    slow = SharedExecutor(
+        OutputExecutor('bash -c "sleep 3 && echo ready && sleep 300"', banner="ready", timeout=10),
+        registry=SharedRegistry(str(tmp_path)),
+    )
+    starting = threading.Thread(target=slow.start)
+    starting.start()
+    time.sleep(0.5)
+    started = time.monotonic()
+    with shared_executor(tmp_path) as shared:
+        assert shared.running() is True
+        assert time.monotonic() - started < 2
+    starting.join()
+    assert slow.running() is True
+    slow.stop()
@@ -0,0 +1,87 @@
+"""Wait strategies tests."""
+
+import itertools
+import os
+import resource
+import time
+
+import pytest
+
+from mirakuru import OutputExecutor, TimeoutExpired
+from mirakuru.wait import BackoffWait, EventWait, FixedWait
+
+
+def test_fixed_wait_intervals() -> None:
+    """FixedWait should always return the same interval."""
+    intervals = FixedWait(0.3).intervals()
+    assert list(itertools.islice(intervals, 3)) == [0.3, 0.3, 0.3]
+
+
+def test_backoff_wait_intervals() -> None:
+    """BackoffWait should grow intervals up to the maximum."""
+    intervals = BackoffWait(initial=0.1, maximum=0.5, factor=2, jitter=0).intervals()
+    assert list(itertools.islice(intervals, 5)) == [0.1, 0.2, 0.4, 0.5, 0.5]
+
+
+def test_backoff_wait_jitter() -> None:
+    """BackoffWait jitter should stay within given fraction of the interval."""
+    intervals = BackoffWait(initial=1, maximum=1, jitter=0.2).intervals()
+    for interval in itertools.islice(intervals, 100):
+        assert 0.8 <= interval <= 1.2
+
+
+def test_event_wait_wakes_up_on_readable_fd() -> None:
+    """EventWait should stop waiting as soon as descriptor is readable."""
+    read_fd, write_fd = os.pipe()
+    try:
+        os.write(write_fd, b"x")
+        started = time.monotonic()
+        EventWait().wait(5, [read_fd])
+        assert time.monotonic() - started < 1
+    finally:
+        os.close(read_fd)
+        os.close(write_fd)
+
+
+@pytest.mark.skipif(
+    resource.getrlimit(resource.RLIMIT_NOFILE)[0] <= 2000, reason="needs more open files"
+)
+def test_event_wait_high_fd() -> None:
+    """EventWait should handle descriptors above select's limit."""
+    read_fd, write_fd = os.pipe()
+    high_fd = os.dup2(read_fd, 2000)
+    try:
+        os.write(write_fd, b"x")
+        started = time.monotonic()
+        EventWait().wait(5, [high_fd])
+        assert time.monotonic() - started < 1
+    finally:
+        for fd in (read_fd, write_fd, high_fd):
+            os.close(fd)
+
+
+def test_event_wait_without_fds_sleeps() -> None:
+    """EventWait should fall back to sleeping if there are no descriptors."""
+    started = time.monotonic()
+    EventWait().wait(0.2, [])
+    assert time.monotonic() - started >= 0.2
+
+
+def test_output_executor_event_wait() -> None:
+    """OutputExecutor should start as soon as banner appears in output."""
+    command = 'bash -c "sleep 1 && echo foo && sleep 100"'
+    # with fixed wait, the banner would be noticed after up to 5 seconds
+    executor = OutputExecutor(command, "foo", timeout=10, wait_strategy=EventWait(FixedWait(5)))
+    started = time.monotonic()
+    with executor:
+        assert executor.running() is True
+        assert time.monotonic() - started < 3
+
+
+def test_output_executor_event_wait_closed_output() -> None:
+    """Event-driven wait should not spin on output that has been closed."""
+    command = 'bash -c "exec >&-; sleep 100"'
+    executor = OutputExecutor(command, "foo", timeout=1, wait_strategy=EventWait())
+    with pytest.raises(TimeoutExpired):
+        executor.start()
+    assert executor.running() is False